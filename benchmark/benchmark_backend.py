@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compare evaluation of compiled expressions by the interpreter and by generated code.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import s2e2
+
+
+EXPRESSIONS = (
+    '${A} + ${B} + C + D + E + F + G + H',
+    'IF(${A} < ${B}, 1, 2) + IF(${A} > ${B}, 3, 4)',
+    '!(${A} == ${B}) && (C != D || E >= F) && (G <= H || I < J)',
+    'IF(REPLACE(${A}, cat, dog) == "The dog is black", Yes, No)',
+)
+
+BINDINGS = {'A': 'The cat is black', 'B': 'The dog is white'}
+
+NUMBER = 50000
+
+
+def make_evaluator(backend):
+    evaluator = s2e2.Evaluator(backend=backend)
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+    return evaluator
+
+
+def main():
+    interpreter = make_evaluator(s2e2.Backend.INTERPRETER)
+    code_generator = make_evaluator(s2e2.Backend.CODE_GENERATOR)
+
+    for expression in EXPRESSIONS:
+        interpreted_expression = interpreter.compile(expression)
+        generated_expression = code_generator.compile(expression)
+
+        interpreted = timeit.timeit(lambda: interpreted_expression(BINDINGS), number=NUMBER)
+        generated = timeit.timeit(lambda: generated_expression(BINDINGS), number=NUMBER)
+
+        print('{}\n    interpreter: {:.2f} us, code generator: {:.2f} us, speedup: {:.1f}x'.format(
+            expression,
+            interpreted / NUMBER * 1e6,
+            generated / NUMBER * 1e6,
+            interpreted / generated))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compare evaluation of expressions with NOW() by evaluators with different clocks.
+Clocks read a fixed datetime, so all evaluators compute the same values and results are deterministic.
+"""
+
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import s2e2
+
+
+NOW = datetime.datetime(2020, 5, 17, 10, 30, 42)
+
+EXPRESSION = 'FORMAT_DATE(ADD_DAYS(NOW(), 1), "%Y-%m-%d")'
+
+BATCH_EXPRESSIONS = [EXPRESSION, 'FORMAT_DATE(NOW(), "%H:%M") + " UTC"'] * 50
+
+NUMBER = 20000
+
+BATCH_NUMBER = 1000
+
+
+def fixed_now():
+    return NOW
+
+
+def make_evaluator(clock):
+    evaluator = s2e2.Evaluator(clock=clock)
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+    return evaluator
+
+
+def main():
+    clocks = (
+        ('real', s2e2.RealClock(fixed_now)),
+        ('per evaluation', s2e2.EvaluationClock(fixed_now)),
+        ('per batch', s2e2.BatchClock(fixed_now)),
+        ('quantized to 60 s', s2e2.QuantizedClock(60, fixed_now)),
+    )
+
+    print('{}: {} evaluations, {} batches of {} expressions'.format(EXPRESSION, NUMBER, BATCH_NUMBER,
+                                                                   len(BATCH_EXPRESSIONS)))
+
+    for name, clock in clocks:
+        evaluator = make_evaluator(clock)
+        compiled = evaluator.compile(EXPRESSION)
+
+        single_time = timeit.timeit(compiled.evaluate, number=NUMBER)
+        batch_time = timeit.timeit(lambda: evaluator.evaluate_many(BATCH_EXPRESSIONS), number=BATCH_NUMBER)
+
+        print('    {} clock: evaluation {:.2f} us, batch {:.0f} us'.format(
+            name, single_time / NUMBER * 1e6, batch_time / BATCH_NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compare evaluation of an expression from scratch with evaluation of a compiled one
+and with evaluation through the cache of compiled expressions.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import s2e2
+
+
+EXPRESSIONS = (
+    'A + B',
+    'IF(A < B, 1, 2) + IF(A > B, 3, 4)',
+    'IF(REPLACE("The cat is black", cat, dog) == "The dog is black", Yes, No)',
+    'FORMAT_DATE(ADD_DAYS(NOW(), 1), "%Y-%m-%d")',
+    'IF(A == B, "{}", C)'.format('payload \\" text ' * 200),
+)
+
+NUMBER = 20000
+
+
+def main():
+    # disable the cache to measure parsing of the expression on every evaluation
+    evaluator = s2e2.Evaluator(cache_size=0)
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+
+    cached_evaluator = s2e2.Evaluator()
+    cached_evaluator.add_standard_functions()
+    cached_evaluator.add_standard_operators()
+
+    for expression in EXPRESSIONS:
+        compiled = evaluator.compile(expression)
+
+        plain = timeit.timeit(lambda: evaluator.evaluate(expression), number=NUMBER)
+        cached = timeit.timeit(lambda: cached_evaluator.evaluate(expression), number=NUMBER)
+        precompiled = timeit.timeit(compiled.evaluate, number=NUMBER)
+
+        print('{:.80}\n    evaluate: {:.2f} us, cached: {:.2f} us, compiled: {:.2f} us, speedup: {:.1f}x'.format(
+            expression,
+            plain / NUMBER * 1e6,
+            cached / NUMBER * 1e6,
+            precompiled / NUMBER * 1e6,
+            plain / precompiled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare evaluation of a batch of expressions with many duplicates
+by a loop over Evaluator.evaluate and by Evaluator.evaluate_many.
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import s2e2
+
+
+TEMPLATES = (
+    'A{} + B',
+    'IF(A{} < B, 1, 2) + IF(A > B, 3, 4)',
+    'IF(REPLACE("The cat is black {}", cat, dog) == "The dog is black", Yes, No)',
+    'FORMAT_DATE(ADD_DAYS(NOW(), {}), "%Y-%m-%d")',
+)
+
+BATCH_SIZE = 20000
+
+DISTINCT_EXPRESSIONS = 500
+
+NUMBER = 5
+
+
+def make_evaluator(cache_size=s2e2.Evaluator.DEFAULT_CACHE_SIZE):
+    evaluator = s2e2.Evaluator(cache_size=cache_size)
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+    return evaluator
+
+
+def make_batch():
+    generator = random.Random(0)
+    distinct = [TEMPLATES[index % len(TEMPLATES)].format(index) for index in range(DISTINCT_EXPRESSIONS)]
+    return [generator.choice(distinct) for _ in range(BATCH_SIZE)]
+
+
+def main():
+    batch = make_batch()
+
+    uncached = make_evaluator(cache_size=0)
+    loop_uncached = timeit.timeit(lambda: [uncached.evaluate(expression) for expression in batch], number=NUMBER)
+
+    def loop_cached():
+        evaluator = make_evaluator()
+        return [evaluator.evaluate(expression) for expression in batch]
+
+    def evaluate_many():
+        return make_evaluator().evaluate_many(batch)
+
+    assert loop_cached() == evaluate_many()
+
+    loop = timeit.timeit(loop_cached, number=NUMBER)
+    many = timeit.timeit(evaluate_many, number=NUMBER)
+
+    print('{} expressions, {} distinct'.format(BATCH_SIZE, len(set(batch))))
+    print('    loop without cache: {:.1f} ms, loop: {:.1f} ms, evaluate_many: {:.1f} ms, speedup: {:.1f}x'.format(
+        loop_uncached / NUMBER * 1e3,
+        loop / NUMBER * 1e3,
+        many / NUMBER * 1e3,
+        loop / many))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Compare FORMAT_DATE of a compiled expression with datetime.strftime, which is how FORMAT_DATE used to work,
+for millions of datetimes and several formats.
+"""
+
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from s2e2.functions.function_format_date import FunctionFormatDate
+
+
+FORMATS = (
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S',
+    '%d.%m.%Y %H:%M',
+    '%Y%m%d-%H%M%S.%f',
+    '%a, %d %b %Y',
+)
+
+NUMBER_OF_DATETIMES = 2000000
+
+
+def measure(function, values):
+    start = time.perf_counter()
+    for value in values:
+        function(value)
+    return time.perf_counter() - start
+
+
+def main():
+    start = datetime.datetime(2000, 1, 1)
+    values = [start + datetime.timedelta(seconds=index * 997, microseconds=index)
+              for index in range(NUMBER_OF_DATETIMES)]
+    function = FunctionFormatDate()
+
+    print('{} datetimes'.format(len(values)))
+
+    for format in FORMATS:
+        specialized = function.specialize({1: format})
+        strftime_time = measure(lambda value: value.strftime(format), values)
+        compiled_time = measure(lambda value: specialized.call(value, format), values)
+        formatter_time = measure(specialized.formatter, values)
+
+        print('    {}: strftime {:.2f} s, FORMAT_DATE {:.2f} s, formatter {:.2f} s, speedup: {:.1f}x'.format(
+            format, strftime_time, compiled_time, formatter_time, strftime_time / formatter_time))
+
+
+if __name__ == '__main__':
+    main()
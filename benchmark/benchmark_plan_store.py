@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compare cold start of an evaluator parsing a corpus of expressions
+with a warm start loading parsed expressions from a plan store.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import s2e2
+
+
+CORPUS_SIZE = 5000
+
+
+def make_corpus():
+    return ['IF(REPLACE(Value{0}, "[0-9]+", N) == ValueN && Key{0} != NULL, '
+            'FORMAT_DATE(ADD_DAYS(NOW(), {0}), "%Y-%m-%d"), Prefix{0} + Suffix{0})'.format(i)
+            for i in range(CORPUS_SIZE)]
+
+
+def make_evaluator(plan_store=None):
+    evaluator = s2e2.Evaluator()
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+    if plan_store is not None:
+        evaluator.set_plan_store(plan_store)
+    return evaluator
+
+
+def compile_corpus(evaluator, corpus):
+    start = time.perf_counter()
+    for expression in corpus:
+        evaluator.compile(expression)
+    return time.perf_counter() - start
+
+
+def main():
+    corpus = make_corpus()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'plans.json')
+
+        cold = compile_corpus(make_evaluator(), corpus)
+
+        store = s2e2.PlanStore(path)
+        compile_corpus(make_evaluator(store), corpus)
+        store.save()
+
+        warm = compile_corpus(make_evaluator(s2e2.PlanStore(path)), corpus)
+
+    print('{} expressions\n    cold parse: {:.3f} s, warm plan store: {:.3f} s, speedup: {:.1f}x'.format(
+        CORPUS_SIZE, cold, warm, cold / warm))
+
+
+if __name__ == '__main__':
+    main()
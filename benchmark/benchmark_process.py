@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Measure scaling of CPU-bound evaluation of a stream of records by ProcessEvaluator
+from one process to the number of processors, compared with Evaluator.stream_map.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import s2e2
+
+
+EXPRESSION = 'IF(REPLACE(${A}, "[0-9]+", "#") == ${B}, ${B}, ' \
+             'REPLACE(REPLACE(${A} + ${B}, "a+", "x"), "[0-9]", "#") + FORMAT_DATE(NOW(), "%Y"))'
+
+RECORDS = 50000
+
+CHUNK_SIZE = 1000
+
+NUMBER = 3
+
+
+def make_evaluator():
+    evaluator = s2e2.Evaluator()
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+    return evaluator
+
+
+def make_records():
+    return [{'A': 'aaa{}b'.format(index), 'B': str(index)} for index in range(RECORDS)]
+
+
+def worker_counts():
+    counts = [1]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+    if counts[-1] != (os.cpu_count() or 1):
+        counts.append(os.cpu_count())
+    return counts
+
+
+def main():
+    evaluator = make_evaluator()
+    records = make_records()
+    expected = list(evaluator.stream_map(EXPRESSION, records))
+
+    sequential = timeit.timeit(lambda: list(evaluator.stream_map(EXPRESSION, records)), number=NUMBER)
+    print('{} records, {} processors'.format(RECORDS, os.cpu_count()))
+    print('    stream_map: {:.1f} ms'.format(sequential / NUMBER * 1e3))
+
+    for workers in worker_counts():
+        with s2e2.ProcessEvaluator(evaluator, workers=workers, chunk_size=CHUNK_SIZE) as process_evaluator:
+            assert list(process_evaluator.stream_map(EXPRESSION, records)) == expected
+            parallel = timeit.timeit(lambda: list(process_evaluator.stream_map(EXPRESSION, records)), number=NUMBER)
+
+        print('    {} processes: {:.1f} ms, speedup: {:.1f}x'.format(
+            workers, parallel / NUMBER * 1e3, sequential / parallel))
+
+
+if __name__ == '__main__':
+    main()
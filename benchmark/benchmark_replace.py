@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compare REPLACE with patterns compiled by the re module on every call, which is how REPLACE used to work,
+with precompiled constant patterns and with the cache of compiled dynamic patterns.
+There are more distinct patterns than the internal cache of the re module holds.
+
+Also compare replacement of plain text patterns by the regex engine and as strings for short and long sources.
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from s2e2.functions.function_replace import FunctionReplace, FunctionReplaceCompiled
+
+import s2e2
+
+
+NUMBER_OF_PATTERNS = 2000
+
+NUMBER_OF_ROUNDS = 5
+
+SOURCE = 'rule-0042 matched value 42 in field-0042'
+
+LITERAL_SOURCES = (
+    ('short', 'The cat is black'),
+    ('long', 'The cat is black, the dog is white. ' * 300),
+)
+
+LITERAL_NUMBER = 20000
+
+
+def make_evaluator(replace):
+    evaluator = s2e2.Evaluator(cache_size=2 * NUMBER_OF_PATTERNS)
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+    evaluator.replace_function(replace)
+    return evaluator
+
+
+def main():
+    patterns = [r'rule-{:04d}|field-\d{{{}}}'.format(index, index % 7 + 1) for index in range(NUMBER_OF_PATTERNS)]
+    records = [{'S': SOURCE, 'P': pattern} for pattern in patterns] * NUMBER_OF_ROUNDS
+
+    def re_sub():
+        for record in records:
+            re.sub(record['P'], 'X', record['S'])
+
+    constant_evaluator = make_evaluator(FunctionReplace())
+    constant_expressions = [constant_evaluator.compile('REPLACE(${{S}}, "{}", X)'.format(pattern))
+                            for pattern in patterns] * NUMBER_OF_ROUNDS
+
+    def constant():
+        for compiled, record in zip(constant_expressions, records):
+            compiled.evaluate(record)
+
+    dynamic_replace = FunctionReplace(cache_size=2 * NUMBER_OF_PATTERNS)
+    dynamic_evaluator = make_evaluator(dynamic_replace)
+    dynamic_expression = dynamic_evaluator.compile('REPLACE(${S}, ${P}, X)')
+
+    def dynamic():
+        for record in records:
+            dynamic_expression.evaluate(record)
+
+    print('{} distinct patterns, {} calls'.format(len(patterns), len(records)))
+    print('    re.sub: {:.3f} s'.format(timeit.timeit(re_sub, number=1)))
+    print('    REPLACE with constant patterns: {:.3f} s'.format(timeit.timeit(constant, number=1)))
+    print('    REPLACE with dynamic patterns: {:.3f} s'.format(timeit.timeit(dynamic, number=1)))
+
+    statistics = dynamic_replace.get_pattern_statistics()
+    print('    dynamic patterns: hit rate {:.0%}, compile time {:.3f} s'.format(statistics.hit_rate,
+                                                                          statistics.compile_time))
+
+
+def literal_main():
+    # the same compiled pattern replaced by the regex engine and as a string
+    regex_replace = FunctionReplaceCompiled(re.compile('cat'))
+    literal_replace = FunctionReplaceCompiled(re.compile('cat'), is_literal=True)
+
+    for name, source in LITERAL_SOURCES:
+        number = LITERAL_NUMBER if len(source) < 100 else LITERAL_NUMBER // 20
+        regex_time = timeit.timeit(lambda: regex_replace.call(source, 'cat', 'dog'), number=number)
+        literal_time = timeit.timeit(lambda: literal_replace.call(source, 'cat', 'dog'), number=number)
+
+        print('{} source, {} symbols:'.format(name, len(source)))
+        print('    regex: {:.2f} us, literal REPLACE: {:.2f} us, speedup: {:.1f}x'.format(
+            regex_time / number * 1e6, literal_time / number * 1e6, regex_time / literal_time))
+
+
+if __name__ == '__main__':
+    main()
+    literal_main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare evaluation of a batch of expressions with a blocking custom function
+by Evaluator.evaluate_many and by ThreadedEvaluator.evaluate_many.
+"""
+
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import s2e2
+from s2e2.functions.function import Function
+
+
+class FunctionLookup(Function):
+    """
+    Function LOOKUP(<key>) imitates a blocking call of a local service.
+    """
+    DELAY = 0.002
+
+    def __init__(self):
+        super().__init__('LOOKUP', 1)
+
+    def _check_arguments(self, arguments):
+        return isinstance(arguments[0], str)
+
+    def _result(self, arguments):
+        time.sleep(FunctionLookup.DELAY)
+        return arguments[0].lower()
+
+
+BATCH_SIZE = 500
+
+WORKERS = (1, 4, 16)
+
+NUMBER = 3
+
+
+def make_evaluator():
+    evaluator = s2e2.Evaluator()
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+    evaluator.add_function(FunctionLookup())
+    return evaluator
+
+
+def main():
+    evaluator = make_evaluator()
+    batch = ['IF(LOOKUP(KEY{0}) == key{0}, Yes, No)'.format(index) for index in range(BATCH_SIZE)]
+
+    sequential = timeit.timeit(lambda: evaluator.evaluate_many(batch), number=NUMBER)
+    print('{} expressions, {} ms blocking call per expression'.format(BATCH_SIZE, FunctionLookup.DELAY * 1e3))
+    print('    evaluate_many: {:.1f} ms'.format(sequential / NUMBER * 1e3))
+
+    for workers in WORKERS:
+        with s2e2.ThreadedEvaluator(evaluator, workers=workers) as threaded_evaluator:
+            assert threaded_evaluator.evaluate_many(batch) == evaluator.evaluate_many(batch)
+            threaded = timeit.timeit(lambda: threaded_evaluator.evaluate_many(batch), number=NUMBER)
+            statistics = threaded_evaluator.get_statistics()
+
+        print('    {} workers: {:.1f} ms, speedup: {:.1f}x, utilization: {:.0%}'.format(
+            workers, threaded / NUMBER * 1e3, sequential / threaded, statistics.utilization))
+
+
+if __name__ == '__main__':
+    main()
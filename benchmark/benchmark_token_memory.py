@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Measure memory of parsed expressions, i.e. postfix sequences of tokens, with compact tokens
+and with tokens having a per-instance dictionary, which is how tokens used to be stored.
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from s2e2.converter import Converter
+from s2e2.tokenizer import Tokenizer
+
+import s2e2
+
+
+TEMPLATES = (
+    'A{} + B',
+    'IF(A{} < B, 1, 2) + IF(A > B, 3, 4)',
+    'IF(REPLACE("The cat is black {}", cat, dog) == "The dog is black", Yes, No)',
+    'FORMAT_DATE(ADD_DAYS(NOW(), {}), "%Y-%m-%d")',
+)
+
+NUMBER_OF_PLANS = 10000
+
+
+class DictToken:
+    """
+    Token with a per-instance dictionary.
+    """
+
+    def __init__(self, type, value):
+        self.type = type
+        self.value = value
+
+
+def make_plans():
+    evaluator = s2e2.Evaluator()
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+
+    tokenizer = Tokenizer()
+    converter = Converter()
+    for function in evaluator.get_functions():
+        tokenizer.add_function(function.name)
+    for operator in evaluator.get_operators():
+        tokenizer.add_operator(operator.name)
+        converter.add_operator(operator.name, operator.priority)
+
+    expressions = [TEMPLATES[index % len(TEMPLATES)].format(index) for index in range(NUMBER_OF_PLANS)]
+    return [converter.convert(tokenizer.tokenize(expression)) for expression in expressions]
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    plans = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(plans), sum(len(plan) for plan in plans) / len(plans)
+
+
+def main():
+    plans = make_plans()
+
+    # values are shared by both kinds of tokens, only tokens and lists are measured
+    compact, tokens_per_plan = measure(lambda: [[type(token)(token.type, token.value) for token in plan]
+                                                for plan in plans])
+    with_dictionary, _ = measure(lambda: [[DictToken(token.type, token.value) for token in plan]
+                                          for plan in plans])
+
+    print('{} plans, {:.1f} tokens per plan'.format(len(plans), tokens_per_plan))
+    print('    tokens with dictionary: {:.0f} bytes per plan, compact tokens: {:.0f} bytes per plan, '
+          'saving: {:.0%}'.format(with_dictionary, compact, 1 - compact / with_dictionary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare evaluation of an expression over many rows by a loop over Evaluator.evaluate
+and by the vectorized engine.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy
+import s2e2
+
+
+EXPRESSIONS = (
+    '${name} + "-" + ${city}',
+    'IF(${city} == London && ${name} != Bob, ${name}, NULL)',
+    '!(${name} < ${city}) || ${city} >= M',
+    'ADD_DAYS(${date}, ${days})',
+)
+
+ROWS = 200000
+
+LOOP_ROWS = 20000
+
+
+def make_columns():
+    generator = random.Random(0)
+    names = ['Alice', 'Bob', 'Carol', 'Dave', 'Eve']
+    cities = ['London', 'Paris', 'Madrid', 'Rome']
+
+    return {
+        'name': numpy.array([generator.choice(names) for _ in range(ROWS)]),
+        'city': numpy.array([generator.choice(cities) for _ in range(ROWS)]),
+        'date': numpy.datetime64('2020-01-01') + numpy.arange(ROWS) % 1000,
+        'days': numpy.arange(ROWS) % 30,
+    }
+
+
+def main():
+    evaluator = s2e2.Evaluator()
+    evaluator.add_standard_functions()
+    evaluator.add_standard_operators()
+
+    columns = make_columns()
+    rows = [{name: s2e2.VectorizedEngine.to_objects(column[index]).item() for name, column in columns.items()}
+            for index in range(LOOP_ROWS)]
+
+    for expression in EXPRESSIONS:
+        compiled = evaluator.compile(expression)
+
+        start = time.perf_counter()
+        expected = [evaluator.evaluate(expression, row) for row in rows]
+        loop = (time.perf_counter() - start) / LOOP_ROWS
+
+        start = time.perf_counter()
+        results = s2e2.VectorizedEngine.evaluate(compiled, columns)
+        vectorized = (time.perf_counter() - start) / ROWS
+
+        assert list(results[:LOOP_ROWS]) == expected
+
+        print('{}\n    evaluate: {:.3f} us/row, vectorized: {:.3f} us/row, speedup: {:.0f}x'.format(
+            expression,
+            loop * 1e6,
+            vectorized * 1e6,
+            loop / vectorized))
+
+
+if __name__ == '__main__':
+    main()
@@ -45,7 +45,8 @@ setuptools.setup(
     package_data={'': ['README.rst']},
     package_dir={'': 'src'},
 
-    python_requires='>=3.4',
+    python_requires='>=3.7',
+    extras_require={'numpy': ['numpy']},
     tests_require=['pytest', 'mock'],
     test_suite='test',
     cmdclass = {'test': PyTest},
@@ -55,9 +56,6 @@ setuptools.setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
@@ -3,11 +3,34 @@
 s2e2 - Simple String Expression Evaluator, it evaluates value of an input expression as a string.
 """
 
+from .backend import Backend
+from .clock import BatchClock, Clock, EvaluationClock, QuantizedClock, RealClock
+from .compiled_expression import CompiledExpression
 from .evaluator import Evaluator
 from .error import ExpressionError
+from .node import Node
+from .plan_store import PlanStore
+from .process_evaluator import ProcessEvaluator
+from .threaded_evaluator import ThreadedEvaluator
+from .vectorized_engine import VectorizedEngine
 
 
-__all__ = ('Evaluator')
+__all__ = (
+    'Backend',
+    'BatchClock',
+    'Clock',
+    'CompiledExpression',
+    'EvaluationClock',
+    'Evaluator',
+    'ExpressionError',
+    'Node',
+    'PlanStore',
+    'ProcessEvaluator',
+    'QuantizedClock',
+    'RealClock',
+    'ThreadedEvaluator',
+    'VectorizedEngine',
+)
 __title__ = 's2e2'
 __author__ = 'Mikhail Zinin (mzinin@gmail.com)'
 __license__ = 'MIT'
@@ -0,0 +1,279 @@
+import asyncio
+
+from .error import ExpressionError
+from .instructions import CALL, MEMO, LAZY
+from .program_tree import ProgramTree
+
+
+class PendingArgument(Exception):
+    """
+    Exception raised by a thunk of an argument whose value needs awaiting.
+
+    :param position:
+        Position of the argument.
+    """
+
+    def __init__(self, position):
+        """
+        Constructor.
+
+        :param position:
+            Position of the argument.
+        """
+        super().__init__(position)
+        self.position = position
+
+
+class AsyncInterpreter:
+    """
+    Class runs programs with asynchronous functions and operators.
+    Subprograms without asynchronous calls are run by a synchronous interpreter,
+    arguments of a call with several asynchronous subprograms are awaited concurrently.
+
+    Lazy functions and operators get synchronous thunks. If a thunk of an asynchronous argument is called
+    before the argument is awaited, the call of the lazy function or operator is interrupted,
+    the argument is awaited, and the call is repeated. So lazy functions and operators must have
+    no side effects except calls of thunks.
+
+    :param __program:
+        Sequence of instructions.
+
+    :param __run_sync:
+        Synchronous interpreter: function of a subprogram, bindings and memo returning value of the subprogram.
+
+    :param __trees:
+        Pairs (tree view, flags of asynchronous subprograms ending with every instruction) by ids of programs,
+        None for an invalid program.
+    """
+
+    def __init__(self, program, run_sync):
+        """
+        Constructor.
+
+        :param program:
+            Sequence of instructions.
+
+        :param run_sync:
+            Synchronous interpreter: function of a subprogram, bindings and memo returning value of the subprogram.
+        """
+        self.__program = program
+        self.__run_sync = run_sync
+        self.__trees = {}
+        self.__prepare(program)
+
+
+    async def run(self, bindings):
+        """
+        Run the program.
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :returns:
+            Raw result of the program.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression or wrong arguments.
+        """
+        return await self.__run(self.__program, bindings, {})
+
+
+    def __prepare(self, program):
+        """
+        Build tree view of the program and all its subprograms, mark asynchronous subprograms.
+
+        :param program:
+            Sequence of instructions.
+        """
+        if id(program) in self.__trees:
+            return
+
+        tree = ProgramTree.build(program)
+        if tree is None:
+            self.__trees[id(program)] = None
+            return
+
+        flags = []
+        for index, (code, operand) in enumerate(program):
+            if code == CALL:
+                flag = operand.asynchronous or any(flags[child] for child in tree.children[index])
+
+            elif code == MEMO:
+                self.__prepare(operand[1])
+                flag = self.__is_prepared_asynchronous(operand[1])
+
+            elif code == LAZY:
+                for subprogram in operand[1]:
+                    self.__prepare(subprogram)
+                flag = operand[0].asynchronous or any(self.__is_prepared_asynchronous(subprogram)
+                                                      for subprogram in operand[1])
+
+            else:
+                flag = False
+
+            flags.append(flag)
+
+        self.__trees[id(program)] = (tree, flags)
+
+
+    def __is_prepared_asynchronous(self, program):
+        """
+        Check if the prepared program calls any asynchronous function or operator.
+
+        :param program:
+            Sequence of instructions.
+
+        :returns:
+            True if there is an asynchronous call, False otherwise or if the program is invalid.
+        """
+        prepared = self.__trees[id(program)]
+        return prepared is not None and prepared[1][prepared[0].root]
+
+
+    async def __run(self, program, bindings, memo):
+        """
+        Run the (sub)program.
+
+        :param program:
+            Sequence of instructions.
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :param memo:
+            Values of MEMO subprograms by their slots, or futures of values being computed.
+
+        :returns:
+            Value of the program.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        prepared = self.__trees[id(program)]
+        if prepared is None:
+            raise ExpressionError('Invalid expression')
+
+        tree, flags = prepared
+        return await self.__evaluate(tree, flags, tree.root, bindings, memo)
+
+
+    async def __evaluate(self, tree, flags, index, bindings, memo):
+        """
+        Evaluate subprogram ending with the instruction.
+
+        :param tree:
+            Tree view of the program.
+
+        :param flags:
+            Flags of asynchronous subprograms.
+
+        :param index:
+            Index of the last instruction of the subprogram.
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :param memo:
+            Values of MEMO subprograms by their slots, or futures of values being computed.
+
+        :returns:
+            Value of the subprogram.
+        """
+        if not flags[index]:
+            return self.__run_sync(tree.subprogram(index), bindings, memo)
+
+        code, operand = tree.program[index]
+
+        if code == CALL:
+            children = tree.children[index]
+            if sum(flags[child] for child in children) > 1:
+                arguments = await asyncio.gather(*(self.__evaluate(tree, flags, child, bindings, memo)
+                                                   for child in children))
+            else:
+                arguments = [await self.__evaluate(tree, flags, child, bindings, memo) for child in children]
+
+            return await operand.call_async(*arguments)
+
+        if code == MEMO:
+            return await self.__evaluate_memo(operand, bindings, memo)
+
+        return await self.__evaluate_lazy_call(operand, bindings, memo)
+
+
+    async def __evaluate_memo(self, operand, bindings, memo):
+        """
+        Evaluate MEMO instruction with an asynchronous subprogram. Concurrent evaluations
+        of the same slot await the first one.
+
+        :param operand:
+            Pair (slot, subprogram).
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :param memo:
+            Values of MEMO subprograms by their slots, or futures of values being computed.
+
+        :returns:
+            Value of the subprogram.
+        """
+        slot, subprogram = operand
+
+        if slot in memo:
+            value = memo[slot]
+            return await value if isinstance(value, asyncio.Future) else value
+
+        future = asyncio.get_running_loop().create_future()
+        memo[slot] = future
+
+        try:
+            value = await self.__run(subprogram, bindings, memo)
+        except BaseException as error:
+            del memo[slot]
+            future.set_exception(error)
+            # the error is raised here, waiting evaluations are optional
+            future.exception()
+            raise
+
+        memo[slot] = value
+        future.set_result(value)
+        return value
+
+
+    async def __evaluate_lazy_call(self, operand, bindings, memo):
+        """
+        Evaluate LAZY instruction with asynchronous function, operator or arguments.
+
+        :param operand:
+            Pair (function or operator, tuple of subprograms of arguments).
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :param memo:
+            Values of MEMO subprograms by their slots, or futures of values being computed.
+
+        :returns:
+            Result of the function or operator.
+        """
+        entity, subprograms = operand
+        values = {}
+
+        def thunk(position):
+            if position not in values:
+                subprogram = subprograms[position]
+                if self.__is_prepared_asynchronous(subprogram):
+                    raise PendingArgument(position)
+                values[position] = self.__run_sync(subprogram, bindings, memo)
+            return values[position]
+
+        thunks = [lambda position=position: thunk(position) for position in range(len(subprograms))]
+
+        while True:
+            try:
+                result = entity.call_lazily(*thunks)
+            except PendingArgument as pending:
+                values[pending.position] = await self.__run(subprograms[pending.position], bindings, memo)
+                continue
+
+            return await result if entity.asynchronous and asyncio.iscoroutine(result) else result
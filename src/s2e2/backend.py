@@ -0,0 +1,12 @@
+import enum
+
+
+@enum.unique
+class Backend(enum.Enum):
+    """
+    Ways to evaluate compiled expressions.
+    """
+
+    INTERPRETER = 'Stack machine walking through the postfix program.'
+
+    CODE_GENERATOR = 'Python function generated out of the postfix program.'
@@ -0,0 +1,41 @@
+import contextvars
+import functools
+import inspect
+
+
+# Arguments of the function or operator which is being called.
+# Every thread and every asyncio task has its own value, nested calls restore the outer one.
+ARGUMENTS = contextvars.ContextVar('arguments')
+
+
+def with_context_arguments(method):
+    """
+    Adapt method of a function or operator which reads its arguments from self._arguments
+    to get arguments as a parameter, the arguments are put into the context for the time of the call.
+
+    :param method:
+        Method without parameters, it can be a coroutine function.
+
+    :returns:
+        Method with a single parameter: list of arguments.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def adapted_coroutine(self, arguments):
+            token = ARGUMENTS.set(arguments)
+            try:
+                return await method(self)
+            finally:
+                ARGUMENTS.reset(token)
+
+        return adapted_coroutine
+
+    @functools.wraps(method)
+    def adapted(self, arguments):
+        token = ARGUMENTS.set(arguments)
+        try:
+            return method(self)
+        finally:
+            ARGUMENTS.reset(token)
+
+    return adapted
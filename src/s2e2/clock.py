@@ -0,0 +1,166 @@
+import contextlib
+import contextvars
+import datetime
+
+
+# Pair (clock, function returning value of NOW()) of the current scope (an evaluation or a batch),
+# None outside of scopes and in scopes without a clock.
+# Every thread and every asyncio task has its own value, a nested scope of the same clock keeps the outer reading.
+READER = contextvars.ContextVar('clock_reader', default=None)
+
+# Start of the time quantized clocks count ticks from.
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class Clock:
+    """
+    Base class of clocks, policies of reading current UTC datetime by function NOW().
+    A clock is read once when a scope starts, and NOW() returns the same value within the scope.
+    The scope is an evaluation or, for clocks read once per batch, a batch of evaluations,
+    see :meth:`~s2e2.Evaluator.batch`.
+
+    :param source:
+        Function without arguments returning current UTC datetime, None for :meth:`datetime.datetime.utcnow`.
+        Fixed source makes evaluation of expressions with NOW() deterministic, e.g. in tests and benchmarks.
+
+    :param frozen:
+        Flag of a clock returning the same value within a scope.
+
+    :param per_batch:
+        Flag of a clock read once per batch of evaluations instead of once per evaluation.
+        Evaluation outside of a batch is a scope of its own.
+    """
+
+    frozen = True
+
+    per_batch = False
+
+    def __init__(self, source=None):
+        """
+        Constructor.
+
+        :param source:
+            Function returning current UTC datetime, None for :meth:`datetime.datetime.utcnow`.
+        """
+        self.source = source
+
+
+    def read(self):
+        """
+        Read current UTC datetime.
+
+        :returns:
+            Datetime.
+        """
+        if self.source is None:
+            return datetime.datetime.utcnow()
+
+        return self.source()
+
+
+    def start(self):
+        """
+        Start a scope.
+
+        :returns:
+            Function without arguments returning value of NOW() within the scope.
+        """
+        value = self.read()
+        return lambda: value
+
+
+class RealClock(Clock):
+    """
+    Clock which is read on every call of NOW(), so calls within one evaluation may return different values.
+    """
+
+    frozen = False
+
+    def start(self):
+        return self.read
+
+
+class EvaluationClock(Clock):
+    """
+    Clock frozen per evaluation: all calls of NOW() within one evaluation return the same value.
+    """
+
+
+class BatchClock(Clock):
+    """
+    Clock frozen per batch: all calls of NOW() within one batch of evaluations return the same value.
+    """
+
+    per_batch = True
+
+
+class QuantizedClock(Clock):
+    """
+    Clock rounded down to a whole number of ticks since the epoch and read once per batch.
+    Value of NOW() changes only once a tick, so an expression without variables which calls no other impure
+    functions than NOW() is evaluated once a tick, later evaluations within the tick return its cached value.
+
+    :param tick:
+        Duration of a tick as a :class:`~datetime.timedelta`.
+    """
+
+    per_batch = True
+
+    def __init__(self, seconds, source=None):
+        """
+        Constructor.
+
+        :param seconds:
+            Duration of a tick in seconds.
+
+        :param source:
+            Function returning current UTC datetime, None for :meth:`datetime.datetime.utcnow`.
+
+        :raises:
+            :class:`~ValueError` if duration of a tick is not positive.
+        """
+        if seconds <= 0:
+            raise ValueError('Tick of QuantizedClock must be positive')
+
+        super().__init__(source)
+        self.tick = datetime.timedelta(seconds=seconds)
+
+
+    def read(self):
+        value = super().read()
+        return value - (value - EPOCH.replace(tzinfo=value.tzinfo)) % self.tick
+
+
+@contextlib.contextmanager
+def scope(clock):
+    """
+    Read the clock once for the time of the scope. Nested scope of the same clock keeps reading of the outer one,
+    scope of another clock is read anew, so evaluators with different clocks do not see each other's readings.
+
+    :param clock:
+        :class:`~s2e2.clock.Clock` or None for current UTC datetime on every call of NOW().
+    """
+    current = READER.get()
+    if (current[0] if current is not None else None) is clock:
+        yield
+        return
+
+    token = READER.set((clock, clock.start()) if clock is not None else None)
+    try:
+        yield
+    finally:
+        READER.reset(token)
+
+
+def now():
+    """
+    Get value of NOW() in the current scope.
+
+    :returns:
+        Datetime of the clock of the scope, current UTC datetime outside of scopes.
+    """
+    current = READER.get()
+    if current is None:
+        return datetime.datetime.utcnow()
+
+    return current[1]()
@@ -0,0 +1,334 @@
+from .error import ExpressionError
+from .instructions import PUSH, LOAD, CALL, MEMO, LAZY
+from .operators.operator import Operator
+
+
+class CodeGenerator:
+    """
+    Class generates Python function out of a program of a compiled expression.
+    Generated function does the same as :meth:`~s2e2.functions.Function.call` for every
+    function and operator inline, without the stack machine. Every call gets its own list
+    of arguments, so the function can be run by several threads at once.
+
+    :param __lines:
+        Lines of the generated source code.
+
+    :param __namespace:
+        Namespace of the generated function.
+
+    :param __counter:
+        Number of processed instructions, used to name constants and variables.
+
+    :param __memo:
+        Variables with values of MEMO subprograms by their slots.
+
+    :param __lazy:
+        Flag of a program with LAZY instructions. Code of such program is not straight-line,
+        so values of MEMO subprograms are kept in a dictionary created on every evaluation.
+    """
+
+    # Name of the generated function.
+    FUNCTION_NAME = 'evaluate'
+
+    # Indentation of one level of code.
+    INDENT = '    '
+
+    def __init__(self, lazy):
+        """
+        Constructor.
+
+        :param lazy:
+            Flag of a program with LAZY instructions.
+        """
+        self.__lines = ['def {}(bindings=None):'.format(CodeGenerator.FUNCTION_NAME)]
+        self.__namespace = {'__builtins__': {}, 'ExpressionError': ExpressionError}
+        self.__counter = 0
+        self.__memo = {}
+        self.__lazy = lazy
+
+
+    @staticmethod
+    def generate(program):
+        """
+        Generate Python function out of the program.
+
+        :param program:
+            Sequence of instructions.
+
+        :returns:
+            Function of a mapping of values of variables by their names returning result of the program
+            or None if the program is invalid and must be interpreted.
+        """
+        generator = CodeGenerator(CodeGenerator.__has_lazy_instructions(program))
+        try:
+            if not generator.__generate(program):
+                return None
+
+            namespace = generator.__namespace
+            exec(compile(generator.__source(), '<s2e2>', 'exec'), namespace)
+        except (MemoryError, RecursionError, SyntaxError):
+            # too deeply nested program, it is still fine for the interpreter
+            return None
+
+        return namespace[CodeGenerator.FUNCTION_NAME]
+
+
+    @staticmethod
+    def generate_source(program):
+        """
+        Generate source code of Python function out of the program.
+        Every constant and every name of a variable of the program is referred as c<index>;
+        list of arguments, check method, result method and error message of every callable are referred
+        as a<index>, k<index>, r<index> and m<index>, where index is the index of the instruction.
+
+        :param program:
+            Sequence of instructions.
+
+        :returns:
+            Source code as a string or None if the program is invalid.
+        """
+        generator = CodeGenerator(CodeGenerator.__has_lazy_instructions(program))
+        if not generator.__generate(program):
+            return None
+
+        return generator.__source()
+
+
+    def __generate(self, program):
+        """
+        Generate code of the whole program.
+
+        :param program:
+            Sequence of instructions.
+
+        :returns:
+            True if the program is valid, False otherwise.
+        """
+        indent = CodeGenerator.INDENT
+        if self.__lazy:
+            self.__emit(indent, 'memo = {}')
+
+        stack = []
+        if not self.__generate_subprogram(program, stack, indent) or len(stack) != 1:
+            return False
+
+        self.__emit(indent, 'return {}'.format(stack[0]))
+        return True
+
+
+    def __generate_subprogram(self, program, stack, indent):
+        """
+        Generate code of the subprogram.
+
+        :param program:
+            Sequence of instructions.
+
+        :param stack:
+            Stack of names of values.
+
+        :param indent:
+            Indentation of the code.
+
+        :returns:
+            True if the subprogram is valid, False otherwise.
+        """
+        for code, operand in program:
+            index = self.__counter
+            self.__counter += 1
+
+            if code == PUSH:
+                name = 'c{}'.format(index)
+                self.__namespace[name] = operand
+                stack.append(name)
+
+            elif code == LOAD:
+                name = 'v{}'.format(index)
+                self.__namespace['c{}'.format(index)] = operand
+                self.__emit(indent, '{} = bindings[c{}]'.format(name, index))
+                stack.append(name)
+
+            elif code == CALL:
+                if len(stack) < operand.number_of_arguments:
+                    return False
+                self.__generate_call(index, operand, stack, indent)
+
+            elif code == MEMO:
+                if not self.__generate_memo(index, operand, stack, indent):
+                    return False
+
+            elif code == LAZY:
+                if not self.__generate_lazy_call(index, operand, stack, indent):
+                    return False
+
+            else:
+                return False
+
+        return True
+
+
+    def __generate_call(self, index, entity, stack, indent):
+        """
+        Generate code of the function or operator call.
+
+        :param index:
+            Index of the instruction.
+
+        :param entity:
+            Function or operator.
+
+        :param stack:
+            Stack of names of values.
+
+        :param indent:
+            Indentation of the code.
+        """
+        number_of_arguments = entity.number_of_arguments
+        arguments = stack[len(stack) - number_of_arguments:]
+        del stack[len(stack) - number_of_arguments:]
+
+        variable = 'v{}'.format(index)
+        self.__emit(indent, 'a{} = [{}]'.format(index, ', '.join(arguments)))
+        self.__emit(indent, 'if not k{0}(a{0}):'.format(index))
+        self.__emit(indent + CodeGenerator.INDENT, 'raise ExpressionError(m{})'.format(index))
+        self.__emit(indent, '{0} = r{1}(a{1})'.format(variable, index))
+        stack.append(variable)
+
+        kind = 'operator' if isinstance(entity, Operator) else 'function'
+        self.__namespace['k{}'.format(index)] = entity._check_arguments
+        self.__namespace['r{}'.format(index)] = entity._result
+        self.__namespace['m{}'.format(index)] = 'Invalid arguments for {} {}'.format(kind, entity.name)
+
+
+    def __generate_memo(self, index, operand, stack, indent):
+        """
+        Generate code of the MEMO instruction. Straight-line code always runs the first
+        occurrence of a slot before others: it computes the value and the others reuse it.
+        Otherwise the value is computed by whichever occurrence runs first.
+
+        :param index:
+            Index of the instruction.
+
+        :param operand:
+            Pair (slot, subprogram).
+
+        :param stack:
+            Stack of names of values.
+
+        :param indent:
+            Indentation of the code.
+
+        :returns:
+            True if the subprogram is valid, False otherwise.
+        """
+        slot, subprogram = operand
+
+        if not self.__lazy:
+            if slot not in self.__memo:
+                memo_stack = []
+                if not self.__generate_subprogram(subprogram, memo_stack, indent) or len(memo_stack) != 1:
+                    return False
+                self.__memo[slot] = memo_stack[0]
+
+            stack.append(self.__memo[slot])
+            return True
+
+        variable = 'v{}'.format(index)
+        inner_indent = indent + CodeGenerator.INDENT
+
+        self.__emit(indent, 'if {} in memo:'.format(slot))
+        self.__emit(inner_indent, '{} = memo[{}]'.format(variable, slot))
+        self.__emit(indent, 'else:')
+
+        memo_stack = []
+        if not self.__generate_subprogram(subprogram, memo_stack, inner_indent) or len(memo_stack) != 1:
+            return False
+
+        self.__emit(inner_indent, '{} = memo[{}] = {}'.format(variable, slot, memo_stack[0]))
+        stack.append(variable)
+        return True
+
+
+    def __generate_lazy_call(self, index, operand, stack, indent):
+        """
+        Generate code of the LAZY instruction: a nested function for every argument
+        and a call of the lazy function or operator with these nested functions.
+
+        :param index:
+            Index of the instruction.
+
+        :param operand:
+            Pair (function or operator, tuple of subprograms of arguments).
+
+        :param stack:
+            Stack of names of values.
+
+        :param indent:
+            Indentation of the code.
+
+        :returns:
+            True if all subprograms are valid, False otherwise.
+        """
+        entity, subprograms = operand
+        inner_indent = indent + CodeGenerator.INDENT
+        thunks = []
+
+        for position, subprogram in enumerate(subprograms):
+            thunk = 't{}_{}'.format(index, position)
+            self.__emit(indent, 'def {}():'.format(thunk))
+
+            thunk_stack = []
+            if not self.__generate_subprogram(subprogram, thunk_stack, inner_indent) or len(thunk_stack) != 1:
+                return False
+
+            self.__emit(inner_indent, 'return {}'.format(thunk_stack[0]))
+            thunks.append(thunk)
+
+        variable = 'v{}'.format(index)
+        self.__emit(indent, '{} = l{}({})'.format(variable, index, ', '.join(thunks)))
+        stack.append(variable)
+
+        self.__namespace['l{}'.format(index)] = entity.call_lazily
+        return True
+
+
+    def __emit(self, indent, line):
+        """
+        Add line of code.
+
+        :param indent:
+            Indentation of the line.
+
+        :param line:
+            Code.
+        """
+        self.__lines.append(indent + line)
+
+
+    @staticmethod
+    def __has_lazy_instructions(program):
+        """
+        Check if the program or any of its MEMO subprograms contains LAZY instructions.
+
+        :param program:
+            Sequence of instructions.
+
+        :returns:
+            True if there is a LAZY instruction, False otherwise.
+        """
+        for code, operand in program:
+            if code == LAZY:
+                return True
+            if code == MEMO and CodeGenerator.__has_lazy_instructions(operand[1]):
+                return True
+
+        return False
+
+
+    def __source(self):
+        """
+        Get generated source code.
+
+        :returns:
+            Source code as a string.
+        """
+        return '\n'.join(self.__lines) + '\n'
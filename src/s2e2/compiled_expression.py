@@ -0,0 +1,474 @@
+import collections
+import functools
+import sys
+
+from .async_interpreter import AsyncInterpreter
+from .backend import Backend
+from . import clock as clocks
+from .code_generator import CodeGenerator
+from .error import ExpressionError
+from .instructions import PUSH, LOAD, CALL, MEMO, LAZY
+
+
+# Statistics of optimizations done during compilation.
+OptimizationStatistics = collections.namedtuple('OptimizationStatistics', 'folded_nodes merged_subtrees')
+
+
+class CompiledExpression:
+    """
+    Expression converted into a program for a stack machine.
+    Compiled expression is immutable and can be evaluated any number of times.
+
+    :param __expression:
+        Source expression.
+
+    :param __program:
+        Tuple of instructions, every instruction is a pair (code, operand).
+        PUSH instruction puts its operand (a value) into the stack,
+        LOAD instruction puts value of the variable named by its operand into the stack,
+        CALL instruction invokes its operand (a function or an operator),
+        MEMO instruction puts value of its subprogram evaluated once per evaluation,
+        LAZY instruction invokes its function or operator with thunks of arguments' subprograms.
+
+    :param __statistics:
+        Statistics of optimizations done during compilation.
+
+    :param __variables:
+        Names of all variables of the expression.
+
+    :param __pure:
+        Flag of an expression built only of pure functions and operators.
+
+    :param __pure_in_batch:
+        Flag of an expression which has the same value for the same bindings within a batch of evaluations.
+
+    :param __reads_clock:
+        Flag of an expression with functions or operators reading the clock, e.g. NOW().
+
+    :param __clock:
+        Clock read by NOW() during evaluation, None for current UTC datetime or if the expression does not read it.
+
+    :param __memoize_clock:
+        Flag of an expression without variables whose value depends only on a clock frozen per scope.
+
+    :param __clock_memo:
+        Pair (value of NOW(), value of the expression) of the last evaluation of such expression.
+
+    :param __async_interpreter:
+        Interpreter of the program with asynchronous functions or operators, None for synchronous programs.
+
+    :param __function:
+        Python function generated out of the program, if the program is not interpreted.
+
+    :param __size:
+        Approximate size of the compiled expression in bytes.
+    """
+
+    # Expected stack size after processing all instructions.
+    FINAL_STACK_SIZE = 1
+
+    def __init__(self, expression, program, backend=Backend.INTERPRETER, statistics=None, clock=None):
+        """
+        Constructor.
+
+        :param expression:
+            Source expression.
+
+        :param program:
+            Sequence of instructions.
+
+        :param backend:
+            Way to evaluate the program as a :class:`~s2e2.Backend`.
+
+        :param statistics:
+            Statistics of optimizations done during compilation.
+
+        :param clock:
+            Clock read by NOW() as a :class:`~s2e2.clock.Clock`, None for current UTC datetime.
+        """
+        self.__expression = expression
+        self.__program = tuple(program)
+        self.__statistics = statistics or OptimizationStatistics(0, 0)
+        self.__variables = frozenset(operand for code, operand in CompiledExpression.__instructions(self.__program)
+                                     if code == LOAD)
+        self.__pure = all(operand.pure for code, operand in CompiledExpression.__instructions(self.__program)
+                          if code == CALL)
+        self.__reads_clock = any(operand.reads_clock
+                                 for code, operand in CompiledExpression.__instructions(self.__program) if code == CALL)
+        depends_on_clock = all(operand.pure or operand.reads_clock
+                               for code, operand in CompiledExpression.__instructions(self.__program) if code == CALL)
+        self.__clock = clock if self.__reads_clock else None
+        self.__pure_in_batch = self.__pure or (self.__clock is not None and self.__clock.per_batch and depends_on_clock)
+        self.__clock_memo = None
+        self.__memoize_clock = (self.__clock is not None and self.__clock.frozen and depends_on_clock and
+                                not self.__variables)
+        self.__async_interpreter = None
+        if any(operand.asynchronous for code, operand in CompiledExpression.__instructions(self.__program)
+               if code == CALL):
+            self.__async_interpreter = AsyncInterpreter(self.__program, CompiledExpression.__run_thunk)
+        self.__function = None
+        if backend == Backend.CODE_GENERATOR and self.__async_interpreter is None:
+            self.__function = CodeGenerator.generate(self.__program)
+        self.__size = self.__estimate_size()
+
+
+    @property
+    def expression(self):
+        """
+        Source expression.
+        """
+        return self.__expression
+
+
+    @property
+    def program(self):
+        """
+        Tuple of instructions.
+        """
+        return self.__program
+
+
+    @property
+    def statistics(self):
+        """
+        Statistics of optimizations done during compilation.
+        """
+        return self.__statistics
+
+
+    @property
+    def variables(self):
+        """
+        Frozen set of names of all variables of the expression.
+        """
+        return self.__variables
+
+
+    @property
+    def is_pure(self):
+        """
+        Flag of an expression which always has the same value for the same bindings,
+        i.e. all its functions and operators are pure.
+        """
+        return self.__pure
+
+
+    @property
+    def is_pure_in_batch(self):
+        """
+        Flag of an expression which has the same value for the same bindings within a batch of evaluations,
+        i.e. it is pure or its only impure functions and operators read a clock frozen per batch.
+        """
+        return self.__pure_in_batch
+
+
+    @property
+    def clock(self):
+        """
+        Clock read by NOW() during evaluation as a :class:`~s2e2.clock.Clock`,
+        None for current UTC datetime or if the expression does not read the clock.
+        """
+        return self.__clock
+
+
+    @property
+    def is_async(self):
+        """
+        Flag of an expression with asynchronous functions or operators,
+        such expression is evaluated only by :meth:`evaluate_async`.
+        """
+        return self.__async_interpreter is not None
+
+
+    @property
+    def size(self):
+        """
+        Approximate size of the compiled expression in bytes.
+        Functions and operators are shared between expressions and not counted.
+        """
+        return self.__size
+
+
+    def evaluate(self, bindings=None):
+        """
+        Evaluate the expression.
+
+        :param bindings:
+            Mapping of values of the expression's variables by their names.
+            Values are used as is, they are never parsed.
+
+        :returns:
+            Value of expression as a string or empty value if the result is NULL.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression, an undefined variable
+            or an expression with asynchronous functions or operators.
+        """
+        if self.__async_interpreter is not None:
+            raise ExpressionError('Expression with asynchronous functions must be evaluated by evaluate_async')
+
+        bindings = self.__check_bindings(bindings)
+
+        if not self.__reads_clock:
+            result = self.__execute(bindings)
+        else:
+            # scope without a clock hides readings of clocks of other evaluators
+            with clocks.scope(self.__clock):
+                result = self.__execute_with_clock(bindings)
+
+        return str(result) if result else None
+
+
+    async def evaluate_async(self, bindings=None):
+        """
+        Evaluate the expression awaiting its asynchronous functions and operators.
+        Arguments of a call with several asynchronous arguments are awaited concurrently.
+        Expression without asynchronous functions and operators is evaluated the same way as by :meth:`evaluate`.
+
+        :param bindings:
+            Mapping of values of the expression's variables by their names.
+            Values are used as is, they are never parsed.
+
+        :returns:
+            Value of expression as a string or empty value if the result is NULL.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression or an undefined variable.
+        """
+        if self.__async_interpreter is None:
+            return self.evaluate(bindings)
+
+        bindings = self.__check_bindings(bindings)
+
+        with clocks.scope(self.__clock):
+            result = await self.__async_interpreter.run(bindings)
+
+        return str(result) if result else None
+
+
+    def __call__(self, bindings=None):
+        """
+        Evaluate the expression, the same as :meth:`evaluate`.
+        """
+        return self.evaluate(bindings)
+
+
+    def __check_bindings(self, bindings):
+        """
+        Check that all variables of the expression are bound.
+
+        :param bindings:
+            Mapping of values of the expression's variables by their names or None.
+
+        :returns:
+            Bindings, an empty mapping instead of None.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` if some variable is not bound.
+        """
+        if bindings is None:
+            bindings = {}
+
+        if self.__variables:
+            undefined = [name for name in self.__variables if name not in bindings]
+            if undefined:
+                raise ExpressionError('Undefined variable {}'.format(min(undefined)))
+
+        return bindings
+
+
+    def __execute(self, bindings):
+        """
+        Run the generated function or interpret the program.
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :returns:
+            Raw result of the program.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        if self.__function is not None:
+            return self.__function(bindings)
+
+        return self.__interpret(bindings)
+
+
+    def __execute_with_clock(self, bindings):
+        """
+        Run the program within a scope of the clock, reuse value of the last evaluation
+        if the expression depends only on the clock and its value has not changed.
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :returns:
+            Raw result of the program.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        if not self.__memoize_clock:
+            return self.__execute(bindings)
+
+        now = clocks.now()
+        memo = self.__clock_memo
+        if memo is not None and memo[0] == now:
+            return memo[1]
+
+        result = self.__execute(bindings)
+        self.__clock_memo = (now, result)
+        return result
+
+
+    def __interpret(self, bindings):
+        """
+        Run the program on the stack machine.
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :returns:
+            Raw result of the program.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        stack = []
+
+        CompiledExpression.__run(self.__program, stack, bindings, {})
+
+        if len(stack) != CompiledExpression.FINAL_STACK_SIZE:
+            raise ExpressionError('Invalid expression')
+
+        return stack.pop()
+
+
+    @staticmethod
+    def __run(program, stack, bindings, memo):
+        """
+        Run the (sub)program on the stack machine.
+
+        :param program:
+            Sequence of instructions.
+
+        :param stack:
+            Stack of intermediate values.
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :param memo:
+            Values of MEMO subprograms by their slots.
+        """
+        for code, operand in program:
+            if code == PUSH:
+                stack.append(operand)
+
+            elif code == LOAD:
+                stack.append(bindings[operand])
+
+            elif code == CALL:
+                operand.invoke(stack)
+
+            elif code == MEMO:
+                slot, subprogram = operand
+                if slot in memo:
+                    stack.append(memo[slot])
+                else:
+                    CompiledExpression.__run(subprogram, stack, bindings, memo)
+                    memo[slot] = stack[-1]
+
+            else:
+                entity, subprograms = operand
+                thunks = [functools.partial(CompiledExpression.__run_thunk, subprogram, bindings, memo)
+                          for subprogram in subprograms]
+                stack.append(entity.call_lazily(*thunks))
+
+
+    @staticmethod
+    def __run_thunk(program, bindings, memo):
+        """
+        Run subprogram of an argument of a lazy function or operator.
+
+        :param program:
+            Sequence of instructions computing exactly one value.
+
+        :param bindings:
+            Mapping of values of variables by their names.
+
+        :param memo:
+            Values of MEMO subprograms by their slots.
+
+        :returns:
+            Value of the argument.
+        """
+        stack = []
+        CompiledExpression.__run(program, stack, bindings, memo)
+        return stack.pop()
+
+
+    def __estimate_size(self):
+        """
+        Estimate size of the compiled expression.
+
+        :returns:
+            Size in bytes.
+        """
+        size = sys.getsizeof(self) + sys.getsizeof(self.__expression)
+
+        programs = [self.__program]
+        counted = set()
+
+        while programs:
+            program = programs.pop()
+            size += sys.getsizeof(program)
+
+            for code, operand in program:
+                size += sys.getsizeof((code, operand))
+
+                if code in (PUSH, LOAD):
+                    size += sys.getsizeof(operand)
+
+                elif code == MEMO and operand[0] not in counted:
+                    counted.add(operand[0])
+                    size += sys.getsizeof(operand)
+                    programs.append(operand[1])
+
+                elif code == LAZY:
+                    size += sys.getsizeof(operand) + sys.getsizeof(operand[1])
+                    programs.extend(operand[1])
+
+        return size
+
+
+    @staticmethod
+    def __instructions(program):
+        """
+        Iterate over all instructions of the program including its subprograms.
+        LAZY instructions are yielded as CALL ones of their functions and operators.
+
+        :param program:
+            Sequence of instructions.
+
+        :returns:
+            Generator of pairs (code, operand).
+        """
+        programs = [program]
+        visited = set()
+
+        while programs:
+            for code, operand in programs.pop():
+                if code == MEMO:
+                    if operand[0] not in visited:
+                        visited.add(operand[0])
+                        programs.append(operand[1])
+
+                elif code == LAZY:
+                    programs.extend(operand[1])
+                    yield CALL, operand[0]
+
+                else:
+                    yield code, operand
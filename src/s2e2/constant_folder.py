@@ -0,0 +1,87 @@
+from .instructions import PUSH, LOAD, CALL
+
+
+class ConstantFolder:
+    """
+    Class replaces subprograms consisting of constants and pure synchronous functions or operators
+    with their values, i.e. evaluates such subprograms once during compilation.
+    Calls with only some constant arguments are replaced with calls of specialized versions
+    of functions and operators, see :meth:`~s2e2.functions.function.Function.specialize`.
+    """
+
+    @staticmethod
+    def fold(program):
+        """
+        Fold all constant subprograms of the program.
+        Subprograms which fail to evaluate are kept as is, so the error happens during evaluation.
+
+        :param program:
+            Sequence of instructions.
+
+        :returns:
+            Pair (folded program as a list of instructions, number of eliminated instructions).
+        """
+        result = []
+        eliminated = 0
+
+        # for every value in the stack: pair (start of its subprogram in the result, is it constant)
+        stack = []
+
+        for index, (code, operand) in enumerate(program):
+            if code == PUSH:
+                stack.append((len(result), True))
+                result.append((code, operand))
+                continue
+
+            if code == LOAD:
+                stack.append((len(result), False))
+                result.append((code, operand))
+                continue
+
+            if code != CALL or len(stack) < operand.number_of_arguments:
+                # invalid program, let it fail during evaluation
+                result.extend(program[index:])
+                break
+
+            number_of_arguments = operand.number_of_arguments
+            arguments = stack[len(stack) - number_of_arguments:]
+            del stack[len(stack) - number_of_arguments:]
+            start = arguments[0][0] if arguments else len(result)
+
+            if operand.pure and not operand.asynchronous and all(constant for _, constant in arguments):
+                folded, value = ConstantFolder.__evaluate(operand, result[start:])
+                if folded:
+                    del result[start:]
+                    result.append((PUSH, value))
+                    stack.append((start, True))
+                    eliminated += number_of_arguments
+                    continue
+
+            constants = {position: result[argument_start][1]
+                         for position, (argument_start, constant) in enumerate(arguments) if constant}
+            specialized = operand.specialize(constants) if constants else None
+
+            result.append((code, specialized or operand))
+            stack.append((start, False))
+
+        return result, eliminated
+
+
+    @staticmethod
+    def __evaluate(entity, arguments):
+        """
+        Evaluate function or operator with constant arguments.
+
+        :param entity:
+            Function or operator.
+
+        :param arguments:
+            List of PUSH instructions.
+
+        :returns:
+            Pair (is evaluation successful, result).
+        """
+        try:
+            return True, entity.call(*(value for _, value in arguments))
+        except Exception:
+            return False, None
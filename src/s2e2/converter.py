@@ -1,17 +1,13 @@
 from .error import ExpressionError
-from .token_type import TokenType
+from .token_type import ATOM, COMMA, FUNCTION, LEFT_BRACKET, OPERATOR, RIGHT_BRACKET, VARIABLE
 
 
 class Converter:
     """
     Class converts infix token sequence into postfix one.
     Convertion is done by Shunting Yard algorithm.
-
-    :param __output_queue:
-        Output queue of all tokens.
-
-    :param __operator_stack:
-        Stack of operators and functions.
+    State of a convertion is kept in its own output queue and operator stack,
+    so several threads can convert expressions at once.
 
     :param __operators:
         All expected operators and their priorities (precedences).
@@ -21,8 +17,6 @@ class Converter:
         """
         Default constructor.
         """
-        self.__output_queue = []
-        self.__operator_stack = []
         self.__operators = {}
 
 
@@ -66,100 +60,134 @@ class Converter:
         if not infix_expression:
             raise TypeError('Attempt to convert None with Converter')
 
-        self.__output_queue = []
-        self.__operator_stack = []
+        output_queue = []
+        operator_stack = []
 
-        self.__process_tokens(infix_expression)
-        self.__process_operators()
+        self.__process_tokens(infix_expression, output_queue, operator_stack)
+        Converter.__process_operators(output_queue, operator_stack)
 
-        return self.__output_queue
+        return output_queue
 
 
-    def __process_tokens(self, expression):
+    def __process_tokens(self, expression, output_queue, operator_stack):
         """
         Process all tokens in the input sequence.
 
         :param expression:
             Tokens sequence.
 
+        :param output_queue:
+            Output queue of all tokens.
+
+        :param operator_stack:
+            Stack of operators and functions.
+
         :raises:
             :class:`~s2e2.ExpressionError` in case of an error.
         """
         for token in expression:
-            if token.type == TokenType.ATOM:
-                self.__process_atom(token)
+            if token.type is ATOM or token.type is VARIABLE:
+                Converter.__process_atom(token, output_queue)
 
-            elif token.type == TokenType.COMMA:
-                self.__process_comma()
+            elif token.type is COMMA:
+                Converter.__process_comma(output_queue, operator_stack)
 
-            elif token.type == TokenType.FUNCTION:
-                self.__process_function(token)
+            elif token.type is FUNCTION:
+                Converter.__process_function(token, operator_stack)
 
-            elif token.type == TokenType.OPERATOR:
-                self.__process_operator(token)
+            elif token.type is OPERATOR:
+                self.__process_operator(token, output_queue, operator_stack)
 
-            elif token.type == TokenType.LEFT_BRACKET:
-                self.__process_left_bracket(token)
+            elif token.type is LEFT_BRACKET:
+                Converter.__process_left_bracket(token, operator_stack)
 
-            elif token.type == TokenType.RIGHT_BRACKET:
-                self.__process_right_bracket()
+            elif token.type is RIGHT_BRACKET:
+                Converter.__process_right_bracket(output_queue, operator_stack)
 
             else:
                 raise ExpressionError('Unexpected token type {}'.format(token.type))
 
 
-    def __process_operators(self):
+    @staticmethod
+    def __process_operators(output_queue, operator_stack):
         """
         Process all operators left in the operator stack.
 
+        :param output_queue:
+            Output queue of all tokens.
+
+        :param operator_stack:
+            Stack of operators and functions.
+
         :raises:
             :class:`~s2e2.ExpressionError` in case of an error.
         """
-        while self.__operator_stack:
-            token = self.__operator_stack.pop()
+        while operator_stack:
+            token = operator_stack.pop()
 
-            if token.type == TokenType.LEFT_BRACKET:
+            if token.type is LEFT_BRACKET:
                 raise ExpressionError('Unpaired bracket')
 
-            self.__output_queue.append(token)
+            output_queue.append(token)
 
 
-    def __process_atom(self, token):
+    @staticmethod
+    def __process_atom(token, output_queue):
         """
-        Process ATOM token.
+        Process ATOM or VARIABLE token.
 
         :param token:
             Input token.
+
+        :param output_queue:
+            Output queue of all tokens.
         """
-        self.__output_queue.append(token)
+        output_queue.append(token)
 
 
-    def __process_comma(self):
+    @staticmethod
+    def __process_comma(output_queue, operator_stack):
         """
         Process COMMA token.
+
+        :param output_queue:
+            Output queue of all tokens.
+
+        :param operator_stack:
+            Stack of operators and functions.
         """
-        while self.__operator_stack and \
-              self.__operator_stack[-1].type != TokenType.LEFT_BRACKET:
-            self.__output_queue.append(self.__operator_stack.pop())
+        while operator_stack and \
+              operator_stack[-1].type is not LEFT_BRACKET:
+            output_queue.append(operator_stack.pop())
 
 
-    def __process_function(self, token):
+    @staticmethod
+    def __process_function(token, operator_stack):
         """
         Process FUNCTION token.
 
         :param token:
             Input token.
+
+        :param operator_stack:
+            Stack of operators and functions.
         """
-        self.__operator_stack.append(token)
+        operator_stack.append(token)
 
 
-    def __process_operator(self, token):
+    def __process_operator(self, token, output_queue, operator_stack):
         """
         Process OPERATOR token.
 
         :param token:
             Input token.
 
+        :param output_queue:
+            Output queue of all tokens.
+
+        :param operator_stack:
+            Stack of operators and functions.
+
         :raises:
             :class:`~s2e2.ExpressionError` in case of an unknown operator.
         """
@@ -167,40 +195,51 @@ class Converter:
         if not priority:
             raise ExpressionError('Unknown operator {}'.format(token.value))
 
-        while self.__operator_stack and \
-              self.__operator_stack[-1].type == TokenType.OPERATOR and \
-              priority <= self.__operators[self.__operator_stack[-1].value]:
-            self.__output_queue.append(self.__operator_stack.pop())
+        while operator_stack and \
+              operator_stack[-1].type is OPERATOR and \
+              priority <= self.__operators[operator_stack[-1].value]:
+            output_queue.append(operator_stack.pop())
 
-        self.__operator_stack.append(token)
+        operator_stack.append(token)
 
 
-    def __process_left_bracket(self, token):
+    @staticmethod
+    def __process_left_bracket(token, operator_stack):
         """
         Process LEFT BRACKET token.
 
         :param token:
             Input token.
+
+        :param operator_stack:
+            Stack of operators and functions.
         """
-        self.__operator_stack.append(token)
+        operator_stack.append(token)
 
 
-    def __process_right_bracket(self):
+    @staticmethod
+    def __process_right_bracket(output_queue, operator_stack):
         """
         Process RIGHT BRACKET token.
 
+        :param output_queue:
+            Output queue of all tokens.
+
+        :param operator_stack:
+            Stack of operators and functions.
+
         :raises:
             :class:`~s2e2.ExpressionError` in case of an unpaired bracket.
         """
-        while self.__operator_stack and \
-              self.__operator_stack[-1].type != TokenType.LEFT_BRACKET:
-            self.__output_queue.append(self.__operator_stack.pop())
+        while operator_stack and \
+              operator_stack[-1].type is not LEFT_BRACKET:
+            output_queue.append(operator_stack.pop())
 
-        if not self.__operator_stack:
+        if not operator_stack:
             raise ExpressionError('Unpaired bracket')
 
-        self.__operator_stack.pop()
+        operator_stack.pop()
 
-        if self.__operator_stack and \
-           self.__operator_stack[-1].type == TokenType.FUNCTION:
-            self.__output_queue.append(self.__operator_stack.pop())
+        if operator_stack and \
+           operator_stack[-1].type is FUNCTION:
+            output_queue.append(operator_stack.pop())
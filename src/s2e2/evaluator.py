@@ -1,7 +1,21 @@
-from .converter import Converter
+import collections
+import contextlib
+import itertools
+import threading
+
+from .backend import Backend
+from . import clock as clocks
+from .compiled_expression import CompiledExpression, OptimizationStatistics
+from .constant_folder import ConstantFolder
 from .error import ExpressionError
-from .token_type import TokenType
-from .tokenizer import Tokenizer
+from .instructions import PUSH, LOAD, CALL
+from .lazy_transformer import LazyTransformer
+from .lru_cache import LruCache
+from .node import Node
+from .parser import Parser
+from .registry import Registry
+from .subexpression_eliminator import SubexpressionEliminator
+from .token_type import ATOM, FUNCTION, OPERATOR, VARIABLE
 
 from .functions.function_add_days import FunctionAddDays
 from .functions.function_format_date import FunctionFormatDate
@@ -21,41 +35,101 @@ from .operators.operator_or import OperatorOr
 from .operators.operator_plus import OperatorPlus
 
 
+# Picklable configuration of an evaluator: its functions, operators and settings, see :meth:`Evaluator.get_spec`.
+EvaluatorSpec = collections.namedtuple('EvaluatorSpec', 'functions operators backend lazy cache_size cache_bytes clock',
+                                       defaults=(None,))
+
+
 class Evaluator:
     """
     Class evaluates string value of an expression.
 
-    :param __converter:
-        Converter of infix token sequence into postfix one.
+    :param __registry:
+        Current version of supported functions and operators as a :class:`~s2e2.registry.Registry`.
+        Every change publishes a new version, compilation uses the version it started with.
+
+    :param __registry_lock:
+        Lock of changes of the registry.
+
+    :param __mocked_components:
+        Converter, parser and tokenizer changed in place instead of building new ones, only for testing.
+
+    :param __backend:
+        Way to evaluate compiled expressions.
+
+    :param __lazy:
+        Flag of lazy evaluation mode.
 
-    :param __tokenizer:
-        Tokenizer of expression onto list of tokens.
+    :param __clock:
+        Clock read by function NOW(), None for current UTC datetime on every call.
 
-    :param __functions:
-        Set of all supported functions.
+    :param __cache_size:
+        Maximum number of cached compiled expressions.
 
-    :param __operators:
-        Set of all supported operators.
+    :param __cache_bytes:
+        Maximum total size of cached compiled expressions in bytes.
 
-    :param __stack:
-        Stack of intermediate values.
+    :param __cache:
+        Cache of compiled expressions by versions of the registry and their text.
+
+    :param __plan_store:
+        Persistent storage of postfix token sequences, optional.
+
+    :param __frozen_spec:
+        Configuration of a frozen evaluator, None if the evaluator can be changed.
     """
 
     # Null value in an input expression.
     NULL_VALUE = 'NULL'
 
     # Expected stack size after processing all tokens.
-    FINAL_STACK_SIZE = 1
+    FINAL_STACK_SIZE = CompiledExpression.FINAL_STACK_SIZE
+
+    # Default maximum number of cached compiled expressions.
+    DEFAULT_CACHE_SIZE = 1024
+
+    # Default maximum total size of cached compiled expressions in bytes.
+    DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+
+    # Default number of records evaluated at once by streaming methods.
+    DEFAULT_CHUNK_SIZE = 1024
+
+    # Value of an expression which passes a filter.
+    TRUE_VALUE = str(True)
 
-    def __init__(self):
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, cache_bytes=DEFAULT_CACHE_BYTES, backend=Backend.INTERPRETER,
+                 lazy=False, clock=None):
         """
-        Default constructor.
+        Constructor.
+
+        :param cache_size:
+            Maximum number of cached compiled expressions, 0 disables the cache.
+
+        :param cache_bytes:
+            Maximum total size of cached compiled expressions in bytes, 0 means no limit.
+
+        :param backend:
+            Way to evaluate compiled expressions as a :class:`~s2e2.Backend`.
+
+        :param lazy:
+            Flag of lazy evaluation mode. In this mode lazy functions and operators, like IF, && and ||,
+            evaluate only the arguments they need, e.g. only one branch of IF.
+
+        :param clock:
+            Clock read by function NOW() as a :class:`~s2e2.clock.Clock`, e.g. frozen per evaluation or per batch.
+            By default NOW() returns current UTC datetime on every call.
         """
-        self.__converter = Converter()
-        self.__tokenizer = Tokenizer()
-        self.__functions = {}
-        self.__operators = {}
-        self.__stack = []
+        self.__registry = Registry.build(0, {}, {})
+        self.__registry_lock = threading.Lock()
+        self.__mocked_components = None
+        self.__backend = backend
+        self.__lazy = lazy
+        self.__clock = clock
+        self.__cache_size = cache_size
+        self.__cache_bytes = cache_bytes
+        self.__cache = LruCache(cache_size, cache_bytes, lambda key, compiled: compiled.size)
+        self.__plan_store = None
+        self.__frozen_spec = None
 
     @classmethod
     def mocked(cls, converter, tokenizer):
@@ -70,11 +144,108 @@ class Evaluator:
             Substitution of a real tokenizer.
         """
         result = Evaluator()
-        result.__converter = converter
-        result.__tokenizer = tokenizer
+        result.__mocked_components = (converter, Parser(), tokenizer)
+        result.__registry = Registry(0, {}, {}, *result.__mocked_components)
+        return result
+
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Create Evaluator out of its configuration.
+
+        :param spec:
+            Configuration as a :class:`~s2e2.evaluator.EvaluatorSpec`.
+
+        :returns:
+            New evaluator with the same functions, operators and settings, but with an empty cache.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` if there is a collision between functions or operators names.
+        """
+        result = cls(spec.cache_size, spec.cache_bytes, spec.backend, spec.lazy, spec.clock)
+
+        result.__add(spec.functions, spec.operators)
         return result
 
 
+    def __reduce__(self):
+        """
+        Pickle Evaluator as its configuration, see :meth:`get_spec`. Frozen evaluator is unpickled frozen.
+        """
+        if self.__frozen_spec is not None:
+            return _from_frozen_spec, (self.__frozen_spec,)
+
+        return Evaluator.from_spec, (self.get_spec(),)
+
+
+    def __eq__(self, another):
+        """
+        Compare evaluator with another one. Frozen evaluators are equal if their configurations are equal,
+        an evaluator which can be changed is equal only to itself.
+
+        :param another:
+            Another evaluator.
+
+        :returns:
+            True if evaluators are equal, False otherwise.
+        """
+        if self is another:
+            return True
+
+        if not isinstance(another, Evaluator) or self.__frozen_spec is None or another.__frozen_spec is None:
+            return False
+
+        return self.__frozen_spec == another.__frozen_spec
+
+
+    def __hash__(self):
+        """
+        Get hash of the evaluator: hash of the configuration of a frozen evaluator, identity otherwise.
+
+        :returns:
+            Hash value.
+        """
+        if self.__frozen_spec is None:
+            return id(self)
+
+        return hash(self.__frozen_spec)
+
+
+    def freeze(self):
+        """
+        Get frozen copy of the evaluator. Functions and operators of the copy can not be added,
+        so its tokenizer tables, operators priorities and fingerprint are built once, the copy can be shared
+        by threads and its configuration can be used as a key. Cache and storage of parsed expressions
+        are not frozen. The copy shares functions and operators with the evaluator, but not its cache.
+
+        Freezing blocks only adding, replacing and removing functions and operators. Caches still change
+        after freezing: compiled expressions, patterns of REPLACE and FORMAT_DATE and values memoized by clocks,
+        so a process forked after warming up the evaluator shares with the parent only the pages
+        which these caches do not touch.
+
+        :returns:
+            Frozen :class:`~s2e2.Evaluator`, the evaluator itself if it is already frozen.
+        """
+        if self.__frozen_spec is not None:
+            return self
+
+        result = Evaluator.from_spec(self.get_spec())
+        result.__plan_store = self.__plan_store
+        result.__frozen_spec = result.get_spec()
+        return result
+
+
+    def is_frozen(self):
+        """
+        Check if the evaluator is frozen, see :meth:`freeze`.
+
+        :returns:
+            True if functions and operators of the evaluator can not be changed, False otherwise.
+        """
+        return self.__frozen_spec is not None
+
+
     def add_function(self, function):
         """
         Add function to set of supported functions.
@@ -83,16 +254,13 @@ class Evaluator:
             New supported function.
 
         :raises:
-            :class:`~TypeError` if function is empty.
+            :class:`~TypeError` if function is empty or the evaluator is frozen.
             :class:`~s2e2.ExpressionError` if function or operator with the same name is already added.
         """
         if not function:
             raise TypeError('Attempt to add empty function to Evaluator')
 
-        self.__check_uniqueness(function.name)
-
-        self.__functions[function.name] = function
-        self.__tokenizer.add_function(function.name)
+        self.__add((function,), ())
 
 
     def add_operator(self, operator):
@@ -103,17 +271,108 @@ class Evaluator:
             New supported operator.
 
         :raises:
-            :class:`~TypeError` if operator is empty.
+            :class:`~TypeError` if operator is empty or the evaluator is frozen.
             :class:`~s2e2.ExpressionError` if function or operator with the same name is already added.
         """
         if not operator:
             raise TypeError('Attempt to add empty operator to Evaluator')
 
-        self.__check_uniqueness(operator.name)
+        self.__add((), (operator,))
 
-        self.__operators[operator.name] = operator
-        self.__converter.add_operator(operator.name, operator.priority)
-        self.__tokenizer.add_operator(operator.name)
+
+    def replace_function(self, function):
+        """
+        Replace supported function with a new one of the same name. Evaluations already started
+        keep using the old function, expressions compiled after the replacement use the new one.
+
+        :param function:
+            New version of the function.
+
+        :raises:
+            :class:`~TypeError` if function is empty or the evaluator is frozen.
+            :class:`~s2e2.ExpressionError` if there is no function with the same name.
+        """
+        if not function:
+            raise TypeError('Attempt to replace function of Evaluator with empty one')
+
+        with self.__registry_lock:
+            self.__check_not_frozen('replace function of')
+            if function.name not in self.__registry.functions:
+                raise ExpressionError('Function {} is not added'.format(function.name))
+
+            functions = dict(self.__registry.functions)
+            functions[function.name] = function
+            self.__publish(functions, self.__registry.operators)
+
+
+    def replace_operator(self, operator):
+        """
+        Replace supported operator with a new one of the same name, its priority may differ.
+        Evaluations already started keep using the old operator, expressions compiled after the replacement
+        use the new one.
+
+        :param operator:
+            New version of the operator.
+
+        :raises:
+            :class:`~TypeError` if operator is empty or the evaluator is frozen.
+            :class:`~s2e2.ExpressionError` if there is no operator with the same name.
+        """
+        if not operator:
+            raise TypeError('Attempt to replace operator of Evaluator with empty one')
+
+        with self.__registry_lock:
+            self.__check_not_frozen('replace operator of')
+            if operator.name not in self.__registry.operators:
+                raise ExpressionError('Operator {} is not added'.format(operator.name))
+
+            operators = dict(self.__registry.operators)
+            operators[operator.name] = operator
+            self.__publish(self.__registry.functions, operators)
+
+
+    def remove_function(self, name):
+        """
+        Remove function from set of supported functions. Evaluations already started
+        can still call it, expressions compiled after the removal can not.
+
+        :param name:
+            Name of the function.
+
+        :raises:
+            :class:`~TypeError` if the evaluator is frozen.
+            :class:`~s2e2.ExpressionError` if there is no function with the name.
+        """
+        with self.__registry_lock:
+            self.__check_not_frozen('remove function from')
+            if name not in self.__registry.functions:
+                raise ExpressionError('Function {} is not added'.format(name))
+
+            functions = dict(self.__registry.functions)
+            del functions[name]
+            self.__publish(functions, self.__registry.operators)
+
+
+    def remove_operator(self, name):
+        """
+        Remove operator from set of supported operators. Evaluations already started
+        can still call it, expressions compiled after the removal can not.
+
+        :param name:
+            Name of the operator.
+
+        :raises:
+            :class:`~TypeError` if the evaluator is frozen.
+            :class:`~s2e2.ExpressionError` if there is no operator with the name.
+        """
+        with self.__registry_lock:
+            self.__check_not_frozen('remove operator from')
+            if name not in self.__registry.operators:
+                raise ExpressionError('Operator {} is not added'.format(name))
+
+            operators = dict(self.__registry.operators)
+            del operators[name]
+            self.__publish(self.__registry.functions, operators)
 
 
     def add_standard_functions(self):
@@ -123,11 +382,11 @@ class Evaluator:
         :raises:
             :class:`~s2e2.ExpressionError` if there is a collision between functions names.
         """
-        self.add_function(FunctionAddDays())
-        self.add_function(FunctionFormatDate())
-        self.add_function(FunctionIf())
-        self.add_function(FunctionNow())
-        self.add_function(FunctionReplace())
+        self.__add((FunctionAddDays(),
+                    FunctionFormatDate(),
+                    FunctionIf(),
+                    FunctionNow(),
+                    FunctionReplace()), ())
 
 
     def add_standard_operators(self):
@@ -137,16 +396,16 @@ class Evaluator:
         :raises:
             :class:`~s2e2.ExpressionError` if there is a collision between operators names.
         """
-        self.add_operator(OperatorAnd())
-        self.add_operator(OperatorEqual())
-        self.add_operator(OperatorGreaterOrEqual())
-        self.add_operator(OperatorGreater())
-        self.add_operator(OperatorLessOrEqual())
-        self.add_operator(OperatorLess())
-        self.add_operator(OperatorNotEqual())
-        self.add_operator(OperatorNot())
-        self.add_operator(OperatorOr())
-        self.add_operator(OperatorPlus())
+        self.__add((), (OperatorAnd(),
+                        OperatorEqual(),
+                        OperatorGreaterOrEqual(),
+                        OperatorGreater(),
+                        OperatorLessOrEqual(),
+                        OperatorLess(),
+                        OperatorNotEqual(),
+                        OperatorNot(),
+                        OperatorOr(),
+                        OperatorPlus()))
 
 
     def get_functions(self):
@@ -156,7 +415,7 @@ class Evaluator:
         :returns:
             Tuple of functions.
         """
-        return tuple(self.__functions.values())
+        return tuple(self.__registry.functions.values())
 
 
     def get_operators(self):
@@ -166,44 +425,476 @@ class Evaluator:
         :returns:
             Tuple of operators.
         """
-        return tuple(self.__operators.values())
+        return tuple(self.__registry.operators.values())
+
+
+    def get_registry_version(self):
+        """
+        Get version of sets of supported functions and operators, it grows with every change of them.
+
+        :returns:
+            Version as an integer.
+        """
+        return self.__registry.version
+
+
+    def get_spec(self):
+        """
+        Get configuration of the evaluator, which can be pickled to create the same evaluator
+        in another process, see :meth:`from_spec`. All functions and operators must be picklable.
+        Neither cached compiled expressions nor storage of parsed expressions are included.
+
+        :returns:
+            Configuration as a :class:`~s2e2.evaluator.EvaluatorSpec`.
+        """
+        if self.__frozen_spec is not None:
+            return self.__frozen_spec
+
+        return EvaluatorSpec(self.get_functions(),
+                             self.get_operators(),
+                             self.__backend,
+                             self.__lazy,
+                             self.__cache_size,
+                             self.__cache_bytes,
+                             self.__clock)
+
+
+    def set_plan_store(self, plan_store):
+        """
+        Set persistent storage of parsed expressions. Expressions found in the storage are not parsed.
+        Newly parsed expressions are put into the storage, it's up to the caller to save it.
+
+        :param plan_store:
+            Storage as a :class:`~s2e2.PlanStore` or None to stop using a storage.
+        """
+        self.__plan_store = plan_store
+        self.__cache.clear()
+
+
+    def get_cache_statistics(self):
+        """
+        Get statistics of the cache of compiled expressions.
+
+        :returns:
+            Statistics as a :class:`~s2e2.lru_cache.CacheStatistics`.
+        """
+        return self.__cache.get_statistics()
+
+
+    def compile(self, expression):
+        """
+        Compile the expression, so it can be evaluated many times without parsing.
+        Compiled expressions are cached, so compiling the same expression again is cheap.
+
+        :param expression:
+            Input expression.
+
+        :returns:
+            Compiled expression as a :class:`~s2e2.CompiledExpression`.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        if not expression:
+            raise TypeError('Attempt to compile empty expression with Evaluator')
+
+        # compiled expressions of older versions are not looked up any more and get evicted eventually
+        registry = self.__registry
+        key = (registry.version, expression)
 
+        compiled = self.__cache.get(key)
+        if compiled is None:
+            compiled = self.__compile(expression, registry)
+            self.__cache.put(key, compiled)
 
-    def evaluate(self, expression):
+        return compiled
+
+
+    def batch(self):
+        """
+        Start a batch of evaluations. If the clock of the evaluator is read once per batch,
+        function NOW() returns the same value in all evaluations of the batch in the current thread or task.
+        Batch methods, like :meth:`evaluate_many`, start a batch themselves.
+
+        :returns:
+            Context manager of the batch.
+        """
+        if self.__clock is None or not self.__clock.per_batch:
+            return contextlib.nullcontext()
+
+        return clocks.scope(self.__clock)
+
+
+    def parse(self, expression):
+        """
+        Parse the expression into an abstract syntax tree. The tree is not used for evaluation,
+        its postfix view is the same sequence of tokens the expression is compiled from,
+        except for stacked prefix operators, see :meth:`~s2e2.Node.postfix`.
+
+        :param expression:
+            Input expression.
+
+        :returns:
+            Root :class:`~s2e2.Node` of the tree.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        if not expression:
+            raise TypeError('Attempt to parse empty expression with Evaluator')
+
+        registry = self.__registry
+        infix_expression = registry.tokenizer.tokenize(expression)
+
+        # the same syntax sugar as for compilation: expression of only atoms is a string literal
+        if all(token.type is ATOM for token in infix_expression):
+            return Node(ATOM, expression, (), (0, len(expression)))
+
+        return registry.parser.parse(infix_expression)
+
+
+    def evaluate(self, expression, bindings=None):
         """
         Evaluate the expression.
 
         :param expression:
             Input expression.
 
+        :param bindings:
+            Mapping of values of the expression's variables by their names.
+            Values are used as is, they are never parsed.
+
         :returns:
             Value of expression as a string or empty value if the result is NULL.
 
         :raises:
             :class:`~TypeError` if expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression or an undefined variable.
+        """
+        if not expression:
+            raise TypeError('Attempt to evaluate empty expression with Evaluator')
+
+        return self.compile(expression).evaluate(bindings)
+
+
+    async def evaluate_async(self, expression, bindings=None):
+        """
+        Evaluate the expression awaiting its asynchronous functions and operators,
+        see :meth:`~s2e2.CompiledExpression.evaluate_async`.
+
+        :param expression:
+            Input expression.
+
+        :param bindings:
+            Mapping of values of the expression's variables by their names.
+            Values are used as is, they are never parsed.
+
+        :returns:
+            Value of expression as a string or empty value if the result is NULL.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression or an undefined variable.
+        """
+        if not expression:
+            raise TypeError('Attempt to evaluate empty expression with Evaluator')
+
+        return await self.compile(expression).evaluate_async(bindings)
+
+
+    def evaluate_many(self, expressions, bindings=None):
+        """
+        Evaluate all the expressions as a batch, see :meth:`batch`. Every distinct expression is compiled once,
+        and if it is pure within the batch, also evaluated once.
+
+        :param expressions:
+            Iterable of input expressions.
+
+        :param bindings:
+            Mapping of values of the expressions' variables by their names, the same for all expressions.
+
+        :returns:
+            List of values of the expressions in the same order.
+
+        :raises:
+            :class:`~TypeError` if some expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression or an undefined variable.
+        """
+        compiled_expressions = {}
+        values = {}
+        results = []
+
+        with self.batch():
+            for expression in expressions:
+                if expression in values:
+                    results.append(values[expression])
+                    continue
+
+                compiled = compiled_expressions.get(expression)
+                if compiled is None:
+                    if not expression:
+                        raise TypeError('Attempt to evaluate empty expression with Evaluator')
+
+                    compiled = self.compile(expression)
+                    compiled_expressions[expression] = compiled
+
+                value = compiled.evaluate(bindings)
+                if compiled.is_pure_in_batch:
+                    values[expression] = value
+                results.append(value)
+
+        return results
+
+
+    def stream_map(self, expression, records, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Evaluate the expression for every record of the stream. The expression is compiled once,
+        records are read and evaluated by chunks, so only one chunk is kept in memory. Every chunk is a batch.
+
+        :param expression:
+            Input expression.
+
+        :param records:
+            Iterable of mappings of values of the expression's variables by their names.
+
+        :param chunk_size:
+            Number of records evaluated at once.
+
+        :returns:
+            Generator of values of the expression for the records in the same order.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~ValueError` if chunk size is not positive.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression,
+            or during iteration if some variable is not defined by a record.
+        """
+        compiled = self.__compile_stream(expression, chunk_size)
+        return (value for _, values in self.__evaluate_chunks(compiled, records, chunk_size) for value in values)
+
+
+    def stream_filter(self, expression, records, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Select records of the stream for which the expression is true. The expression is compiled once,
+        records are read and evaluated by chunks, so only one chunk is kept in memory. Every chunk is a batch.
+
+        :param expression:
+            Input expression.
+
+        :param records:
+            Iterable of mappings of values of the expression's variables by their names.
+
+        :param chunk_size:
+            Number of records evaluated at once.
+
+        :returns:
+            Generator of the selected records in the same order.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~ValueError` if chunk size is not positive.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression,
+            or during iteration if some variable is not defined by a record.
+        """
+        compiled = self.__compile_stream(expression, chunk_size)
+        return (record for chunk, values in self.__evaluate_chunks(compiled, records, chunk_size)
+                for record, value in zip(chunk, values) if value == Evaluator.TRUE_VALUE)
+
+
+    def __compile_stream(self, expression, chunk_size):
+        """
+        Compile the expression for a streaming method.
+
+        :param expression:
+            Input expression.
+
+        :param chunk_size:
+            Number of records evaluated at once.
+
+        :returns:
+            Compiled expression as a :class:`~s2e2.CompiledExpression`.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~ValueError` if chunk size is not positive.
             :class:`~s2e2.ExpressionError` in case of an invalid expression.
         """
         if not expression:
             raise TypeError('Attempt to evaluate empty expression with Evaluator')
 
-        infix_expression = self.__tokenizer.tokenize(expression)
+        if chunk_size < 1:
+            raise ValueError('Chunk size must be positive')
+
+        return self.compile(expression)
+
+
+    def __evaluate_chunks(self, compiled, records, chunk_size):
+        """
+        Evaluate the compiled expression for the records chunk by chunk, every chunk is a batch.
+        Within a chunk an expression pure within a batch is evaluated once for the same values of its variables.
+
+        :param compiled:
+            Compiled expression.
+
+        :param records:
+            Iterable of mappings of values of variables by their names.
+
+        :param chunk_size:
+            Number of records evaluated at once.
+
+        :returns:
+            Generator of pairs (list of records, list of values of the expression).
+
+        :raises:
+            :class:`~s2e2.ExpressionError` if some variable is not defined by a record.
+        """
+        records = iter(records)
+        variables = sorted(compiled.variables)
+
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                return
+
+            with self.batch():
+                results = Evaluator.__evaluate_chunk(compiled, chunk, variables)
+
+            yield chunk, results
+
+
+    @staticmethod
+    def __evaluate_chunk(compiled, chunk, variables):
+        """
+        Evaluate the compiled expression for the records of a chunk.
+
+        :param compiled:
+            Compiled expression.
+
+        :param chunk:
+            List of mappings of values of variables by their names.
+
+        :param variables:
+            Sorted names of variables of the expression.
+
+        :returns:
+            List of values of the expression.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` if some variable is not defined by a record.
+        """
+        if not compiled.is_pure_in_batch:
+            return [compiled.evaluate(record) for record in chunk]
+
+        values = {}
+        results = []
+
+        for record in chunk:
+            try:
+                # values of different types may be equal, e.g. 1, 1.0 and True
+                key = tuple((type(record[name]), record[name]) for name in variables)
+                hash(key)
+            except (KeyError, TypeError):
+                # undefined variable or unhashable value
+                results.append(compiled.evaluate(record))
+                continue
+
+            if key not in values:
+                values[key] = compiled.evaluate(record)
+            results.append(values[key])
+
+        return results
 
-        # a bit of syntax sugar: if expression contains only atoms
-        # consider it as just a string literal
-        if all(token.type == TokenType.ATOM for token in infix_expression):
-            return expression
 
-        postfix_expression = self.__converter.convert(infix_expression)
+    def __check_not_frozen(self, action):
+        """
+        Check the evaluator is not frozen before changing its functions or operators.
+
+        :param action:
+            Description of the change for the error message.
 
-        return self.__evaluate_expression(postfix_expression)
+        :raises:
+            :class:`~TypeError` if the evaluator is frozen.
+        """
+        if self.__frozen_spec is not None:
+            raise TypeError('Attempt to {} frozen Evaluator'.format(action))
 
 
-    def __check_uniqueness(self, entity_name):
+    def __publish(self, functions, operators):
+        """
+        Publish the next version of the registry. Must be called under the registry lock.
+
+        :param functions:
+            Mapping of all supported functions by their names.
+
+        :param operators:
+            Mapping of all supported operators by their names.
+        """
+        registry = self.__registry
+
+        if self.__mocked_components is None:
+            self.__registry = Registry.build(registry.version + 1, functions, operators)
+            return
+
+        converter, parser, tokenizer = self.__mocked_components
+
+        for name in functions.keys() - registry.functions.keys():
+            tokenizer.add_function(name)
+
+        for name in operators.keys() - registry.operators.keys():
+            operator = operators[name]
+            converter.add_operator(name, operator.priority)
+            parser.add_operator(name, operator.priority, operator.number_of_arguments)
+            tokenizer.add_operator(name)
+
+        self.__registry = Registry(registry.version + 1, functions, operators, converter, parser, tokenizer)
+
+
+    def __add(self, new_functions, new_operators):
+        """
+        Add functions and operators, all of them are published in one new version of the registry.
+
+        :param new_functions:
+            Sequence of new supported functions.
+
+        :param new_operators:
+            Sequence of new supported operators.
+
+        :raises:
+            :class:`~TypeError` if the evaluator is frozen or some name is empty.
+            :class:`~s2e2.ExpressionError` if function or operator with the same name is already added.
+        """
+        with self.__registry_lock:
+            self.__check_not_frozen('add operator to' if new_operators else 'add function to')
+
+            functions = dict(self.__registry.functions)
+            operators = dict(self.__registry.operators)
+
+            for function in new_functions:
+                Evaluator.__check_uniqueness(function.name, functions, operators)
+                functions[function.name] = function
+
+            for operator in new_operators:
+                Evaluator.__check_uniqueness(operator.name, functions, operators)
+                operators[operator.name] = operator
+
+            self.__publish(functions, operators)
+
+
+    @staticmethod
+    def __check_uniqueness(entity_name, functions, operators):
         """
         Check is function's or operator's name is unique.
 
-        :param operator:
-            New supported operator.
+        :param entity_name:
+            Name of new function or operator.
+
+        :param functions:
+            Mapping of supported functions by their names.
+
+        :param operators:
+            Mapping of supported operators by their names.
 
         :raises:
             :class:`~TypeError` if name is empty.
@@ -212,103 +903,185 @@ class Evaluator:
         if not entity_name:
             raise TypeError('Attempt to add function or operator without a name to Evaluator')
 
-        if entity_name in self.__functions:
+        if entity_name in functions:
             raise ExpressionError('Function {} is alredy added'.format(entity_name))
 
-        if entity_name in self.__operators:
+        if entity_name in operators:
             raise ExpressionError('Operator {} is alredy added'.format(entity_name))
 
 
-    def __evaluate_expression(self, postfix_expression):
+    def __compile(self, expression, registry):
+        """
+        Compile the expression bypassing the cache.
+
+        :param expression:
+            Input expression.
+
+        :param registry:
+            Version of supported functions and operators.
+
+        :returns:
+            Compiled expression as a :class:`~s2e2.CompiledExpression`.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        if self.__plan_store is not None:
+            found, postfix_expression = self.__plan_store.get(registry.fingerprint, expression)
+            if not found:
+                postfix_expression = Evaluator.__convert(expression, registry)
+                self.__plan_store.put(registry.fingerprint, expression, postfix_expression)
+        else:
+            postfix_expression = Evaluator.__convert(expression, registry)
+
+        if postfix_expression is None:
+            return CompiledExpression(expression, [(PUSH, expression)], self.__backend)
+
+        program, folded_nodes = ConstantFolder.fold(Evaluator.__build_program(postfix_expression, registry))
+        program, merged_subtrees = SubexpressionEliminator.eliminate(program)
+        if self.__lazy:
+            program = LazyTransformer.transform(program)
+        statistics = OptimizationStatistics(folded_nodes, merged_subtrees)
+
+        return CompiledExpression(expression, program, self.__backend, statistics, self.__clock)
+
+
+    @staticmethod
+    def __convert(expression, registry):
         """
-        Get value of the postfix sequence of tokens.
+        Convert the expression into postfix sequence of tokens.
+
+        :param expression:
+            Input expression.
+
+        :param registry:
+            Version of supported functions and operators.
+
+        :returns:
+            Postfix sequence of tokens or None if the expression is a string literal.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        infix_expression = registry.tokenizer.tokenize(expression)
+
+        # a bit of syntax sugar: if expression contains only atoms
+        # consider it as just a string literal
+        if all(token.type is ATOM for token in infix_expression):
+            return None
+
+        return registry.converter.convert(infix_expression)
+
+
+    @staticmethod
+    def __build_program(postfix_expression, registry):
+        """
+        Build program of a compiled expression out of the postfix sequence of tokens.
 
         :param postfix_expression:
             Sequence of tokens.
 
+        :param registry:
+            Version of supported functions and operators.
+
         :returns:
-            String value or empty value.
+            List of instructions.
 
         :raises:
             :class:`~s2e2.ExpressionError` in case of an invalid expression.
         """
-        self.__stack = []
+        program = []
 
         for token in postfix_expression:
-            if token.type == TokenType.ATOM:
-                self.__process_atom(token)
+            if token.type is ATOM:
+                program.append(Evaluator.__process_atom(token))
+
+            elif token.type is VARIABLE:
+                program.append((LOAD, token.value))
 
-            elif token.type == TokenType.OPERATOR:
-                self.__process_operator(token)
+            elif token.type is OPERATOR:
+                program.append(Evaluator.__process_operator(token, registry))
 
-            elif token.type == TokenType.FUNCTION:
-                self.__process_function(token)
+            elif token.type is FUNCTION:
+                program.append(Evaluator.__process_function(token, registry))
 
             else:
                 raise ExpressionError('Unexpected token type {}'.format(token.type))
 
-        result = self.__get_result_value_from_stack()
-        self.__stack = []
-        return result
+        return program
 
 
-    def __process_atom(self, token):
+    @staticmethod
+    def __process_atom(token):
         """
         Process ATOM token.
 
         :param token:
             ATOM token.
+
+        :returns:
+            PUSH instruction.
         """
         value = None if token.value == Evaluator.NULL_VALUE else token.value
-        self.__stack.append(value)
+        return (PUSH, value)
 
 
-    def __process_operator(self, token):
+    @staticmethod
+    def __process_operator(token, registry):
         """
         Process OPERATOR token.
 
         :param token:
             OPERATOR token.
 
+        :param registry:
+            Version of supported functions and operators.
+
+        :returns:
+            CALL instruction.
+
         :raises:
             :class:`~s2e2.ExpressionError` in case of unsupported operator.
         """
-        operator = self.__operators.get(token.value)
+        operator = registry.operators.get(token.value)
         if not operator:
             raise ExpressionError('Unsupported operator {}'.format(token.value))
 
-        operator.invoke(self.__stack)
+        return (CALL, operator)
 
 
-    def __process_function(self, token):
+    @staticmethod
+    def __process_function(token, registry):
         """
         Process FUNCTION token.
 
         :param token:
             FUNCTION token.
 
+        :param registry:
+            Version of supported functions and operators.
+
+        :returns:
+            CALL instruction.
+
         :raises:
             :class:`~s2e2.ExpressionError` in case of unsupported function.
         """
-        function = self.__functions.get(token.value)
+        function = registry.functions.get(token.value)
         if not function:
             raise ExpressionError('Unsupported function {}'.format(token.value))
 
-        function.invoke(self.__stack)
+        return (CALL, function)
 
 
-    def __get_result_value_from_stack(self):
-        """
-        Get result value from the stack of intermediate values.
-
-        :returns:
-            String value or empty value.
+def _from_frozen_spec(spec):
+    """
+    Create frozen Evaluator out of its configuration, used to unpickle frozen evaluators.
 
-        :raises:
-            :class:`~s2e2.ExpressionError` in case of an invalid expression.
-        """
-        if len(self.__stack) != Evaluator.FINAL_STACK_SIZE:
-            raise ExpressionError('Invalid expression')
+    :param spec:
+        Configuration as a :class:`~s2e2.evaluator.EvaluatorSpec`.
 
-        result = self.__stack.pop()
-        return str(result) if result else None
+    :returns:
+        New frozen evaluator.
+    """
+    return Evaluator.from_spec(spec).freeze()
@@ -1,5 +1,7 @@
 import datetime
 
+from ..error import ExpressionError
+from ..vectorized_engine import VectorizedEngine
 from .function import Function
 
 
@@ -9,22 +11,45 @@ class FunctionAddDays(Function):
     Adds days number of days to datetime.
     """
 
+    pure = True
+
     def __init__(self):
         super().__init__('ADD_DAYS', 2)
 
 
-    def _check_arguments(self):
-        if not isinstance(self._arguments[0], datetime.datetime):
+    def _check_arguments(self, arguments):
+        if not isinstance(arguments[0], datetime.datetime):
             return False
 
         try:
-            int(self._arguments[1])
+            int(arguments[1])
         except (TypeError, ValueError):
             return False
 
         return True
 
 
-    def _result(self):
-        days = int(self._arguments[1])
-        return self._arguments[0] + datetime.timedelta(days=days)
+    def _result(self, arguments):
+        days = int(arguments[1])
+        return arguments[0] + datetime.timedelta(days=days)
+
+
+    def _vectorized_result(self, columns):
+        import numpy
+
+        dates = numpy.asarray(columns[0])
+        if dates.dtype.kind == 'O' and all(isinstance(value, datetime.datetime) for value in dates.flat):
+            dates = dates.astype('datetime64[us]')
+
+        if dates.dtype.kind != 'M' or numpy.any(numpy.isnat(dates)):
+            raise ExpressionError('Invalid arguments for function {}'.format(self.name))
+
+        days = numpy.asarray(columns[1])
+        try:
+            if days.dtype.kind not in 'biu':
+                days = numpy.asarray(numpy.frompyfunc(int, 1, 1)(VectorizedEngine.to_objects(days)))
+            days = days.astype(numpy.int64)
+        except (TypeError, ValueError):
+            raise ExpressionError('Invalid arguments for function {}'.format(self.name))
+
+        return dates + days.astype('timedelta64[D]')
@@ -1,22 +1,246 @@
 import datetime
+import operator
 
+from ..lru_cache import LruCache
 from .function import Function
 
 
+class DateFormatter:
+    """
+    Format of datetimes parsed once. Formats of only numeric directives are built out of datetime fields
+    without strftime, the most common ISO-8601 formats are built by datetime methods.
+    Results are the same as of strftime, any other format is formatted by strftime.
+
+    :param format:
+        Format string of strftime.
+
+    :param __iso:
+        Function building the format out of a naive datetime, None if the format is not an ISO-8601 one.
+
+    :param __template:
+        Printf-style template of the format, None if the format has unsupported directives.
+
+    :param __fields:
+        Function getting tuple of datetime fields used by the template.
+
+    :param __has_year:
+        Flag of a format with a year, strftime does not pad years before 1000.
+    """
+
+    # Directives built without strftime: pairs (name of datetime field, printf-style format) by directive symbols.
+    DIRECTIVES = {
+        'Y': ('year', '%04d'),
+        'm': ('month', '%02d'),
+        'd': ('day', '%02d'),
+        'H': ('hour', '%02d'),
+        'M': ('minute', '%02d'),
+        'S': ('second', '%02d'),
+        'f': ('microsecond', '%06d'),
+    }
+
+    # Functions building ISO-8601 formats out of naive datetimes by the formats.
+    ISO_FORMATS = {
+        '%Y-%m-%d': lambda value: value.date().isoformat(),
+        '%Y-%m-%dT%H:%M:%S': lambda value: value.isoformat('T', 'seconds'),
+        '%Y-%m-%d %H:%M:%S': lambda value: value.isoformat(' ', 'seconds'),
+        '%Y-%m-%dT%H:%M:%S.%f': lambda value: value.isoformat('T', 'microseconds'),
+        '%Y-%m-%d %H:%M:%S.%f': lambda value: value.isoformat(' ', 'microseconds'),
+    }
+
+    # Years formatted by strftime with four digits.
+    MIN_PADDED_YEAR = 1000
+
+    def __init__(self, format):
+        """
+        Constructor.
+
+        :param format:
+            Format string of strftime.
+        """
+        self.format = format
+        self.__iso = DateFormatter.ISO_FORMATS.get(format)
+        self.__template = None
+        self.__fields = None
+        self.__has_year = '%Y' in format
+
+        parsed = DateFormatter.__parse(format)
+        if parsed is not None:
+            self.__template, fields = parsed
+            self.__fields = operator.attrgetter(*fields) if fields else (lambda value: ())
+
+
+    def __call__(self, value):
+        """
+        Format the datetime.
+
+        :param value:
+            Datetime.
+
+        :returns:
+            Formatted string, the same as value.strftime(format).
+        """
+        if self.__has_year and value.year < DateFormatter.MIN_PADDED_YEAR:
+            return value.strftime(self.format)
+
+        if self.__iso is not None and value.tzinfo is None:
+            return self.__iso(value)
+
+        if self.__template is not None:
+            return self.__template % self.__fields(value)
+
+        return value.strftime(self.format)
+
+
+    @staticmethod
+    def __parse(format):
+        """
+        Parse format into a printf-style template.
+
+        :param format:
+            Format string of strftime.
+
+        :returns:
+            Pair (template, list of names of datetime fields), None if the format has unsupported directives.
+        """
+        # strftime of some platforms stops at null symbol
+        if '\0' in format:
+            return None
+
+        template = []
+        fields = []
+        position = 0
+
+        while True:
+            start = format.find('%', position)
+            if start == -1:
+                template.append(format[position:].replace('%', '%%'))
+                return ''.join(template), fields
+
+            template.append(format[position:start])
+            directive = format[start + 1 : start + 2]
+
+            if directive == '%':
+                template.append('%%')
+            elif directive in DateFormatter.DIRECTIVES:
+                field, field_format = DateFormatter.DIRECTIVES[directive]
+                template.append(field_format)
+                fields.append(field)
+            else:
+                return None
+
+            position = start + 2
+
+
 class FunctionFormatDate(Function):
     """
     Function FORMAT_DATE(<datetime>, <format>)
     Converts datetime to string according to the format.
+
+    Constant format is parsed once during compilation of an expression.
+    Other formats are parsed on the first use and kept in a cache of limited size.
+
+    :param __cache_size:
+        Maximum number of cached parsed formats.
+
+    :param __formats:
+        Cache of specialized versions of the function by their formats.
     """
 
-    def __init__(self):
+    pure = True
+
+    # Default maximum number of cached parsed formats.
+    DEFAULT_CACHE_SIZE = 256
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Constructor.
+
+        :param cache_size:
+            Maximum number of cached parsed formats, 0 disables the cache.
+        """
+        super().__init__('FORMAT_DATE', 2)
+        self.__cache_size = cache_size
+        self.__formats = LruCache(cache_size)
+
+
+    def __reduce__(self):
+        """
+        Pickle the function without its cache.
+        """
+        return FunctionFormatDate, (self.__cache_size,)
+
+
+    def specialize(self, constants):
+        """
+        Get version of the function with parsed format for a constant format.
+
+        :param constants:
+            Mapping of values of constant arguments by their positions.
+
+        :returns:
+            Specialized function or None if format is not constant.
+        """
+        format = constants.get(1)
+        if not isinstance(format, str):
+            return None
+
+        return self.__get_specialized(format)
+
+
+    def _check_arguments(self, arguments):
+        return isinstance(arguments[0], datetime.datetime) and \
+               isinstance(arguments[1], str)
+
+
+    def _result(self, arguments):
+        return self.__get_specialized(arguments[1]).formatter(arguments[0])
+
+
+    def __get_specialized(self, format):
+        """
+        Get version of the function specialized for the format, parse the format if it is not cached.
+        The same cached version is returned for the same format, so equal calls stay equal.
+
+        :param format:
+            Format string of strftime.
+
+        :returns:
+            Specialized function as a :class:`~s2e2.functions.function_format_date.FunctionFormatDateCompiled`.
+        """
+        specialized = self.__formats.get(format)
+        if specialized is None:
+            specialized = FunctionFormatDateCompiled(DateFormatter(format))
+            self.__formats.put(format, specialized)
+
+        return specialized
+
+
+class FunctionFormatDateCompiled(Function):
+    """
+    Function FORMAT_DATE(<datetime>, <format>) specialized for a constant format.
+    The format argument is ignored, the formatter parsed out of it is used instead.
+
+    :param formatter:
+        Parsed format as a :class:`~s2e2.functions.function_format_date.DateFormatter`.
+    """
+
+    pure = True
+
+    def __init__(self, formatter):
+        """
+        Constructor.
+
+        :param formatter:
+            Parsed format.
+        """
         super().__init__('FORMAT_DATE', 2)
+        self.formatter = formatter
 
 
-    def _check_arguments(self):
-        return isinstance(self._arguments[0], datetime.datetime) and \
-               isinstance(self._arguments[1], str)
+    def _check_arguments(self, arguments):
+        return isinstance(arguments[0], datetime.datetime) and \
+               isinstance(arguments[1], str)
 
 
-    def _result(self):
-        return self._arguments[0].strftime(self._arguments[1])
+    def _result(self, arguments):
+        return self.formatter(arguments[0])
@@ -1,3 +1,5 @@
+from ..error import ExpressionError
+from ..vectorized_engine import VectorizedEngine
 from .function import Function
 
 
@@ -7,13 +9,35 @@ class FunctionIf(Function):
     Returns value1 if boolean condition is true, and value2 otherwise.
     """
 
+    pure = True
+
+    lazy = True
+
     def __init__(self):
         super().__init__('IF', 3)
 
 
-    def _check_arguments(self):
-        return isinstance(self._arguments[0], bool)
+    def _check_arguments(self, arguments):
+        return isinstance(arguments[0], bool)
+
+
+    def _result(self, arguments):
+        return arguments[1] if arguments[0] else arguments[2]
+
+
+    def _lazy_result(self, thunks):
+        condition = thunks[0]()
+        if not isinstance(condition, bool):
+            raise ExpressionError('Invalid arguments for function {}'.format(self.name))
+
+        return thunks[1]() if condition else thunks[2]()
+
+
+    def _vectorized_result(self, columns):
+        import numpy
 
+        condition = VectorizedEngine.to_booleans(columns[0])
+        if condition is None:
+            raise ExpressionError('Invalid arguments for function {}'.format(self.name))
 
-    def _result(self):
-        return self._arguments[1] if self._arguments[0] else self._arguments[2]
+        return numpy.where(condition, *VectorizedEngine.unify(columns[1], columns[2]))
@@ -1,21 +1,25 @@
-import datetime
-
+from .. import clock
 from .function import Function
 
 
 class FunctionNow(Function):
     """
     Function NOW()
-    Returns current UTC datetime.
+    Returns current UTC datetime according to the clock of the evaluator, see :class:`~s2e2.clock.Clock`.
     """
 
+    # every call returns new value, unless the clock is frozen
+    pure = False
+
+    reads_clock = True
+
     def __init__(self):
         super().__init__('NOW', 0)
 
 
-    def _check_arguments(self):
+    def _check_arguments(self, arguments):
         return True
 
 
-    def _result(self):
-        return datetime.datetime.utcnow()
+    def _result(self, arguments):
+        return clock.now()
@@ -1,30 +1,223 @@
+import collections
 import re
+import threading
+import time
 
+from ..lru_cache import LruCache
 from .function import Function
 
 
+# Symbols with special meaning in regexes, a regex without them matches itself literally.
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+# Symbol of escapes and backreferences in replacements.
+REPLACEMENT_ESCAPE = '\\'
+
+# Statistics of compiled patterns of REPLACE, compile time is in seconds.
+PatternStatistics = collections.namedtuple('PatternStatistics', 'hits misses hit_rate entries compile_time')
+
+
+def check_arguments(arguments):
+    """
+    Check arguments of REPLACE: source is a string or NULL, regex is a non-empty string, replacement is a string.
+
+    :param arguments:
+        List of arguments.
+
+    :returns:
+        True if arguments are valid, False otherwise.
+    """
+    return (not arguments[0] or isinstance(arguments[0], str)) and \
+           (isinstance(arguments[1], str) and arguments[1]) and \
+           isinstance(arguments[2], str)
+
+
 class FunctionReplace(Function):
     """
     Function REPLACE(<source>, <regex>, <replacement>)
     Returns copy of source with all matches of regex replaced by replacement.
+
+    Constant regex is compiled once during compilation of an expression.
+    Other regexes are compiled on the first use and kept in a cache of limited size.
+    Regexes without metacharacters are replaced as plain strings if replacement has no escapes.
+
+    :param __cache_size:
+        Maximum number of cached compiled patterns.
+
+    :param __patterns:
+        Cache of specialized versions of the function by their regexes.
+
+    :param __compile_time:
+        Total time of compilation of patterns in seconds.
+
+    :param __lock:
+        Lock of the compile time.
     """
 
-    def __init__(self):
+    pure = True
+
+    # Default maximum number of cached compiled patterns.
+    DEFAULT_CACHE_SIZE = 512
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Constructor.
+
+        :param cache_size:
+            Maximum number of cached compiled patterns, 0 disables the cache.
+        """
         super().__init__('REPLACE', 3)
+        self.__cache_size = cache_size
+        self.__patterns = LruCache(cache_size)
+        self.__compile_time = 0.0
+        self.__lock = threading.Lock()
+
+
+    def __reduce__(self):
+        """
+        Pickle the function without its cache.
+        """
+        return FunctionReplace, (self.__cache_size,)
+
+
+    def specialize(self, constants):
+        """
+        Get version of the function with compiled pattern for a constant regex.
+
+        :param constants:
+            Mapping of values of constant arguments by their positions.
+
+        :returns:
+            Specialized function or None if regex is not constant or invalid.
+        """
+        regex = constants.get(1)
+        if not regex or not isinstance(regex, str):
+            return None
+
+        try:
+            return self.__get_specialized(regex)
+        except re.error:
+            return None
+
+
+    def get_pattern_statistics(self):
+        """
+        Get statistics of compiled patterns.
+
+        :returns:
+            Statistics as a :class:`~s2e2.functions.function_replace.PatternStatistics`.
+        """
+        statistics = self.__patterns.get_statistics()
+        lookups = statistics.hits + statistics.misses
+
+        with self.__lock:
+            compile_time = self.__compile_time
+
+        return PatternStatistics(statistics.hits,
+                                 statistics.misses,
+                                 statistics.hits / lookups if lookups else 0.0,
+                                 statistics.entries,
+                                 compile_time)
 
 
-    def _check_arguments(self):
-        return (not self._arguments[0] or isinstance(self._arguments[0], str)) and \
-               (isinstance(self._arguments[1], str) and self._arguments[1]) and \
-               isinstance(self._arguments[2], str)
+    def _check_arguments(self, arguments):
+        return check_arguments(arguments)
 
 
-    def _result(self):
-        if self._arguments[0] is None:
+    def _result(self, arguments):
+        if arguments[0] is None:
             return None
 
-        source = self._arguments[0]
-        regex = self._arguments[1]
-        replacement = self._arguments[2]
+        source = arguments[0]
+        regex = arguments[1]
+        replacement = arguments[2]
+
+        return self.__get_specialized(regex).substitute(source, replacement)
+
+
+    def __get_specialized(self, regex):
+        """
+        Get version of the function specialized for the regex, compile the regex if it is not cached.
+        The same cached version is returned for the same regex, so equal calls stay equal.
+
+        :param regex:
+            Regular expression.
+
+        :returns:
+            Specialized function as a :class:`~s2e2.functions.function_replace.FunctionReplaceCompiled`.
+
+        :raises:
+            :class:`~re.error` if the regex is invalid.
+        """
+        specialized = self.__patterns.get(regex)
+        if specialized is None:
+            start = time.perf_counter()
+            specialized = FunctionReplaceCompiled(re.compile(regex), REGEX_METACHARACTERS.isdisjoint(regex))
+            elapsed = time.perf_counter() - start
+
+            with self.__lock:
+                self.__compile_time += elapsed
+
+            self.__patterns.put(regex, specialized)
+
+        return specialized
+
+
+class FunctionReplaceCompiled(Function):
+    """
+    Function REPLACE(<source>, <regex>, <replacement>) specialized for a constant regex.
+    The regex argument is ignored, the pattern compiled out of it is used instead.
+
+    :param pattern:
+        Compiled regex.
+
+    :param literal:
+        Text matched by the regex if it has no metacharacters, None otherwise.
+    """
+
+    pure = True
+
+    def __init__(self, pattern, is_literal=False):
+        """
+        Constructor.
+
+        :param pattern:
+            Compiled regex.
+
+        :param is_literal:
+            Flag of a regex without metacharacters, which matches only its own text.
+        """
+        super().__init__('REPLACE', 3)
+        self.pattern = pattern
+        self.literal = pattern.pattern if is_literal else None
+
+
+    def substitute(self, source, replacement):
+        """
+        Replace all matches of the pattern in the source.
+
+        :param source:
+            Source string.
+
+        :param replacement:
+            Replacement, it may contain escapes and backreferences the same as for :func:`re.sub`.
+
+        :returns:
+            Copy of the source with the matches replaced.
+        """
+        # non-overlapping matches of a non-empty literal are the same for str.replace and re.sub
+        if self.literal is not None and REPLACEMENT_ESCAPE not in replacement and isinstance(source, str):
+            return source.replace(self.literal, replacement)
+
+        return self.pattern.sub(replacement, source)
+
+
+    def _check_arguments(self, arguments):
+        return check_arguments(arguments)
+
+
+    def _result(self, arguments):
+        if arguments[0] is None:
+            return None
 
-        return re.sub(regex, replacement, source)
+        return self.substitute(arguments[0], arguments[2])
@@ -0,0 +1,19 @@
+# Instruction codes of a program of a compiled expression.
+# Every instruction is a pair (code, operand).
+
+# Put the operand (a value) into the stack.
+PUSH = 0
+
+# Put value of the variable with the operand's name into the stack.
+LOAD = 4
+
+# Invoke the operand (a function or an operator) with arguments from the stack.
+CALL = 1
+
+# Push value of the operand's subprogram, evaluating it only once per evaluation.
+# The operand is a pair (slot, subprogram), where the slot identifies the memorized value.
+MEMO = 2
+
+# Invoke lazy function or operator with thunks of its arguments.
+# The operand is a pair (function or operator, tuple of subprograms of arguments).
+LAZY = 3
@@ -0,0 +1,98 @@
+from .instructions import CALL, MEMO, LAZY
+from .program_tree import ProgramTree
+
+
+class LazyTransformer:
+    """
+    Class replaces CALL instructions of lazy functions and operators with LAZY instructions,
+    so arguments of such functions and operators are evaluated only on demand.
+    """
+
+    @staticmethod
+    def transform(program):
+        """
+        Transform the program for lazy evaluation.
+
+        :param program:
+            Sequence of PUSH, LOAD, CALL and MEMO instructions.
+
+        :returns:
+            List of instructions.
+        """
+        return LazyTransformer.__transform(program, {})
+
+
+    @staticmethod
+    def __transform(program, memo_operands):
+        """
+        Transform the (sub)program for lazy evaluation.
+
+        :param program:
+            Sequence of PUSH, LOAD, CALL and MEMO instructions.
+
+        :param memo_operands:
+            Transformed operands of MEMO instructions by their slots.
+
+        :returns:
+            List of instructions.
+        """
+        tree = ProgramTree.build(program)
+        if tree is None:
+            # invalid program, let it fail during evaluation
+            return list(program)
+
+        result = []
+
+        # every item is a triple (index, output list of the parent, output lists of the arguments),
+        # the last one is None until arguments of the instruction are scheduled
+        pending = [(tree.root, result, None)]
+
+        while pending:
+            index, parent_output, arguments_outputs = pending.pop()
+            code, operand = tree.program[index]
+            arguments = tree.children[index]
+
+            if code == MEMO:
+                parent_output.append((MEMO, LazyTransformer.__transform_memo(operand, memo_operands)))
+                continue
+
+            if arguments_outputs is None:
+                if code == CALL and operand.lazy:
+                    arguments_outputs = [[] for _ in arguments]
+                else:
+                    arguments_outputs = [parent_output] * len(arguments)
+
+                pending.append((index, parent_output, arguments_outputs))
+                for argument, output in reversed(list(zip(arguments, arguments_outputs))):
+                    pending.append((argument, output, None))
+                continue
+
+            if code == CALL and operand.lazy:
+                subprograms = tuple(tuple(output) for output in arguments_outputs)
+                parent_output.append((LAZY, (operand, subprograms)))
+            else:
+                parent_output.append((code, operand))
+
+        return result
+
+
+    @staticmethod
+    def __transform_memo(operand, memo_operands):
+        """
+        Transform operand of MEMO instruction, every slot is transformed only once.
+
+        :param operand:
+            Pair (slot, subprogram).
+
+        :param memo_operands:
+            Transformed operands of MEMO instructions by their slots.
+
+        :returns:
+            Transformed operand.
+        """
+        slot, subprogram = operand
+
+        if slot not in memo_operands:
+            memo_operands[slot] = (slot, tuple(LazyTransformer.__transform(subprogram, memo_operands)))
+
+        return memo_operands[slot]
@@ -0,0 +1,143 @@
+import collections
+import threading
+
+
+# Statistics of a cache.
+CacheStatistics = collections.namedtuple('CacheStatistics', 'hits misses evictions entries bytes')
+
+
+class LruCache:
+    """
+    Size-bounded cache with Least Recently Used eviction policy. It can be used by several threads at once.
+
+    :param __max_entries:
+        Maximum number of entries, 0 disables the cache.
+
+    :param __max_bytes:
+        Maximum total size of all entries in bytes, 0 means no limit.
+
+    :param __sizer:
+        External function to get size of an entry by its key and value.
+
+    :param __entries:
+        Cached entries, the least recently used goes first.
+
+    :param __bytes:
+        Total size of all entries.
+
+    :param __lock:
+        Lock of entries and statistics.
+    """
+
+    def __init__(self, max_entries, max_bytes=0, sizer=None):
+        """
+        Constructor.
+
+        :param max_entries:
+            Maximum number of entries, 0 disables the cache.
+
+        :param max_bytes:
+            Maximum total size of all entries in bytes, 0 means no limit.
+
+        :param sizer:
+            External function to get size of an entry by its key and value.
+
+        :raises:
+            :class:`~ValueError` if any limit is negative.
+        """
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError('LruCache limits cannot be negative')
+
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__sizer = sizer or (lambda key, value: 0)
+        self.__entries = collections.OrderedDict()
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__lock = threading.Lock()
+
+
+    def get(self, key):
+        """
+        Get cached value and mark it as the most recently used.
+
+        :param key:
+            Key of the entry.
+
+        :returns:
+            Cached value or None if there is no such key.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return entry[0]
+
+
+    def put(self, key, value):
+        """
+        Put value into the cache evicting the least recently used entries if needed.
+
+        :param key:
+            Key of the entry.
+
+        :param value:
+            Value of the entry.
+        """
+        if not self.__max_entries:
+            return
+
+        size = self.__sizer(key, value)
+        if self.__max_bytes and size > self.__max_bytes:
+            return
+
+        with self.__lock:
+            old_entry = self.__entries.pop(key, None)
+            if old_entry is not None:
+                self.__bytes -= old_entry[1]
+
+            self.__entries[key] = (value, size)
+            self.__bytes += size
+
+            while len(self.__entries) > self.__max_entries or \
+                  (self.__max_bytes and self.__bytes > self.__max_bytes):
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.__bytes -= evicted_size
+                self.__evictions += 1
+
+
+    def clear(self):
+        """
+        Remove all entries, statistics counters are kept.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+
+    def get_statistics(self):
+        """
+        Get statistics of the cache.
+
+        :returns:
+            Statistics as a :class:`~s2e2.lru_cache.CacheStatistics`.
+        """
+        with self.__lock:
+            return CacheStatistics(self.__hits,
+                                   self.__misses,
+                                   self.__evictions,
+                                   len(self.__entries),
+                                   self.__bytes)
+
+
+    def __len__(self):
+        """
+        Get number of cached entries.
+        """
+        return len(self.__entries)
@@ -0,0 +1,59 @@
+import collections
+
+from .token import Token
+
+
+class Node(collections.namedtuple('Node', 'type value children span')):
+    """
+    Immutable node of an abstract syntax tree of an expression.
+
+    :param type:
+        Type of the node: ATOM, VARIABLE, OPERATOR or FUNCTION, provided as a :class:`~s2e2.TokenType`.
+
+    :param value:
+        Value of an atom, or name of a variable, an operator or a function.
+
+    :param children:
+        Tuple of nodes of arguments of an operator or a function, empty for atoms and variables.
+
+    :param span:
+        Pair (start, end) of indices of the node in the source expression, None if unknown.
+        Brackets around the node are not included.
+    """
+
+    __slots__ = ()
+
+    @property
+    def arity(self):
+        """
+        Number of arguments of an operator or a function, 0 for atoms and variables.
+        """
+        return len(self.children)
+
+
+    def postfix(self):
+        """
+        Get postfix view of the tree: sequence of tokens the same as :class:`~s2e2.converter.Converter` produces.
+        The only exception is a prefix operator followed by another prefix operator of the same or lower priority:
+        the tree applies both to their operand, e.g. ``!!A`` gives ``A ! !``, while the converter puts the first
+        operator before the operand, e.g. ``! A !``, so such expression is parsed, but can not be evaluated.
+
+        :returns:
+            List of tokens.
+        """
+        result = []
+
+        # every item is a pair (node, are its children already put into the result)
+        pending = [(self, False)]
+
+        while pending:
+            node, visited = pending.pop()
+
+            if visited or not node.children:
+                result.append(Token(node.type, node.value, node.span))
+                continue
+
+            pending.append((node, True))
+            pending.extend((child, False) for child in reversed(node.children))
+
+        return result
@@ -1,6 +1,9 @@
 import abc
+import inspect
 
+from ..call_context import ARGUMENTS, with_context_arguments
 from ..error import ExpressionError
+from ..vectorized_engine import VectorizedEngine
 
 
 class Operator(metaclass=abc.ABCMeta):
@@ -13,10 +16,38 @@ class Operator(metaclass=abc.ABCMeta):
     :param priority:
         Priority of the operator.
 
+    :param number_of_arguments:
+        Number of operator's arguments.
+
     :param _arguments:
-        List of arguments.
+        List of arguments of the current call, only for operators whose :meth:`_check_arguments`
+        and :meth:`_result` have no parameters. Every thread has its own list.
+
+    :param pure:
+        Flag of a pure operator, i.e. its result depends only on its arguments and it has no side effects.
+        Pure operators with constant arguments are evaluated once during compilation.
+
+    :param reads_clock:
+        Flag of an impure operator whose result depends only on its arguments and the value of NOW(),
+        i.e. it reads the clock of the evaluator, see :class:`~s2e2.clock.Clock`.
+
+    :param lazy:
+        Flag of a lazy operator, i.e. it is able to evaluate only some of its arguments.
+        In lazy evaluation mode such operators get thunks of arguments, see :meth:`_lazy_result`.
+
+    :param asynchronous:
+        Flag of an asynchronous operator, i.e. its :meth:`_result` is a coroutine function.
+        It is set automatically, expressions with such operators are evaluated by :meth:`~s2e2.Evaluator.evaluate_async`.
     """
 
+    pure = False
+
+    reads_clock = False
+
+    lazy = False
+
+    asynchronous = False
+
     def __init__(self, name, priority, number_of_arguments):
         """
         Constructor.
@@ -32,7 +63,32 @@ class Operator(metaclass=abc.ABCMeta):
         """
         self.name = name
         self.priority = priority
-        self._arguments = [None] * number_of_arguments
+        self.number_of_arguments = number_of_arguments
+
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Adapt :meth:`_check_arguments` and :meth:`_result` of a subclass, which have no parameters
+        and read arguments from self._arguments, to get arguments as a parameter.
+        Mark the subclass as asynchronous if its :meth:`_result` is a coroutine function.
+        """
+        super().__init_subclass__(**kwargs)
+
+        for name in ('_check_arguments', '_result'):
+            method = cls.__dict__.get(name)
+            if inspect.isfunction(method) and len(inspect.signature(method).parameters) == 1:
+                setattr(cls, name, with_context_arguments(method))
+
+        if '_result' in cls.__dict__:
+            cls.asynchronous = inspect.iscoroutinefunction(cls.__dict__['_result'])
+
+
+    @property
+    def _arguments(self):
+        """
+        List of arguments of the current call of operators whose methods have no parameters.
+        """
+        return ARGUMENTS.get()
 
 
     def invoke(self, stack):
@@ -45,33 +101,178 @@ class Operator(metaclass=abc.ABCMeta):
         :raises:
             :class:`~s2e2.ExpressionError` in case of wrong number or types of arguments.
         """
-        if len(stack) < len(self._arguments):
+        if len(stack) < self.number_of_arguments:
             raise ExpressionError('Not enough arguments for operator {}'.format(self.name))
 
-        for i in range(len(self._arguments) - 1, -1, -1):
-            self._arguments[i] = stack.pop()
+        arguments = stack[len(stack) - self.number_of_arguments:]
+        del stack[len(stack) - self.number_of_arguments:]
+
+        if not self._check_arguments(arguments):
+            raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
+
+        stack.append(self._result(arguments))
+
+
+    def call(self, *arguments):
+        """
+        Invoke the operator with the arguments.
+
+        :param arguments:
+            Exactly number_of_arguments values.
+
+        :returns:
+            Result of the operator.
 
-        if not self._check_arguments():
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of wrong number or types of arguments.
+        """
+        if len(arguments) != self.number_of_arguments:
+            raise ExpressionError('Wrong number of arguments for operator {}'.format(self.name))
+
+        arguments = list(arguments)
+
+        if not self._check_arguments(arguments):
             raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
 
-        stack.append(self._result())
+        return self._result(arguments)
+
+
+    async def call_async(self, *arguments):
+        """
+        Invoke the operator with the arguments and await its result if the operator is asynchronous.
+
+        :param arguments:
+            Exactly number_of_arguments values.
+
+        :returns:
+            Result of the operator.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of wrong number or types of arguments.
+        """
+        if len(arguments) != self.number_of_arguments:
+            raise ExpressionError('Wrong number of arguments for operator {}'.format(self.name))
+
+        arguments = list(arguments)
+
+        if not self._check_arguments(arguments):
+            raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
+
+        result = self._result(arguments)
+        return await result if self.asynchronous else result
+
+
+    def specialize(self, constants):
+        """
+        Get version of the operator specialized for a call with some constant arguments,
+        e.g. with a constant argument preprocessed once. It is called during compilation
+        for calls whose arguments are not all constant, by default there is no specialization.
+        A specialized version gets all the arguments and must give the same results.
+
+        :param constants:
+            Mapping of values of constant arguments by their positions.
+
+        :returns:
+            Specialized operator or None to call the operator itself.
+        """
+        return None
+
+
+    def call_lazily(self, *thunks):
+        """
+        Invoke the operator with thunks of the arguments.
+
+        :param thunks:
+            Exactly number_of_arguments functions without arguments returning values of arguments.
+
+        :returns:
+            Result of the operator.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of wrong number or types of arguments.
+        """
+        if len(thunks) != self.number_of_arguments:
+            raise ExpressionError('Wrong number of arguments for operator {}'.format(self.name))
+
+        return self._lazy_result(thunks)
+
+
+    def _lazy_result(self, thunks):
+        """
+        Calculate result of the operator out of thunks of its arguments.
+        Lazy operators should override it to evaluate only the arguments they need,
+        by default all arguments are evaluated.
+
+        :param thunks:
+            Tuple of functions returning values of arguments.
+
+        :returns:
+            Result of the operator.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of wrong types of arguments.
+        """
+        return self.call(*(thunk() for thunk in thunks))
+
+
+    def call_vectorized(self, *columns):
+        """
+        Invoke the operator for all rows of the arguments' columns at once.
+
+        :param columns:
+            Exactly number_of_arguments NumPy arrays or scalars, a scalar is the same for all rows.
+
+        :returns:
+            Array of results or a single result if all arguments are scalars.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of wrong number or types of arguments.
+        """
+        if len(columns) != self.number_of_arguments:
+            raise ExpressionError('Wrong number of arguments for operator {}'.format(self.name))
+
+        return self._vectorized_result(columns)
+
+
+    def _vectorized_result(self, columns):
+        """
+        Calculate results of the operator for all rows of the arguments' columns.
+        Operators should override it to process all rows by NumPy operations,
+        by default the operator is called for every row.
+
+        :param columns:
+            Tuple of NumPy arrays or scalars.
+
+        :returns:
+            Array of results or a single result if all arguments are scalars.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of wrong types of arguments.
+        """
+        return VectorizedEngine.call_per_row(self, columns)
 
 
     @abc.abstractmethod
-    def _check_arguments(self):
+    def _check_arguments(self, arguments):
         """
         Check if arguments are correct.
 
+        :param arguments:
+            List of arguments.
+
         :returns:
             True if arguments are correct, False otherwise.
         """
 
 
     @abc.abstractmethod
-    def _result(self):
+    def _result(self, arguments):
         """
         Calculate result of the operator.
 
+        :param arguments:
+            List of arguments.
+
         :returns:
             Result of the operator.
         """
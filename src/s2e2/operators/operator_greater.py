@@ -1,3 +1,5 @@
+from ..error import ExpressionError
+from ..vectorized_engine import VectorizedEngine
 from .operator import Operator
 from .priorities import Priorities
 
@@ -8,18 +10,29 @@ class OperatorGreater(Operator):
     Compares any two objects.
     """
 
+    pure = True
+
     def __init__(self):
         super().__init__('>', Priorities.OPERATOR_GREATER, 2)
 
 
-    def _check_arguments(self):
+    def _check_arguments(self, arguments):
         try:
-            self._arguments[0] > self._arguments[1]
+            arguments[0] > arguments[1]
         except TypeError:
             return False
 
         return True
 
 
-    def _result(self):
-        return self._arguments[0] > self._arguments[1]
+    def _result(self, arguments):
+        return arguments[0] > arguments[1]
+
+
+    def _vectorized_result(self, columns):
+        import numpy
+
+        try:
+            return numpy.greater(*VectorizedEngine.unify(*columns))
+        except TypeError:
+            raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
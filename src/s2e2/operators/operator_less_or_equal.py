@@ -1,3 +1,5 @@
+from ..error import ExpressionError
+from ..vectorized_engine import VectorizedEngine
 from .operator import Operator
 from .priorities import Priorities
 
@@ -8,24 +10,35 @@ class OperatorLessOrEqual(Operator):
     Compares any two objects.
     """
 
+    pure = True
+
     def __init__(self):
         super().__init__('<=', Priorities.OPERATOR_LESS_OR_EQUAL, 2)
 
 
-    def _check_arguments(self):
-        if not self._arguments[0] and not self._arguments[1]:
+    def _check_arguments(self, arguments):
+        if not arguments[0] and not arguments[1]:
             return True
 
         try:
-            self._arguments[0] <= self._arguments[1]
+            arguments[0] <= arguments[1]
         except TypeError:
             return False
 
         return True
 
 
-    def _result(self):
-        if not self._arguments[0] and not self._arguments[1]:
+    def _result(self, arguments):
+        if not arguments[0] and not arguments[1]:
             return True
 
-        return self._arguments[0] <= self._arguments[1]
+        return arguments[0] <= arguments[1]
+
+
+    def _vectorized_result(self, columns):
+        import numpy
+
+        try:
+            return VectorizedEngine.compare_or_empty(numpy.less_equal, *columns)
+        except TypeError:
+            raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
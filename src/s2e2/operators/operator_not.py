@@ -1,3 +1,5 @@
+from ..error import ExpressionError
+from ..vectorized_engine import VectorizedEngine
 from .operator import Operator
 from .priorities import Priorities
 
@@ -8,13 +10,23 @@ class OperatorNot(Operator):
     Negates boolean value.
     """
 
+    pure = True
+
     def __init__(self):
         super().__init__('!', Priorities.OPERATOR_NOT, 1)
 
 
-    def _check_arguments(self):
-        return isinstance(self._arguments[0], bool)
+    def _check_arguments(self, arguments):
+        return isinstance(arguments[0], bool)
+
+
+    def _result(self, arguments):
+        return not arguments[0]
+
 
+    def _vectorized_result(self, columns):
+        value = VectorizedEngine.to_booleans(columns[0])
+        if value is None:
+            raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
 
-    def _result(self):
-        return not self._arguments[0]
+        return ~value
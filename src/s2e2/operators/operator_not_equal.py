@@ -1,3 +1,4 @@
+from ..vectorized_engine import VectorizedEngine
 from .operator import Operator
 from .priorities import Priorities
 
@@ -8,13 +9,21 @@ class OperatorNotEqual(Operator):
     Compares any two objects.
     """
 
+    pure = True
+
     def __init__(self):
         super().__init__('!=', Priorities.OPERATOR_NOT_EQUAL, 2)
 
 
-    def _check_arguments(self):
+    def _check_arguments(self, arguments):
         return True
 
 
-    def _result(self):
-        return self._arguments[0] != self._arguments[1]
+    def _result(self, arguments):
+        return arguments[0] != arguments[1]
+
+
+    def _vectorized_result(self, columns):
+        import numpy
+
+        return numpy.not_equal(*VectorizedEngine.unify(*columns))
@@ -1,3 +1,5 @@
+from ..error import ExpressionError
+from ..vectorized_engine import VectorizedEngine
 from .operator import Operator
 from .priorities import Priorities
 
@@ -8,14 +10,37 @@ class OperatorOr(Operator):
     Computes disjunction of two boolean values.
     """
 
+    pure = True
+
+    lazy = True
+
     def __init__(self):
         super().__init__('||', Priorities.OPERATOR_AND, 2)
 
 
-    def _check_arguments(self):
-        return isinstance(self._arguments[0], bool) and \
-               isinstance(self._arguments[1], bool)
+    def _check_arguments(self, arguments):
+        return isinstance(arguments[0], bool) and \
+               isinstance(arguments[1], bool)
+
+
+    def _result(self, arguments):
+        return arguments[0] or arguments[1]
+
+
+    def _lazy_result(self, thunks):
+        for thunk in thunks:
+            value = thunk()
+            if not isinstance(value, bool):
+                raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
+            if value:
+                return True
+
+        return False
+
 
+    def _vectorized_result(self, columns):
+        left, right = (VectorizedEngine.to_booleans(column) for column in columns)
+        if left is None or right is None:
+            raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
 
-    def _result(self):
-        return self._arguments[0] or self._arguments[1]
+        return left | right
@@ -1,3 +1,5 @@
+from ..error import ExpressionError
+from ..vectorized_engine import VectorizedEngine
 from .operator import Operator
 from .priorities import Priorities
 
@@ -8,20 +10,42 @@ class OperatorPlus(Operator):
     Concatenates two strings.
     """
 
+    pure = True
+
     def __init__(self):
         super().__init__('+', Priorities.OPERATOR_AND, 2)
 
 
-    def _check_arguments(self):
-        return (not self._arguments[0] or isinstance(self._arguments[0], str)) and \
-               (not self._arguments[1] or isinstance(self._arguments[1], str))
+    def _check_arguments(self, arguments):
+        return (not arguments[0] or isinstance(arguments[0], str)) and \
+               (not arguments[1] or isinstance(arguments[1], str))
+
+
+    def _result(self, arguments):
+        if not arguments[0]:
+            return arguments[1]
+
+        if not arguments[1]:
+            return arguments[0]
+
+        return arguments[0] + arguments[1]
+
+
+    def _vectorized_result(self, columns):
+        import numpy
 
+        left, right = (numpy.asarray(column) for column in columns)
+        if left.dtype.kind == 'U' and right.dtype.kind == 'U':
+            return numpy.char.add(left, right)
 
-    def _result(self):
-        if not self._arguments[0]:
-            return self._arguments[1]
+        left, right = VectorizedEngine.to_objects(left), VectorizedEngine.to_objects(right)
+        left_empty, right_empty = ~left.astype(bool), ~right.astype(bool)
 
-        if not self._arguments[1]:
-            return self._arguments[0]
+        is_string = numpy.frompyfunc(lambda value: isinstance(value, str), 1, 1)
+        left_valid = left_empty | numpy.asarray(is_string(left), dtype=bool)
+        right_valid = right_empty | numpy.asarray(is_string(right), dtype=bool)
+        if not numpy.all(left_valid & right_valid):
+            raise ExpressionError('Invalid arguments for operator {}'.format(self.name))
 
-        return self._arguments[0] + self._arguments[1]
+        concatenation = numpy.where(left_empty, '', left) + numpy.where(right_empty, '', right)
+        return numpy.where(left_empty, right, numpy.where(right_empty, left, concatenation))
@@ -0,0 +1,284 @@
+from .error import ExpressionError
+from .node import Node
+from .token_type import ATOM, COMMA, FUNCTION, LEFT_BRACKET, OPERATOR, RIGHT_BRACKET, VARIABLE
+
+
+class Parser:
+    """
+    Class parses infix token sequence into an abstract syntax tree.
+    Parsing is done by precedence climbing in a single pass over the tokens.
+    Operators of higher priority bind tighter, operators of the same priority are left-associative,
+    the same as in :class:`~s2e2.converter.Converter`. Unlike the converter, stacked prefix operators
+    are applied to their operand one after another, see :meth:`~s2e2.Node.postfix`.
+
+    :param __operators:
+        Pairs (priority, number of arguments) of all expected operators by their names.
+    """
+
+    # Priority lower than priority of any operator.
+    LOWEST_PRIORITY = 0
+
+    # Number of arguments of unary (prefix) and binary (infix) operators.
+    UNARY = 1
+    BINARY = 2
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        self.__operators = {}
+
+
+    def add_operator(self, name, priority, number_of_arguments):
+        """
+        Add operator expected within expression.
+
+        :param name:
+            Operator's name.
+
+        :param priority:
+            Operator's priority.
+
+        :param number_of_arguments:
+            Number of operator's arguments: 1 for a prefix operator, 2 for an infix one.
+            Operators with any other number of arguments are accepted, but expressions with them can not be parsed.
+
+        :raises:
+            :class:`~TypeError` if the name is empty.
+            :class:`~s2e2.ExpressionError` if the name is not unique.
+        """
+        if not name:
+            raise TypeError('Attempt to add None to Parser')
+
+        if name in self.__operators:
+            raise ExpressionError('Operator {} is alredy added'.format(name))
+
+        self.__operators[name] = (priority, number_of_arguments)
+
+
+    def parse(self, infix_expression):
+        """
+        Parse infix token sequence into an abstract syntax tree.
+
+        :param infix_expression:
+            Input sequence of tokens.
+
+        :returns:
+            Root :class:`~s2e2.Node` of the tree.
+
+        :raises:
+            :class:`~TypeError` if the input is None.
+            :class:`~s2e2.ExpressionError` in case of an error.
+        """
+        if not infix_expression:
+            raise TypeError('Attempt to parse None with Parser')
+
+        try:
+            root, position = self.__parse_expression(infix_expression, 0, Parser.LOWEST_PRIORITY)
+        except RecursionError:
+            raise ExpressionError('Expression is too deeply nested')
+
+        if position != len(infix_expression):
+            Parser.__raise_unexpected(infix_expression[position])
+
+        return root
+
+
+    def __parse_expression(self, tokens, position, min_priority):
+        """
+        Parse operand followed by infix operators of at least the given priority and their right operands.
+
+        :param tokens:
+            Sequence of tokens.
+
+        :param position:
+            Index of the first token of the expression.
+
+        :param min_priority:
+            Minimal priority of infix operators of the expression.
+
+        :returns:
+            Pair (node, index of the token after the expression).
+        """
+        left, position = self.__parse_operand(tokens, position)
+
+        while position < len(tokens) and tokens[position].type is OPERATOR:
+            token = tokens[position]
+            priority, number_of_arguments = self.__get_operator(token)
+
+            if number_of_arguments != Parser.BINARY:
+                Parser.__raise_unexpected(token)
+
+            if priority < min_priority:
+                break
+
+            right, position = self.__parse_expression(tokens, position + 1, priority + 1)
+            left = Node(OPERATOR, token.value, (left, right), Parser.__join_spans(left.span, right.span))
+
+        return left, position
+
+
+    def __parse_operand(self, tokens, position):
+        """
+        Parse atom, variable, function call, prefix operator with its operand or expression in brackets.
+
+        :param tokens:
+            Sequence of tokens.
+
+        :param position:
+            Index of the first token of the operand.
+
+        :returns:
+            Pair (node, index of the token after the operand).
+        """
+        if position == len(tokens):
+            raise ExpressionError('Unexpected end of expression')
+
+        token = tokens[position]
+
+        if token.type is ATOM or token.type is VARIABLE:
+            return Node(token.type, token.value, (), token.span), position + 1
+
+        if token.type is OPERATOR:
+            priority, number_of_arguments = self.__get_operator(token)
+            if number_of_arguments != Parser.UNARY:
+                Parser.__raise_unexpected(token)
+
+            operand, position = self.__parse_expression(tokens, position + 1, priority + 1)
+            return Node(OPERATOR, token.value, (operand,), Parser.__join_spans(token.span, operand.span)), position
+
+        if token.type is FUNCTION:
+            return self.__parse_function(tokens, position)
+
+        if token.type is LEFT_BRACKET:
+            node, position = self.__parse_expression(tokens, position + 1, Parser.LOWEST_PRIORITY)
+            return node, Parser.__skip_right_bracket(tokens, position)
+
+        Parser.__raise_unexpected(token)
+
+
+    def __parse_function(self, tokens, position):
+        """
+        Parse function call: function's name and its arguments in brackets separated by commas.
+
+        :param tokens:
+            Sequence of tokens.
+
+        :param position:
+            Index of the function's token.
+
+        :returns:
+            Pair (node, index of the token after the closing bracket).
+        """
+        token = tokens[position]
+        position += 1
+
+        if position == len(tokens) or tokens[position].type is not LEFT_BRACKET:
+            raise ExpressionError('Function {} is not followed by brackets'.format(token.value))
+
+        position += 1
+        arguments = []
+
+        if position < len(tokens) and tokens[position].type is RIGHT_BRACKET:
+            position += 1
+        else:
+            while True:
+                argument, position = self.__parse_expression(tokens, position, Parser.LOWEST_PRIORITY)
+                arguments.append(argument)
+
+                if position < len(tokens) and tokens[position].type is COMMA:
+                    position += 1
+                    continue
+
+                position = Parser.__skip_right_bracket(tokens, position)
+                break
+
+        span = Parser.__join_spans(token.span, tokens[position - 1].span)
+        return Node(FUNCTION, token.value, tuple(arguments), span), position
+
+
+    def __get_operator(self, token):
+        """
+        Get priority and number of arguments of the operator.
+
+        :param token:
+            OPERATOR token.
+
+        :returns:
+            Pair (priority, number of arguments).
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an unknown operator
+            or an operator which is neither prefix nor infix one.
+        """
+        operator = self.__operators.get(token.value)
+        if operator is None:
+            raise ExpressionError('Unknown operator {}'.format(token.value))
+
+        if operator[1] not in (Parser.UNARY, Parser.BINARY):
+            raise ExpressionError('Operator {} with {} arguments can not be parsed'.format(token.value, operator[1]))
+
+        return operator
+
+
+    @staticmethod
+    def __skip_right_bracket(tokens, position):
+        """
+        Skip right bracket closing a function call or an expression in brackets.
+
+        :param tokens:
+            Sequence of tokens.
+
+        :param position:
+            Index of the expected right bracket.
+
+        :returns:
+            Index of the token after the bracket.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an unpaired bracket.
+        """
+        if position == len(tokens):
+            raise ExpressionError('Unpaired bracket')
+
+        if tokens[position].type is not RIGHT_BRACKET:
+            Parser.__raise_unexpected(tokens[position])
+
+        return position + 1
+
+
+    @staticmethod
+    def __join_spans(first, last):
+        """
+        Get span from the start of the first span to the end of the last one.
+
+        :param first:
+            First span or None.
+
+        :param last:
+            Last span or None.
+
+        :returns:
+            Pair (start, end) or None if some span is unknown.
+        """
+        if first is None or last is None:
+            return None
+
+        return first[0], last[1]
+
+
+    @staticmethod
+    def __raise_unexpected(token):
+        """
+        Raise error about an unexpected token.
+
+        :param token:
+            Unexpected token.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` always.
+        """
+        if token.type is RIGHT_BRACKET:
+            raise ExpressionError('Unpaired bracket')
+
+        raise ExpressionError('Unexpected token {}'.format(token.value))
@@ -0,0 +1,191 @@
+import json
+import os
+import tempfile
+import threading
+
+from .token_type import TokenType
+from .token import Token
+
+
+class PlanStore:
+    """
+    Persistent storage of postfix token sequences, i.e. outputs of :class:`~s2e2.converter.Converter`.
+    All plans are kept in a single JSON file grouped by fingerprints of the evaluator's
+    functions and operators. Plans made for another fingerprint are never used.
+
+    :param __path:
+        Path of the storage file.
+
+    :param __fingerprint:
+        Fingerprint the loaded plans were made for.
+
+    :param __plans:
+        Plans by expressions, None stands for an expression which is a string literal.
+
+    :param __new_plans:
+        Plans added since the last save by expressions by fingerprints, so plans are not lost
+        when the fingerprint changes before they are saved.
+
+    :param __lock:
+        Lock of the plans, so the storage can be used by several threads at once.
+    """
+
+    # Version of the file format.
+    FORMAT_VERSION = 3
+
+    # Maximum number of fingerprints kept in the file, plans of the least recently saved ones are dropped.
+    MAX_FINGERPRINTS = 8
+
+    def __init__(self, path):
+        """
+        Constructor.
+
+        :param path:
+            Path of the storage file, it is not required to exist.
+
+        :raises:
+            :class:`~TypeError` if the path is empty.
+        """
+        if not path:
+            raise TypeError('Attempt to create PlanStore without a path')
+
+        self.__path = path
+        self.__fingerprint = None
+        self.__plans = {}
+        self.__new_plans = {}
+        self.__lock = threading.Lock()
+
+
+    def get(self, fingerprint, expression):
+        """
+        Get plan of the expression.
+
+        :param fingerprint:
+            Fingerprint of functions and operators of the requesting evaluator.
+
+        :param expression:
+            Input expression.
+
+        :returns:
+            Pair (found, plan), where the plan is either a list of tokens
+            or None if the expression is a string literal.
+        """
+        with self.__lock:
+            if fingerprint != self.__fingerprint:
+                self.__load(fingerprint)
+
+            plan = self.__plans.get(expression, False)
+
+        if plan is False:
+            return False, None
+
+        if plan is None:
+            return True, None
+
+        try:
+            return True, [Token(TokenType[type], value) for type, value in plan]
+        except (KeyError, TypeError, ValueError):
+            # broken entry is the same as no entry
+            return False, None
+
+
+    def put(self, fingerprint, expression, plan):
+        """
+        Put plan of the expression into the storage. It is written to the file by :meth:`save`.
+
+        :param fingerprint:
+            Fingerprint of functions and operators of the requesting evaluator.
+
+        :param expression:
+            Input expression.
+
+        :param plan:
+            List of postfix tokens or None if the expression is a string literal.
+        """
+        if plan is not None:
+            plan = [(token.type.name, token.value) for token in plan]
+
+        with self.__lock:
+            if fingerprint != self.__fingerprint:
+                self.__load(fingerprint)
+
+            self.__plans[expression] = plan
+            self.__new_plans.setdefault(fingerprint, {})[expression] = plan
+
+
+    def save(self):
+        """
+        Write all new plans of all fingerprints into the file. Plans saved into the same file
+        by other processes meanwhile are preserved, except for plans of the least recently saved fingerprints
+        beyond MAX_FINGERPRINTS.
+
+        :raises:
+            :class:`~OSError` if the file cannot be written.
+        """
+        with self.__lock:
+            if not self.__new_plans:
+                return
+
+            plans = self.__read_all_plans()
+            for fingerprint, new_plans in self.__new_plans.items():
+                # the most recently saved fingerprints go last
+                plans[fingerprint] = dict(plans.pop(fingerprint, {}), **new_plans)
+
+            content = {
+                'format': PlanStore.FORMAT_VERSION,
+                'plans': dict(list(plans.items())[-PlanStore.MAX_FINGERPRINTS:]),
+            }
+
+            directory = os.path.dirname(os.path.abspath(self.__path))
+            descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(descriptor, 'w') as f:
+                    json.dump(content, f)
+                os.replace(temporary_path, self.__path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+
+            self.__new_plans = {}
+
+
+    def __len__(self):
+        """
+        Get number of known plans.
+        """
+        with self.__lock:
+            return len(self.__plans)
+
+
+    def __load(self, fingerprint):
+        """
+        Load plans for the fingerprint from the file together with its not saved plans,
+        drop loaded plans for another fingerprint.
+
+        :param fingerprint:
+            Fingerprint of functions and operators.
+        """
+        self.__fingerprint = fingerprint
+        self.__plans = self.__read_all_plans().get(fingerprint, {})
+        self.__plans.update(self.__new_plans.get(fingerprint, {}))
+
+
+    def __read_all_plans(self):
+        """
+        Read plans for all fingerprints from the file.
+
+        :returns:
+            Dictionary of dictionaries of plans by fingerprints, empty if the file does not exist or is broken.
+        """
+        try:
+            with open(self.__path) as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(content, dict) or \
+           content.get('format') != PlanStore.FORMAT_VERSION or \
+           not isinstance(content.get('plans'), dict):
+            return {}
+
+        return {fingerprint: plans for fingerprint, plans in content['plans'].items() if isinstance(plans, dict)}
@@ -0,0 +1,299 @@
+import collections
+import concurrent.futures
+import itertools
+import os
+
+from .error import ExpressionError
+from .evaluator import Evaluator
+
+
+# Evaluator of a worker process, created once by the initializer of the process.
+_worker_evaluator = None
+
+
+def _initialize_worker(spec):
+    """
+    Create frozen evaluator of the worker process.
+
+    :param spec:
+        Configuration of the evaluator as a :class:`~s2e2.evaluator.EvaluatorSpec`.
+    """
+    global _worker_evaluator
+    _worker_evaluator = Evaluator.from_spec(spec).freeze()
+
+
+def _evaluate_expressions(expressions, bindings, return_exceptions):
+    """
+    Evaluate chunk of expressions in a worker process, the chunk is a batch.
+    Every distinct expression is compiled once, and if it is pure within the batch, also evaluated once.
+
+    :param expressions:
+        List of expressions.
+
+    :param bindings:
+        Mapping of values of the expressions' variables by their names.
+
+    :param return_exceptions:
+        Flag to return an exception of an expression in place of its value.
+
+    :returns:
+        List of values of the expressions.
+    """
+    if not return_exceptions:
+        return _worker_evaluator.evaluate_many(expressions, bindings)
+
+    compiled_expressions = {}
+    values = {}
+    results = []
+
+    with _worker_evaluator.batch():
+        for expression in expressions:
+            if expression in values:
+                results.append(values[expression])
+                continue
+
+            compiled = compiled_expressions.get(expression)
+            if compiled is None:
+                try:
+                    compiled = _worker_evaluator.compile(expression)
+                except (ExpressionError, TypeError) as error:
+                    values[expression] = error
+                    results.append(error)
+                    continue
+                compiled_expressions[expression] = compiled
+
+            try:
+                value = compiled.evaluate(bindings)
+            except Exception as error:
+                value = error
+
+            if compiled.is_pure_in_batch:
+                values[expression] = value
+            results.append(value)
+
+    return results
+
+
+def _evaluate_records(expression, records):
+    """
+    Evaluate the expression for chunk of records in a worker process.
+
+    :param expression:
+        Input expression.
+
+    :param records:
+        List of mappings of values of the expression's variables by their names.
+
+    :returns:
+        List of values of the expression.
+    """
+    return list(_worker_evaluator.stream_map(expression, records, len(records)))
+
+
+class ProcessEvaluator:
+    """
+    Class evaluates expressions in parallel by a pool of processes, so CPU-bound evaluation uses several cores.
+    Every process has its own copy of the evaluator created out of its configuration,
+    see :meth:`~s2e2.Evaluator.get_spec`. Expressions and records are sent to processes by chunks,
+    every chunk is a batch of the evaluator's clock.
+
+    :param __evaluator:
+        Evaluator used to check expressions before sending them to processes.
+
+    :param __workers:
+        Number of processes.
+
+    :param __chunk_size:
+        Number of expressions or records sent to a process at once.
+
+    :param __executor:
+        Pool of processes.
+    """
+
+    # Default number of expressions or records sent to a process at once.
+    DEFAULT_CHUNK_SIZE = 256
+
+    # Number of chunks sent to every process in advance by streaming methods.
+    PREFETCH_FACTOR = 2
+
+    def __init__(self, evaluator, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Constructor.
+
+        :param evaluator:
+            :class:`~s2e2.Evaluator` with all needed functions and operators, they all must be picklable.
+
+        :param workers:
+            Number of processes, by default the number of processors.
+
+        :param chunk_size:
+            Number of expressions or records sent to a process at once.
+
+        :raises:
+            :class:`~TypeError` if evaluator is empty.
+            :class:`~ValueError` if number of processes or chunk size is not positive.
+        """
+        if not evaluator:
+            raise TypeError('Attempt to create ProcessEvaluator without an evaluator')
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers < 1 or chunk_size < 1:
+            raise ValueError('ProcessEvaluator needs at least one process and positive chunk size')
+
+        self.__evaluator = evaluator
+        self.__workers = workers
+        self.__chunk_size = chunk_size
+        self.__executor = concurrent.futures.ProcessPoolExecutor(workers,
+                                                                 initializer=_initialize_worker,
+                                                                 initargs=(evaluator.get_spec(),))
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def evaluate_many(self, expressions, bindings=None, return_exceptions=False):
+        """
+        Evaluate all the expressions in parallel. Within a chunk every distinct expression is compiled once,
+        and if it is pure, also evaluated once.
+
+        :param expressions:
+            Iterable of input expressions.
+
+        :param bindings:
+            Mapping of values of the expressions' variables by their names, the same for all expressions.
+
+        :param return_exceptions:
+            If set, an exception of an expression is returned in place of its value instead of being raised.
+
+        :returns:
+            List of values of the expressions in the same order.
+
+        :raises:
+            :class:`~TypeError` if some expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression or an undefined variable.
+            Both only if return_exceptions is not set.
+        """
+        expressions = iter(expressions)
+        futures = []
+
+        while True:
+            chunk = list(itertools.islice(expressions, self.__chunk_size))
+            if not chunk:
+                break
+            futures.append(self.__executor.submit(_evaluate_expressions, chunk, bindings, return_exceptions))
+
+        return [value for future in futures for value in future.result()]
+
+
+    def stream_map(self, expression, records):
+        """
+        Evaluate the expression for every record of the stream in parallel.
+        Only a few chunks of records per process are read in advance.
+
+        :param expression:
+            Input expression.
+
+        :param records:
+            Iterable of mappings of values of the expression's variables by their names.
+
+        :returns:
+            Generator of values of the expression for the records in the same order.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression,
+            or during iteration if some variable is not defined by a record.
+        """
+        self.__check_expression(expression)
+        return (value for _, values in self.__evaluate_chunks(expression, records) for value in values)
+
+
+    def stream_filter(self, expression, records):
+        """
+        Select records of the stream for which the expression is true, the expression is evaluated in parallel.
+        Only a few chunks of records per process are read in advance.
+
+        :param expression:
+            Input expression.
+
+        :param records:
+            Iterable of mappings of values of the expression's variables by their names.
+
+        :returns:
+            Generator of the selected records in the same order.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression,
+            or during iteration if some variable is not defined by a record.
+        """
+        self.__check_expression(expression)
+        return (record for chunk, values in self.__evaluate_chunks(expression, records)
+                for record, value in zip(chunk, values) if value == Evaluator.TRUE_VALUE)
+
+
+    def close(self, wait=True):
+        """
+        Stop the pool of processes.
+
+        :param wait:
+            Flag to wait for all submitted evaluations.
+        """
+        self.__executor.shutdown(wait=wait)
+
+
+    def __check_expression(self, expression):
+        """
+        Compile the expression in this process to report errors before sending it to processes.
+
+        :param expression:
+            Input expression.
+
+        :raises:
+            :class:`~TypeError` if expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        if not expression:
+            raise TypeError('Attempt to evaluate empty expression with ProcessEvaluator')
+
+        self.__evaluator.compile(expression)
+
+
+    def __evaluate_chunks(self, expression, records):
+        """
+        Send chunks of records to processes and get values of the expression in the order of chunks.
+
+        :param expression:
+            Input expression.
+
+        :param records:
+            Iterable of mappings of values of variables by their names.
+
+        :returns:
+            Generator of pairs (list of records, list of values of the expression).
+        """
+        records = iter(records)
+        max_pending = self.__workers * ProcessEvaluator.PREFETCH_FACTOR
+        pending = collections.deque()
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                chunk = list(itertools.islice(records, self.__chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.append((chunk, self.__executor.submit(_evaluate_records, expression, chunk)))
+
+            if not pending:
+                return
+
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
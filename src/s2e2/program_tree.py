@@ -0,0 +1,88 @@
+from .instructions import CALL
+
+
+class ProgramTree:
+    """
+    Tree view of a program of a compiled expression: every CALL instruction is a node
+    with subprograms computing its arguments as children.
+
+    :param program:
+        Sequence of instructions.
+
+    :param children:
+        Indices of arguments' last instructions for every instruction.
+
+    :param starts:
+        Index of the first instruction of the subprogram ending with every instruction.
+
+    :param root:
+        Index of the last instruction.
+    """
+
+    def __init__(self, program, children, starts):
+        """
+        Constructor.
+
+        :param program:
+            Sequence of instructions.
+
+        :param children:
+            Indices of arguments' last instructions for every instruction.
+
+        :param starts:
+            Index of the first instruction of the subprogram ending with every instruction.
+        """
+        self.program = program
+        self.children = children
+        self.starts = starts
+        self.root = len(program) - 1
+
+
+    @classmethod
+    def build(cls, program):
+        """
+        Build tree view of the program.
+
+        :param program:
+            Sequence of instructions.
+
+        :returns:
+            :class:`~s2e2.program_tree.ProgramTree` or None if the program is invalid,
+            i.e. it does not leave exactly one value in the stack.
+        """
+        children = []
+        starts = []
+        stack = []
+
+        for index, (code, operand) in enumerate(program):
+            if code == CALL:
+                number_of_arguments = operand.number_of_arguments
+                if len(stack) < number_of_arguments:
+                    return None
+
+                arguments = tuple(stack[len(stack) - number_of_arguments:])
+                del stack[len(stack) - number_of_arguments:]
+            else:
+                arguments = ()
+
+            children.append(arguments)
+            starts.append(starts[arguments[0]] if arguments else index)
+            stack.append(index)
+
+        if len(stack) != 1:
+            return None
+
+        return cls(program, children, starts)
+
+
+    def subprogram(self, index):
+        """
+        Get subprogram ending with the instruction.
+
+        :param index:
+            Index of the last instruction of the subprogram.
+
+        :returns:
+            Slice of the program.
+        """
+        return self.program[self.starts[index] : index + 1]
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import types
+
+from .converter import Converter
+from .parser import Parser
+from .tokenizer import Tokenizer
+
+
+class Registry:
+    """
+    Immutable version of sets of supported functions and operators together with the tokenizer,
+    the converter and the parser built for them. A registry is never changed after it is built,
+    a change of functions or operators builds a new registry with the next version.
+
+    :param version:
+        Number of the version, it grows with every change.
+
+    :param functions:
+        Read-only mapping of functions by their names.
+
+    :param operators:
+        Read-only mapping of operators by their names.
+
+    :param converter:
+        Converter of infix token sequence into postfix one.
+
+    :param parser:
+        Parser of infix token sequence into abstract syntax tree.
+
+    :param tokenizer:
+        Tokenizer of expression onto list of tokens.
+
+    :param fingerprint:
+        Fingerprint of the library version and all functions and operators,
+        it does not depend on the version of the registry.
+    """
+
+    __slots__ = ('version', 'functions', 'operators', 'converter', 'parser', 'tokenizer', 'fingerprint')
+
+    def __init__(self, version, functions, operators, converter, parser, tokenizer):
+        """
+        Constructor. Functions and operators must be already added to the tokenizer, the converter and the parser.
+
+        :param version:
+            Number of the version.
+
+        :param functions:
+            Mapping of functions by their names.
+
+        :param operators:
+            Mapping of operators by their names.
+
+        :param converter:
+            Converter of infix token sequence into postfix one.
+
+        :param parser:
+            Parser of infix token sequence into abstract syntax tree.
+
+        :param tokenizer:
+            Tokenizer of expression onto list of tokens.
+        """
+        self.version = version
+        self.functions = types.MappingProxyType(dict(functions))
+        self.operators = types.MappingProxyType(dict(operators))
+        self.converter = converter
+        self.parser = parser
+        self.tokenizer = tokenizer
+        self.fingerprint = Registry.__get_fingerprint(functions, operators)
+
+
+    @classmethod
+    def build(cls, version, functions, operators):
+        """
+        Build registry with new tokenizer, converter and parser for the functions and operators.
+
+        :param version:
+            Number of the version.
+
+        :param functions:
+            Mapping of functions by their names.
+
+        :param operators:
+            Mapping of operators by their names.
+
+        :returns:
+            New registry.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` if there is a collision between functions or operators names.
+        """
+        converter = Converter()
+        parser = Parser()
+        tokenizer = Tokenizer()
+
+        for name in functions:
+            tokenizer.add_function(name)
+
+        for name, operator in operators.items():
+            converter.add_operator(name, operator.priority)
+            parser.add_operator(name, operator.priority, operator.number_of_arguments)
+            tokenizer.add_operator(name)
+
+        return cls(version, functions, operators, converter, parser, tokenizer)
+
+
+    @staticmethod
+    def __get_fingerprint(functions, operators):
+        """
+        Get fingerprint of the library version and all functions and operators.
+
+        :param functions:
+            Mapping of functions by their names.
+
+        :param operators:
+            Mapping of operators by their names.
+
+        :returns:
+            Fingerprint as a string.
+        """
+        from . import __version__
+
+        description = [
+            __version__,
+            sorted(functions),
+            sorted([name, operator.priority] for name, operator in operators.items()),
+        ]
+        return hashlib.sha256(json.dumps(description).encode()).hexdigest()
@@ -1,7 +1,7 @@
+import re
 import string
 
-from .error import ExpressionError
-from .token_type import TokenType
+from .token_type import TokenType, ATOM
 from .token import Token
 
 
@@ -12,24 +12,31 @@ RIGHT_BRACKET = ')'
 QUOTE = '"'
 BACKSLASH = '\\'
 
+# Escaped quote inside a quoted atom.
+ESCAPED_QUOTE = BACKSLASH + QUOTE
+
 
 class Splitter:
     """
     Helper class to do initial splitting of an expression into tokens.
-
-    :param __inside_quotes:
-        Flag of "inside quotes" state. If set it means that current symbol belongs to an atom.
-
-    :param __current_token:
-        Currently parsing token value.
-
-    :param __tokens:
-        List of found tokens.
+    Splitter finds whole tokens by a regular expression and quoted atoms by searching for the closing quote,
+    so every token is sliced out of the expression at once.
 
     :param __type_by_value:
         External function to get token's type by its value.
     """
 
+    # Special symbol, quote or a sequence of other symbols except whitespaces.
+    TOKEN_REGEX = re.compile('[{0}]|{1}|[^{0}{1}{2}]+'.format(
+        re.escape(COMMA + LEFT_BRACKET + RIGHT_BRACKET), re.escape(QUOTE), re.escape(string.whitespace)))
+
+    # Types of special symbols.
+    SPECIAL_TYPES = {
+        COMMA: TokenType.COMMA,
+        LEFT_BRACKET: TokenType.LEFT_BRACKET,
+        RIGHT_BRACKET: TokenType.RIGHT_BRACKET,
+    }
+
     def __init__(self, type_by_value):
         """
         Constructor.
@@ -43,9 +50,6 @@ class Splitter:
         if not type_by_value:
             raise TypeError('External function to get token type by its value is None')
 
-        self.__inside_quotes = False
-        self.__current_token = ''
-        self.__tokens = []
         self.__type_by_value = type_by_value
 
 
@@ -58,149 +62,66 @@ class Splitter:
 
         :returns:
             List of all found tokens (as :class:`~s2e2.TokenType`).
-
-        :raises:
-            :class:`~s2e2.ExpressionError` if expression contains unknown symbol.
-        """
-        for symbol in expression:
-            self.__process_symbol(symbol)
-        self.__flush_token()
-        return self.__tokens
-
-
-    def __process_symbol(self, symbol):
         """
-        Process one symbol of the input expression.
+        tokens = []
+        search = Splitter.TOKEN_REGEX.search
+        position = 0
 
-        :param symbol:
-            Symbol of the expression.
+        while True:
+            match = search(expression, position)
+            if match is None:
+                return tokens
 
-        :raises:
-            :class:`~s2e2.ExpressionError` if symbol is unknown.
-        """
-        if symbol in (COMMA, LEFT_BRACKET, RIGHT_BRACKET):
-            self.__process_special_symbol(symbol)
-        elif symbol == QUOTE:
-            self.__process_quote_symbol(symbol)
-        else:
-            self.__process_common_symbol(symbol)
+            value = match.group()
+            start = match.start()
+            position = match.end()
 
+            if value == QUOTE:
+                value, position = Splitter.__find_quoted_atom(expression, position)
+                tokens.append(Token(ATOM, value, (start, min(position, len(expression)))))
+                continue
 
-    def __process_special_symbol(self, symbol):
-        """
-        Process one special symbol of the input expression.
-
-        :param symbol:
-            Special symbol of the expression.
-
-        :raises:
-            :class:`~s2e2.ExpressionError` if symbol is unknown.
-        """
-        if self.__inside_quotes:
-            self.__add_symbol_to_token(symbol)
-            return
-
-        self.__flush_token()
-
-        if symbol == COMMA:
-            self.__add_found_token(TokenType.COMMA, COMMA)
-        elif symbol == LEFT_BRACKET:
-            self.__add_found_token(TokenType.LEFT_BRACKET, LEFT_BRACKET)
-        elif symbol == RIGHT_BRACKET:
-            self.__add_found_token(TokenType.RIGHT_BRACKET, RIGHT_BRACKET)
-        else:
-            raise ExpressionError('Splitter: unexpected special symbol {}'.format(symbol))
-
-
-    def __process_quote_symbol(self, symbol):
-        """
-        Process one quote symbol of the input expression.
-
-        :param symbol:
-            Quote symbol of the expression.
-        """
-        if self.__inside_quotes and self.__is_escaped():
-            self.__add_symbol_to_token(symbol)
-            return
+            type = Splitter.SPECIAL_TYPES.get(value)
+            if type is not None:
+                tokens.append(Token(type, value, (start, position)))
+                continue
 
-        self.__flush_token()
-        self.__inside_quotes = not self.__inside_quotes
+            stripped = value.strip()
+            if stripped:
+                start += len(value) - len(value.lstrip())
+                tokens.append(Token(self.__type_by_value(stripped), stripped, (start, start + len(stripped))))
 
 
-    def __process_common_symbol(self, symbol):
+    @staticmethod
+    def __find_quoted_atom(expression, start):
         """
-        Process one common symbol of the input expression.
-
-        :param symbol:
-            Common symbol of the expression.
-        """
-        if self.__inside_quotes or symbol not in string.whitespace:
-            self.__add_symbol_to_token(symbol)
-        else:
-            self.__flush_token()
-
-
-    def __add_symbol_to_token(self, symbol):
-        """
-        Add symbol to currently parsed token.
-
-        :param symbol:
-            Symbol to add.
-        """
-        if symbol == QUOTE:
-            self.__current_token = self.__current_token[:-1] + symbol
-        else:
-            self.__current_token += symbol
-
-
-    def __flush_token(self):
-        """
-        Add current token if there is such to the list of found tokens.
-        """
-        if not self.__inside_quotes:
-            self.__current_token = self.__current_token.strip()
-
-        if self.__current_token or self.__inside_quotes:
-            type = self.__token_type_by_value(self.__current_token)
-            self.__add_found_token(type, self.__current_token)
-            self.__current_token = ''
-
-
-    def __add_found_token(self, type, value):
-        """
-        Add new token to the list of found tokens.
-
-        :param type:
-            Token's type.
-
-        :param value:
-            Token's value.
-        """
-        self.__tokens.append(Token(type, value))
+        Find quoted atom, i.e. everything up to the closing quote or up to the end of the expression.
+        A quote preceded by a backslash inside the atom is a part of the atom.
 
+        :param expression:
+            Input expression as a string.
 
-    def __is_escaped(self):
-        """
-        Check if current symbol is escaped, i.e. preceded by a backslash.
+        :param start:
+            Index of the symbol after the opening quote.
 
         :returns:
-            True is symbol is escaped, false otherwise.
+            Pair (value of the atom, index of the symbol after the closing quote).
         """
-        return len(self.__current_token) != 0 and \
-               self.__current_token[-1] == BACKSLASH
+        position = start
 
+        while True:
+            end = expression.find(QUOTE, position)
+            if end == -1:
+                end = len(expression)
+                break
 
-    def __token_type_by_value(self, value):
-        """
-        Get token type by its value and current state of the splitter.
+            if end == start or expression[end - 1] != BACKSLASH:
+                break
 
-        :param value:
-            Token's value.
+            position = end + 1
 
-        :returns:
-            Token's type.
-        """
-        if self.__inside_quotes:
-            return TokenType.ATOM
+        value = expression[start:end]
+        if ESCAPED_QUOTE in value:
+            value = value.replace(ESCAPED_QUOTE, QUOTE)
 
-        return self.__type_by_value(value)
+        return value, end + 1
@@ -0,0 +1,169 @@
+from .instructions import PUSH, LOAD, CALL, MEMO
+from .program_tree import ProgramTree
+
+
+class SubexpressionEliminator:
+    """
+    Class finds structurally identical subprograms built of pure functions and operators
+    and replaces them with MEMO instructions, so every such subprogram is evaluated once
+    per evaluation and its value is reused.
+    """
+
+    @staticmethod
+    def eliminate(program):
+        """
+        Eliminate common subexpressions of the program.
+
+        :param program:
+            Sequence of PUSH, LOAD and CALL instructions.
+
+        :returns:
+            Pair (new program as a list of instructions, number of merged subprograms).
+        """
+        tree = ProgramTree.build(program)
+        if tree is None:
+            # invalid program, let it fail during evaluation
+            return list(program), 0
+
+        keys, pure = SubexpressionEliminator.__describe(tree)
+
+        total = {}
+        for key in keys:
+            total[key] = total.get(key, 0) + 1
+
+        # only CALL instructions are worth memorizing, PUSH is cheap enough
+        candidates = set(key for index, key in enumerate(keys)
+                         if pure[index] and tree.program[index][0] == CALL and total[key] > 1)
+        if not candidates:
+            return list(program), 0
+
+        occurrences = SubexpressionEliminator.__count(tree, keys, candidates)
+        merged = set(key for key in candidates if occurrences.get(key, 0) > 1)
+        if not merged:
+            return list(program), 0
+
+        result = SubexpressionEliminator.__rebuild(tree, keys, merged)
+
+        return result, sum(occurrences[key] - 1 for key in merged)
+
+
+    @staticmethod
+    def __describe(tree):
+        """
+        Get structural key and purity flag of every subprogram.
+
+        :param tree:
+            Tree view of the program.
+
+        :returns:
+            Pair (list of keys, list of purity flags), keys of identical subprograms are equal.
+        """
+        ids = {}
+        keys = []
+        pure = []
+
+        for index, (code, operand) in enumerate(tree.program):
+            arguments = tree.children[index]
+
+            if code == PUSH:
+                try:
+                    instruction = (code, type(operand), operand)
+                    hash(instruction)
+                except TypeError:
+                    instruction = (code, id(operand))
+                is_pure = True
+            elif code == LOAD:
+                instruction = (code, operand)
+                is_pure = True
+            else:
+                instruction = (code, id(operand))
+                is_pure = operand.pure and all(pure[argument] for argument in arguments)
+
+            key = ids.setdefault((instruction, tuple(keys[argument] for argument in arguments)), len(ids))
+            keys.append(key)
+            pure.append(is_pure)
+
+        return keys, pure
+
+
+    @staticmethod
+    def __count(tree, keys, candidates):
+        """
+        Count occurrences of candidate subprograms which are left after merging.
+        Content of the second and further occurrences of a candidate is not visited.
+
+        :param tree:
+            Tree view of the program.
+
+        :param keys:
+            Structural keys of all subprograms.
+
+        :param candidates:
+            Keys of subprograms which can be merged.
+
+        :returns:
+            Dictionary of numbers of occurrences by keys.
+        """
+        occurrences = {}
+        pending = [tree.root]
+
+        while pending:
+            index = pending.pop()
+            key = keys[index]
+
+            if key in candidates:
+                occurrences[key] = occurrences.get(key, 0) + 1
+                if occurrences[key] > 1:
+                    continue
+
+            pending.extend(tree.children[index])
+
+        return occurrences
+
+
+    @staticmethod
+    def __rebuild(tree, keys, merged):
+        """
+        Build new program with merged subprograms replaced by MEMO instructions.
+
+        :param tree:
+            Tree view of the program.
+
+        :param keys:
+            Structural keys of all subprograms.
+
+        :param merged:
+            Keys of subprograms to merge.
+
+        :returns:
+            List of instructions.
+        """
+        result = []
+        slots = {}
+
+        # every item is a triple (index, output list of the parent, output list of the instruction),
+        # the last one is None until arguments of the instruction are scheduled
+        pending = [(tree.root, result, None)]
+
+        while pending:
+            index, parent_output, output = pending.pop()
+            key = keys[index]
+
+            if output is None:
+                if key in slots:
+                    parent_output.append((MEMO, slots[key]))
+                    continue
+
+                output = [] if key in merged else parent_output
+                pending.append((index, parent_output, output))
+                for argument in reversed(tree.children[index]):
+                    pending.append((argument, output, None))
+                continue
+
+            output.append(tree.program[index])
+
+            if key in merged:
+                slots[key] = (len(slots), tuple(output))
+                parent_output.append((MEMO, slots[key]))
+
+        return result
@@ -0,0 +1,287 @@
+import collections
+import concurrent.futures
+import contextvars
+import os
+import threading
+import time
+
+from .error import ExpressionError
+
+
+# Statistics of a thread pool of a threaded evaluator.
+PoolStatistics = collections.namedtuple('PoolStatistics', 'workers queue_depth busy_workers completed failed utilization')
+
+
+class ThreadedEvaluator:
+    """
+    Class evaluates expressions concurrently on a bounded pool of threads.
+    It is useful when custom functions do blocking work, e.g. read files or call local services,
+    so such calls of different expressions overlap.
+
+    :param __evaluator:
+        Evaluator of all expressions, it is shared by all threads.
+
+    :param __workers:
+        Number of threads.
+
+    :param __executor:
+        Pool of threads.
+
+    :param __slots:
+        Semaphore limiting number of submitted but not finished evaluations.
+
+    :param __lock:
+        Lock of statistics counters.
+
+    :param __queued:
+        Number of submitted but not started evaluations.
+
+    :param __running:
+        Number of running evaluations.
+
+    :param __completed:
+        Number of finished evaluations.
+
+    :param __failed:
+        Number of evaluations finished with an exception.
+
+    :param __busy_time:
+        Total time of all finished evaluations in seconds.
+
+    :param __start_time:
+        Creation time of the pool.
+    """
+
+    # Default number of threads.
+    DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+    # Default number of queued evaluations per thread.
+    DEFAULT_QUEUE_FACTOR = 4
+
+    def __init__(self, evaluator, workers=DEFAULT_WORKERS, max_queue_size=None):
+        """
+        Constructor.
+
+        :param evaluator:
+            :class:`~s2e2.Evaluator` with all needed functions and operators.
+
+        :param workers:
+            Number of threads.
+
+        :param max_queue_size:
+            Maximum number of evaluations waiting for a free thread, submitting more blocks.
+            By default it is DEFAULT_QUEUE_FACTOR evaluations per thread.
+
+        :raises:
+            :class:`~TypeError` if evaluator is empty.
+            :class:`~ValueError` if number of threads is not positive or queue size is negative.
+        """
+        if not evaluator:
+            raise TypeError('Attempt to create ThreadedEvaluator without an evaluator')
+
+        if max_queue_size is None:
+            max_queue_size = ThreadedEvaluator.DEFAULT_QUEUE_FACTOR * workers
+
+        if workers < 1 or max_queue_size < 0:
+            raise ValueError('ThreadedEvaluator needs at least one thread and non-negative queue size')
+
+        self.__evaluator = evaluator
+        self.__workers = workers
+        self.__executor = concurrent.futures.ThreadPoolExecutor(workers)
+        self.__slots = threading.BoundedSemaphore(workers + max_queue_size)
+        self.__lock = threading.Lock()
+        self.__queued = 0
+        self.__running = 0
+        self.__completed = 0
+        self.__failed = 0
+        self.__busy_time = 0.0
+        self.__start_time = time.monotonic()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def submit(self, expression, bindings=None):
+        """
+        Submit evaluation of the expression. Blocks while the queue is full.
+
+        :param expression:
+            Input expression.
+
+        :param bindings:
+            Mapping of values of the expression's variables by their names.
+
+        :returns:
+            :class:`~concurrent.futures.Future` of the value of the expression.
+        """
+        return self.__submit(self.__evaluator.evaluate, expression, bindings)
+
+
+    def evaluate_many(self, expressions, bindings=None, return_exceptions=False):
+        """
+        Evaluate all the expressions concurrently as a batch, see :meth:`~s2e2.Evaluator.batch`.
+        Every distinct expression is compiled once, and if it is pure within the batch, also evaluated once.
+
+        :param expressions:
+            Iterable of input expressions.
+
+        :param bindings:
+            Mapping of values of the expressions' variables by their names, the same for all expressions.
+
+        :param return_exceptions:
+            If set, an exception of an expression is returned in place of its value instead of being raised.
+
+        :returns:
+            List of values of the expressions in the same order.
+
+        :raises:
+            :class:`~TypeError` if some expression is empty.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression or an undefined variable.
+            Both only if return_exceptions is not set.
+        """
+        compiled_expressions = {}
+        pure_futures = {}
+        futures = []
+
+        with self.__evaluator.batch():
+            for expression in expressions:
+                if expression in pure_futures:
+                    futures.append(pure_futures[expression])
+                    continue
+
+                compiled = compiled_expressions.get(expression)
+                if compiled is None:
+                    try:
+                        compiled = self.__evaluator.compile(expression)
+                    except (ExpressionError, TypeError) as error:
+                        futures.append(ThreadedEvaluator.__failed_future(error))
+                        continue
+                    compiled_expressions[expression] = compiled
+
+                # every evaluation runs in a copy of the context of the batch, so it reads the clock of the batch
+                future = self.__submit(contextvars.copy_context().run, compiled.evaluate, bindings)
+                if compiled.is_pure_in_batch:
+                    pure_futures[expression] = future
+                futures.append(future)
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                results.append(error)
+
+        return results
+
+
+    def get_statistics(self):
+        """
+        Get statistics of the pool of threads.
+
+        :returns:
+            Statistics as a :class:`~s2e2.threaded_evaluator.PoolStatistics`,
+            utilization is the share of time threads were busy since creation of the pool.
+        """
+        with self.__lock:
+            elapsed = time.monotonic() - self.__start_time
+            utilization = self.__busy_time / (elapsed * self.__workers) if elapsed > 0 else 0.0
+
+            return PoolStatistics(self.__workers,
+                                  self.__queued,
+                                  self.__running,
+                                  self.__completed,
+                                  self.__failed,
+                                  min(utilization, 1.0))
+
+
+    def close(self, wait=True):
+        """
+        Stop the pool of threads.
+
+        :param wait:
+            Flag to wait for all submitted evaluations.
+        """
+        self.__executor.shutdown(wait=wait)
+
+
+    def __submit(self, function, *arguments):
+        """
+        Submit the function into the pool. Blocks while the queue is full.
+
+        :param function:
+            Evaluating function.
+
+        :param arguments:
+            Arguments of the function.
+
+        :returns:
+            :class:`~concurrent.futures.Future` of the result of the function.
+        """
+        self.__slots.acquire()
+
+        with self.__lock:
+            self.__queued += 1
+
+        try:
+            return self.__executor.submit(self.__run, function, *arguments)
+        except BaseException:
+            with self.__lock:
+                self.__queued -= 1
+            self.__slots.release()
+            raise
+
+
+    def __run(self, function, *arguments):
+        """
+        Run the function in a thread of the pool collecting statistics.
+
+        :param function:
+            Evaluating function.
+
+        :param arguments:
+            Arguments of the function.
+
+        :returns:
+            Result of the function.
+        """
+        with self.__lock:
+            self.__queued -= 1
+            self.__running += 1
+
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = function(*arguments)
+            failed = False
+            return result
+        finally:
+            busy_time = time.perf_counter() - start
+            with self.__lock:
+                self.__running -= 1
+                self.__completed += 1
+                self.__failed += failed
+                self.__busy_time += busy_time
+            self.__slots.release()
+
+
+    @staticmethod
+    def __failed_future(error):
+        """
+        Make a finished future with the exception.
+
+        :param error:
+            Exception.
+
+        :returns:
+            :class:`~concurrent.futures.Future`.
+        """
+        future = concurrent.futures.Future()
+        future.set_exception(error)
+        return future
@@ -7,9 +7,15 @@ class Token:
 
     :param value:
         String value of the token.
+
+    :param span:
+        Pair (start, end) of indices of the token in the source expression, None if unknown.
     """
 
-    def __init__(self, type, value):
+    # Tokens are kept in plans of parsed expressions, so they have no per-instance dictionary.
+    __slots__ = ('type', 'value', 'span')
+
+    def __init__(self, type, value, span=None):
         """
         Constructor.
 
@@ -18,14 +24,18 @@ class Token:
 
         :param value:
             String value of the token.
+
+        :param span:
+            Pair (start, end) of indices of the token in the source expression, None if unknown.
         """
         self.type = type
         self.value = value
+        self.span = span
 
 
     def __eq__(self, another):
         """
-        Compare token with another one.
+        Compare token with another one, spans are not compared.
 
         :param another:
             Another token of a :class:`~s2e2.Token`.
@@ -19,4 +19,18 @@ class TokenType(enum.Enum):
 
     RIGHT_BRACKET = 'Right, closed round bracket.'
 
+    VARIABLE = 'Named input of an expression, its value is provided on evaluation.'
+
     OPERATOR = 'Infix operator. Unlike functions does not use brackets, can have arguments both before and after itself.'
+
+
+# Token types as module constants. Reading them is much faster than reading members of the enum class,
+# so they are used by hot loops of the tokenizer, the converter and the evaluator.
+ATOM = TokenType.ATOM
+COMMA = TokenType.COMMA
+FUNCTION = TokenType.FUNCTION
+EXPRESSION = TokenType.EXPRESSION
+LEFT_BRACKET = TokenType.LEFT_BRACKET
+RIGHT_BRACKET = TokenType.RIGHT_BRACKET
+VARIABLE = TokenType.VARIABLE
+OPERATOR = TokenType.OPERATOR
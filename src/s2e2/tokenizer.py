@@ -1,9 +1,8 @@
-import collections
-import functools
+import re
 
 from .error import ExpressionError
 from .splitter import Splitter
-from .token_type import TokenType
+from .token_type import ATOM, EXPRESSION, FUNCTION, OPERATOR, VARIABLE
 from .token import Token
 
 
@@ -17,17 +16,27 @@ class Tokenizer:
     :param __operators:
         Set of expected operators.
 
-    :param __operators_by_length:
-        Operators sorted by their lengthes (for instance: 1 -> !, +; 2 -> ||, &&)
+    :param __operators_regex:
+        Regular expression matching any expected operator, longer operators go first,
+        so the leftmost longest operator is matched, e.g. A!==B is split into A, !=, =B.
+        None if there are no operators.
+
+    :param __splitter:
+        Splitter of expressions into raw tokens, it keeps no state between calls.
     """
 
+    # Variables are written as ${name}.
+    VARIABLE_PREFIX = '${'
+    VARIABLE_SUFFIX = '}'
+
     def __init__(self):
         """
         Default constructor.
         """
         self.__functions = set()
         self.__operators = set()
-        self.__operators_by_length = collections.OrderedDict()
+        self.__operators_regex = None
+        self.__splitter = Splitter(self.__token_type_by_value)
 
 
     def add_function(self, function):
@@ -56,12 +65,14 @@ class Tokenizer:
         """
         self.__check_uniqueness(operator)
         self.__operators.add(operator)
-        self.__operators_by_length.setdefault(len(operator), set()).add(operator)
+        self.__operators_regex = re.compile('|'.join(
+            re.escape(name) for name in sorted(self.__operators, key=lambda name: (-len(name), name))))
 
 
     def tokenize(self, expression):
         """
         Split expression into tokens.
+        Unquoted ${name} becomes a VARIABLE token with value name.
 
         :param expression:
             Input string expression.
@@ -72,11 +83,10 @@ class Tokenizer:
         :raises:
             :class:`~s2e2.ExpressionError` if expression contains unknown symbols.
         """
-        splitter = Splitter(functools.partial(Tokenizer.__token_type_by_value, self))
-        raw_tokens = splitter.split_into_tokens(expression)
+        raw_tokens = self.__splitter.split_into_tokens(expression)
 
         refined_tokens = self.__split_tokens_by_operators(raw_tokens)
-        Tokenizer.__convert_expressions_into_atoms(refined_tokens)
+        Tokenizer.__convert_expressions_into_atoms_and_variables(refined_tokens)
         return refined_tokens
 
 
@@ -112,17 +122,18 @@ class Tokenizer:
             Token's type.
         """
         if  value in self.__operators:
-            return TokenType.OPERATOR
+            return OPERATOR
 
         if value in self.__functions:
-            return TokenType.FUNCTION
+            return FUNCTION
 
-        return TokenType.EXPRESSION
+        return EXPRESSION
 
 
     def __split_tokens_by_operators(self, tokens):
         """
-        Split all tokens by all expected operatos.
+        Split all tokens by all expected operators in one left-to-right pass,
+        at every position the longest operator is taken.
         This is required since there can be no spaces between operator and its operands.
 
         :param tokens:
@@ -131,82 +142,71 @@ class Tokenizer:
         :returns:
             List of splitted tokens.
         """
-        result = tokens
-
-        for _, operators_of_the_same_length in self.__operators_by_length.items():
-            for operator in operators_of_the_same_length:
-                result = self.__split_tokens_by_single_operator(result, operator)
-
-        return result
-
-
-    def __split_tokens_by_single_operator(self, tokens, operator):
-        """
-        Split all tokens by one operator.
-
-        :param tokens:
-            List of tokens.
-
-        :param operator:
-            Operator to split tokens by.
+        if self.__operators_regex is None:
+            return tokens
 
-        :returns:
-            List of splitted tokens.
-        """
+        finditer = self.__operators_regex.finditer
         result = []
 
         for token in tokens:
-            if token.type == TokenType.EXPRESSION:
-                result.extend(self.__split_single_token_by_single_operator(token.value, operator))
-            else:
+            if token.type is not EXPRESSION:
                 result.append(token)
+                continue
 
-        return result
-
-
-    def __split_single_token_by_single_operator(self, token, operator):
-        """
-        Split one token by one operator.
+            value = token.value
+            offset = token.span[0] if token.span else None
+            start = 0
 
-        :param token:
-            Token to split.
-
-        :param operator:
-            Operator's name.
+            for match in finditer(value):
+                end = match.start()
+                if end != start:
+                    operand = value[start:end]
+                    span = None if offset is None else (offset + start, offset + end)
+                    result.append(Token(self.__token_type_by_value(operand), operand, span))
 
-        :returns:
-            List of splitted tokens.
-        """
-        result = []
+                start = match.end()
+                span = None if offset is None else (offset + end, offset + start)
+                result.append(Token(OPERATOR, match.group(), span))
 
-        start = 0
-        while start < len(token):
-            end = token.find(operator, start)
-            if end == -1:
-                value = token[start:]
-                type = self.__token_type_by_value(value)
-                result.append(Token(type, value))
-                break
-            else:
-                if end != start:
-                    value = token[start : end]
-                    type = self.__token_type_by_value(value)
-                    result.append(Token(type, value))
-                value = token[end : end + len(operator)]
-                result.append(Token(TokenType.OPERATOR, value))
-                start = end + len(operator)
+            if start == 0:
+                result.append(token)
+            elif start < len(value):
+                operand = value[start:]
+                span = None if offset is None else (offset + start, offset + len(value))
+                result.append(Token(self.__token_type_by_value(operand), operand, span))
 
         return result
 
 
     @staticmethod
-    def __convert_expressions_into_atoms(tokens):
+    def __convert_expressions_into_atoms_and_variables(tokens):
         """
-        Replace all EXPRESSION tokens with ATOM ones with the same value.
+        Replace all EXPRESSION tokens like ${name} with VARIABLE ones with value name,
+        and all other EXPRESSION tokens with ATOM ones with the same value.
 
         :param tokens:
             List of tokens.
         """
         for token in tokens:
-            if token.type == TokenType.EXPRESSION:
-                token.type = TokenType.ATOM
+            if token.type is EXPRESSION:
+                if Tokenizer.__is_variable(token.value):
+                    token.type = VARIABLE
+                    token.value = token.value[len(Tokenizer.VARIABLE_PREFIX) : -len(Tokenizer.VARIABLE_SUFFIX)]
+                else:
+                    token.type = ATOM
+
+
+    @staticmethod
+    def __is_variable(value):
+        """
+        Check if value of a token is a variable.
+
+        :param value:
+            Token's value.
+
+        :returns:
+            True if value is ${name}, False otherwise.
+        """
+        return len(value) > len(Tokenizer.VARIABLE_PREFIX) + len(Tokenizer.VARIABLE_SUFFIX) and \
+               value.startswith(Tokenizer.VARIABLE_PREFIX) and \
+               value.endswith(Tokenizer.VARIABLE_SUFFIX)
@@ -0,0 +1,347 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import clock as clocks
+from .error import ExpressionError
+from .instructions import PUSH, LOAD, CALL, MEMO
+
+
+class VectorizedEngine:
+    """
+    Class evaluates compiled expressions for whole columns of values of variables at once.
+    Values are kept in NumPy arrays, functions and operators process all rows by a single call,
+    see :meth:`~s2e2.functions.Function.call_vectorized`. All arguments of every function
+    and operator are evaluated for all rows, even in lazy evaluation mode.
+
+    Requires NumPy.
+    """
+
+    # Expected stack size after processing all instructions.
+    FINAL_STACK_SIZE = 1
+
+    # Kinds of NumPy types which are compared with each other as Python numbers.
+    NUMERIC_KINDS = frozenset('biuf')
+
+    @staticmethod
+    def evaluate(compiled_expression, columns):
+        """
+        Evaluate the compiled expression for every row of the columns.
+
+        :param compiled_expression:
+            Expression as a :class:`~s2e2.CompiledExpression`.
+
+        :param columns:
+            Mapping of one-dimensional arrays of values of the expression's variables by their names.
+            All arrays must have the same length, which is the number of rows.
+
+        :returns:
+            NumPy array of objects: value of the expression for every row as a string
+            or None if the result is NULL.
+
+        :raises:
+            :class:`~ImportError` if NumPy is not installed.
+            :class:`~ValueError` if columns are not one-dimensional or have different lengths.
+            :class:`~s2e2.ExpressionError` in case of an invalid expression, an undefined variable
+            or an expression with asynchronous functions or operators.
+        """
+        if numpy is None:
+            raise ImportError('NumPy is required for vectorized evaluation')
+
+        if compiled_expression.is_async:
+            raise ExpressionError('Expression with asynchronous functions cannot be evaluated by vectorized engine')
+
+        arrays = {name: numpy.asarray(column) for name, column in columns.items()}
+        size = VectorizedEngine.__get_size(arrays)
+
+        undefined = [name for name in compiled_expression.variables if name not in arrays]
+        if undefined:
+            raise ExpressionError('Undefined variable {}'.format(min(undefined)))
+
+        stack = []
+        with clocks.scope(compiled_expression.clock):
+            VectorizedEngine.__run(compiled_expression.program, stack, arrays, {})
+
+        if len(stack) != VectorizedEngine.FINAL_STACK_SIZE:
+            raise ExpressionError('Invalid expression')
+
+        return VectorizedEngine.__to_strings(stack.pop(), size)
+
+
+    @staticmethod
+    def to_objects(column):
+        """
+        Convert column into array of Python objects, datetime64 values become datetime.datetime ones.
+
+        :param column:
+            Array or scalar.
+
+        :returns:
+            NumPy array of objects.
+        """
+        array = numpy.asarray(column)
+
+        if array.dtype.kind == 'O':
+            return array
+
+        if array.dtype.kind == 'M':
+            array = array.astype('datetime64[us]')
+
+        return array.astype(object)
+
+
+    @staticmethod
+    def to_booleans(column):
+        """
+        Convert column of boolean values into array of booleans.
+
+        :param column:
+            Array or scalar.
+
+        :returns:
+            NumPy array of booleans or None if some value of the column is not boolean.
+        """
+        array = numpy.asarray(column)
+
+        if array.dtype.kind == 'b':
+            return array
+
+        if array.dtype.kind == 'O' and all(isinstance(value, bool) for value in array.flat):
+            return array.astype(bool)
+
+        return None
+
+
+    @staticmethod
+    def to_empty(column):
+        """
+        Find empty values of the column, i.e. NULL, empty strings, zeros and False.
+
+        :param column:
+            Array or scalar.
+
+        :returns:
+            NumPy array of booleans, True for every empty value.
+        """
+        array = numpy.asarray(column)
+
+        if array.dtype.kind in VectorizedEngine.NUMERIC_KINDS:
+            return array == 0
+
+        if array.dtype.kind in 'SU':
+            return array == array.dtype.type()
+
+        objects = VectorizedEngine.to_objects(array)
+        return numpy.asarray(numpy.frompyfunc(lambda value: not value, 1, 1)(objects), dtype=bool)
+
+
+    @staticmethod
+    def compare_or_empty(comparison, *columns):
+        """
+        Compare values of two columns row by row, rows where both values are empty are not compared
+        and give True, the same way as operators >= and <= do for scalars.
+
+        :param comparison:
+            NumPy comparison function, e.g. :func:`numpy.greater_equal`.
+
+        :param columns:
+            Two arrays or scalars.
+
+        :returns:
+            NumPy array of booleans.
+
+        :raises:
+            :class:`~TypeError` if some non-empty values can not be compared.
+        """
+        left, right = numpy.broadcast_arrays(*VectorizedEngine.unify(*columns))
+        compared = ~(VectorizedEngine.to_empty(left) & VectorizedEngine.to_empty(right))
+
+        if compared.all():
+            return numpy.asarray(comparison(left, right), dtype=bool)
+
+        result = numpy.ones(compared.shape, dtype=bool)
+        result[compared] = comparison(left[compared], right[compared])
+        return result
+
+
+    @staticmethod
+    def unify(*columns):
+        """
+        Bring columns to types which NumPy operations handle the same way as Python ones.
+        Columns of the same kind (e.g. strings or datetimes) and numeric columns are kept as is,
+        otherwise all of them are converted into arrays of Python objects.
+
+        :param columns:
+            Arrays or scalars.
+
+        :returns:
+            List of arrays.
+        """
+        arrays = [numpy.asarray(column) for column in columns]
+        kinds = set(array.dtype.kind for array in arrays)
+
+        if len(kinds) == 1 or kinds.issubset(VectorizedEngine.NUMERIC_KINDS):
+            return arrays
+
+        return [VectorizedEngine.to_objects(array) for array in arrays]
+
+
+    @staticmethod
+    def call_per_row(entity, columns):
+        """
+        Call function or operator for every row of the columns.
+        If all columns are scalars, the function or operator is called once.
+
+        :param entity:
+            Function or operator.
+
+        :param columns:
+            Tuple of arrays or scalars.
+
+        :returns:
+            Array of results or a single result.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of wrong types of arguments.
+        """
+        if all(numpy.ndim(column) == 0 for column in columns):
+            return entity.call(*(VectorizedEngine.to_objects(column).item() for column in columns))
+
+        objects = [VectorizedEngine.to_objects(column) for column in columns]
+        return numpy.frompyfunc(entity.call, len(objects), 1)(*objects)
+
+
+    @staticmethod
+    def __run(program, stack, columns, memo):
+        """
+        Run the (sub)program for all rows.
+
+        :param program:
+            Sequence of instructions.
+
+        :param stack:
+            Stack of intermediate columns.
+
+        :param columns:
+            Arrays of values of variables by their names.
+
+        :param memo:
+            Values of MEMO subprograms by their slots.
+
+        :raises:
+            :class:`~s2e2.ExpressionError` in case of an invalid expression.
+        """
+        for code, operand in program:
+            if code == PUSH:
+                stack.append(operand)
+
+            elif code == LOAD:
+                stack.append(columns[operand])
+
+            elif code == MEMO:
+                slot, subprogram = operand
+                if slot not in memo:
+                    VectorizedEngine.__run(subprogram, stack, columns, memo)
+                    memo[slot] = stack.pop()
+                stack.append(memo[slot])
+
+            else:
+                if code == CALL:
+                    entity = operand
+                    number_of_arguments = entity.number_of_arguments
+                    if len(stack) < number_of_arguments:
+                        raise ExpressionError('Invalid expression')
+
+                    arguments = stack[len(stack) - number_of_arguments:]
+                    del stack[len(stack) - number_of_arguments:]
+                else:
+                    entity, subprograms = operand
+                    arguments = [VectorizedEngine.__run_argument(subprogram, columns, memo)
+                                 for subprogram in subprograms]
+
+                stack.append(entity.call_vectorized(*arguments))
+
+
+    @staticmethod
+    def __run_argument(program, columns, memo):
+        """
+        Run subprogram of an argument of a lazy function or operator.
+
+        :param program:
+            Sequence of instructions computing exactly one value.
+
+        :param columns:
+            Arrays of values of variables by their names.
+
+        :param memo:
+            Values of MEMO subprograms by their slots.
+
+        :returns:
+            Column of the argument.
+        """
+        stack = []
+        VectorizedEngine.__run(program, stack, columns, memo)
+        return stack.pop()
+
+
+    @staticmethod
+    def __get_size(columns):
+        """
+        Get number of rows of the columns.
+
+        :param columns:
+            Arrays by names.
+
+        :returns:
+            Number of rows, 1 if there are no columns.
+
+        :raises:
+            :class:`~ValueError` if columns are not one-dimensional or have different lengths.
+        """
+        sizes = set()
+        for name, column in columns.items():
+            if column.ndim != 1:
+                raise ValueError('Column {} is not one-dimensional'.format(name))
+            sizes.add(len(column))
+
+        if len(sizes) > 1:
+            raise ValueError('Columns have different lengths')
+
+        return sizes.pop() if sizes else 1
+
+
+    @staticmethod
+    def __to_strings(column, size):
+        """
+        Convert column of results into strings, the same way as :meth:`~s2e2.CompiledExpression.evaluate` does.
+
+        :param column:
+            Array or scalar.
+
+        :param size:
+            Number of rows.
+
+        :returns:
+            NumPy array of strings and Nones.
+        """
+        array = numpy.asarray(column)
+
+        if array.dtype.kind == 'M':
+            seconds = array.astype('datetime64[s]')
+            if numpy.all(seconds == array.astype('datetime64[us]')):
+                # the same as str(datetime.datetime) without microseconds
+                array = numpy.char.replace(numpy.datetime_as_string(seconds), 'T', ' ')
+
+        if array.dtype.kind == 'b':
+            result = numpy.where(array, 'True', None)
+
+        elif array.dtype.kind == 'U':
+            result = array.astype(object)
+            result[array == ''] = None
+
+        else:
+            result = numpy.frompyfunc(lambda value: str(value) if value else None, 1, 1)(
+                VectorizedEngine.to_objects(array))
+
+        return numpy.broadcast_to(result, (size,)).astype(object)
@@ -106,3 +106,18 @@ class TestFunctionAddDays:
         with pytest.raises(ExpressionError) as ex:
             self.function.invoke(stack)
         assert 'Invalid arguments' in str(ex.value)
+
+
+    def test_positive_call_vectorized_result_value(self):
+        numpy = pytest.importorskip('numpy')
+        dates = numpy.array(['2020-01-01', '2020-02-28'], dtype='datetime64[D]')
+        result = self.function.call_vectorized(dates, numpy.array(['1', '2']))
+        assert list(result) == list(numpy.array(['2020-01-02', '2020-03-01'], dtype='datetime64[D]'))
+
+
+    def test_negative_call_vectorized_second_argument_wrong_type(self):
+        numpy = pytest.importorskip('numpy')
+        dates = numpy.array(['2020-01-01'], dtype='datetime64[D]')
+        with pytest.raises(ExpressionError) as ex:
+            self.function.call_vectorized(dates, numpy.array(['A']))
+        assert 'Invalid arguments' in str(ex.value)
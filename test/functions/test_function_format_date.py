@@ -1,8 +1,10 @@
 from s2e2.error import ExpressionError
-from s2e2.functions.function_format_date import FunctionFormatDate
+from s2e2.functions.function_format_date import DateFormatter, FunctionFormatDate, FunctionFormatDateCompiled
 
 import datetime
+import pickle
 import pytest
+import random
 
 
 class TestFunctionFormatDate:
@@ -46,6 +48,45 @@ class TestFunctionFormatDate:
         assert len(stack) == 2
 
 
+    @pytest.mark.parametrize('format', sorted(DateFormatter.ISO_FORMATS))
+    def test_positive_iso_format_same_as_strftime(self, format):
+        for value in (datetime.datetime(2019, 7, 13, 12, 15, 0, 0),
+                      datetime.datetime(2019, 7, 13, 12, 15, 0, 42),
+                      datetime.datetime(2019, 7, 13, 12, 15, 0, 42, datetime.timezone.utc),
+                      datetime.datetime(999, 1, 2, 3, 4, 5)):
+            assert self.function.call(value, format) == value.strftime(format)
+
+
+    def test_positive_random_format_same_as_strftime(self):
+        generator = random.Random(11)
+        parts = ['%Y', '%m', '%d', '%H', '%M', '%S', '%f', '%%', '%a', '%j', '%', '-', ':', 'T', ' ', '{}', 'x']
+
+        for _ in range(2000):
+            format = ''.join(generator.choice(parts) for _ in range(generator.randint(0, 6)))
+            value = datetime.datetime(generator.choice([1, 99, 999, 1000, 2019, 9999]),
+                                      generator.randint(1, 12), generator.randint(1, 28),
+                                      generator.randint(0, 23), generator.randint(0, 59), generator.randint(0, 59),
+                                      generator.choice([0, 7, 999999]))
+
+            assert DateFormatter(format)(value) == value.strftime(format)
+
+
+    def test_positive_specialize_constant_format(self):
+        function = FunctionFormatDate()
+        specialized = function.specialize({1: '%Y-%m-%d'})
+
+        assert isinstance(specialized, FunctionFormatDateCompiled)
+        assert specialized.call(datetime.datetime(2019, 7, 13), '%Y-%m-%d') == '2019-07-13'
+        # the same format gets the same specialized function
+        assert function.specialize({1: '%Y-%m-%d'}) is specialized
+        assert function.specialize({0: '%Y-%m-%d'}) is None
+
+
+    def test_positive_pickled_function_result_value(self):
+        copy = pickle.loads(pickle.dumps(FunctionFormatDate(cache_size=3)))
+        assert copy.call(datetime.datetime(2019, 7, 13), '%d.%m.%Y') == '13.07.2019'
+
+
     def test_negative_fewer_arguments(self):
         stack = [datetime.datetime.utcnow()]
         with pytest.raises(ExpressionError) as ex:
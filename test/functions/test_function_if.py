@@ -75,3 +75,23 @@ class TestFunctionIf:
         with pytest.raises(ExpressionError) as ex:
             self.function.invoke(stack)
         assert 'Invalid arguments' in str(ex.value)
+
+
+    def test_positive_call_result_value(self):
+        assert self.function.call(True, 'A', 'B') == 'A'
+
+
+    def test_negative_call_wrong_number_of_arguments(self):
+        with pytest.raises(ExpressionError) as ex:
+            self.function.call(True, 'A')
+        assert 'Wrong number of arguments' in str(ex.value)
+
+
+    def test_positive_call_lazily_result_value(self):
+        assert self.function.call_lazily(lambda: False, lambda: 1 / 0, lambda: 'B') == 'B'
+
+
+    def test_negative_call_lazily_condition_wrong_type(self):
+        with pytest.raises(ExpressionError) as ex:
+            self.function.call_lazily(lambda: 'True', lambda: 'A', lambda: 'B')
+        assert 'Invalid arguments' in str(ex.value)
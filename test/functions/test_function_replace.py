@@ -1,7 +1,10 @@
 from s2e2.error import ExpressionError
-from s2e2.functions.function_replace import FunctionReplace
+from s2e2.functions.function_replace import FunctionReplace, FunctionReplaceCompiled
 
+import pickle
 import pytest
+import random
+import re
 
 
 class TestFunctionReplace:
@@ -68,6 +71,84 @@ class TestFunctionReplace:
         assert len(stack) == 2
 
 
+    def test_positive_pattern_cache_statistics(self):
+        function = FunctionReplace()
+        function.call('ABA', 'A', 'B')
+        function.call('ACA', 'A', 'C')
+        function.call('ABA', 'B', 'C')
+
+        statistics = function.get_pattern_statistics()
+        assert (statistics.hits, statistics.misses, statistics.entries) == (1, 2, 2)
+        assert statistics.hit_rate == pytest.approx(1 / 3)
+        assert statistics.compile_time >= 0.0
+
+
+    def test_positive_pattern_cache_size(self):
+        function = FunctionReplace(cache_size=2)
+        for regex in ('A', 'B', 'C', 'A'):
+            function.call('ABC', regex, 'D')
+
+        statistics = function.get_pattern_statistics()
+        assert statistics.entries == 2
+        assert statistics.hits == 0
+
+
+    def test_positive_specialize_constant_regex(self):
+        function = FunctionReplace()
+        specialized = function.specialize({1: 'A.*?C', 2: 'D'})
+
+        assert isinstance(specialized, FunctionReplaceCompiled)
+        assert specialized.pattern.pattern == 'A.*?C'
+        assert specialized.call('ABCABA', 'A.*?C', 'D') == 'DABA'
+        assert specialized.call(None, 'A.*?C', 'D') is None
+        # the same regex gets the same specialized function
+        assert function.specialize({1: 'A.*?C'}) is specialized
+
+
+    def test_positive_specialize_not_constant_regex(self):
+        function = FunctionReplace()
+        assert function.specialize({0: 'ABA', 2: 'D'}) is None
+        assert function.specialize({1: ''}) is None
+        assert function.specialize({1: '('}) is None
+
+
+    def test_positive_pickled_function_result_value(self):
+        function = FunctionReplace(cache_size=3)
+        function.call('ABA', 'A', 'B')
+
+        copy = pickle.loads(pickle.dumps(function))
+
+        assert copy.call('ABA', 'A', 'B') == 'BBB'
+        assert copy.get_pattern_statistics().misses == 1
+
+
+    def test_positive_literal_regex_detected(self):
+        function = FunctionReplace()
+
+        assert function.specialize({1: 'cat'}).literal == 'cat'
+        assert function.specialize({1: 'a b-c#d'}).literal == 'a b-c#d'
+        assert function.specialize({1: 'c.t'}).literal is None
+        assert function.specialize({1: 'c\\t'}).literal is None
+
+
+    def test_positive_literal_regex_with_escapes_in_replacement(self):
+        stack = ['A-B-C', '-', '\\n']
+        self.function.invoke(stack)
+        assert stack[0] == 'A\nB\nC'
+
+
+    def test_positive_literal_regex_same_as_re(self):
+        generator = random.Random(7)
+        function = FunctionReplace()
+
+        for _ in range(2000):
+            source = ''.join(generator.choice('ab.\\ ') for _ in range(generator.randint(0, 12)))
+            regex = ''.join(generator.choice('ab ') for _ in range(generator.randint(1, 3)))
+            replacement = generator.choice(['', 'x', 'ab', 'a b', '\\n', '\\\\', 'x\\g<0>'])
+
+            assert function.call(source, regex, replacement) == re.sub(regex, replacement, source)
+
+
     def test_negative_fewer_arguments(self):
         stack = ['ABA', 'A']
         with pytest.raises(ExpressionError) as ex:
@@ -89,3 +89,17 @@ class TestOperatorOr:
         with pytest.raises(ExpressionError) as ex:
             self.operator.invoke(stack)
         assert 'Invalid arguments' in str(ex.value)
+
+
+    def test_positive_call_lazily_short_circuit_result_value(self):
+        assert self.operator.call_lazily(lambda: True, lambda: 1 / 0) is True
+
+
+    def test_positive_call_lazily_both_arguments_result_value(self):
+        assert self.operator.call_lazily(lambda: not True, lambda: True) is True
+
+
+    def test_negative_call_lazily_second_argument_wrong_type(self):
+        with pytest.raises(ExpressionError) as ex:
+            self.operator.call_lazily(lambda: not True, lambda: 'True')
+        assert 'Invalid arguments' in str(ex.value)
@@ -75,3 +75,26 @@ class TestOperatorPlus:
         with pytest.raises(ExpressionError) as ex:
             self.operator.invoke(stack)
         assert 'Invalid arguments' in str(ex.value)
+
+
+    def test_positive_call_result_value(self):
+        assert self.operator.call('A', 'B') == 'AB'
+
+
+    def test_negative_call_wrong_number_of_arguments(self):
+        with pytest.raises(ExpressionError) as ex:
+            self.operator.call('A')
+        assert 'Wrong number of arguments' in str(ex.value)
+
+
+    def test_positive_call_vectorized_result_value(self):
+        numpy = pytest.importorskip('numpy')
+        result = self.operator.call_vectorized(numpy.array(['A', '', 'C']), numpy.array(['B', 'B', None], dtype=object))
+        assert list(result) == ['AB', 'B', 'C']
+
+
+    def test_negative_call_vectorized_wrong_types(self):
+        numpy = pytest.importorskip('numpy')
+        with pytest.raises(ExpressionError) as ex:
+            self.operator.call_vectorized(numpy.array(['A', True], dtype=object), 'B')
+        assert 'Invalid arguments' in str(ex.value)
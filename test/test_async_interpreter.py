@@ -0,0 +1,162 @@
+from s2e2.backend import Backend
+from s2e2.clock import EvaluationClock
+from s2e2.error import ExpressionError
+from s2e2.evaluator import Evaluator
+
+from s2e2.functions.function import Function
+
+import asyncio
+import datetime
+import pytest
+
+
+class TestAsyncInterpreter:
+
+    class LookupFunction(Function):
+        """
+        Function LOOKUP(<key>) asynchronously returns the key in lower case.
+        It waits until the expected number of lookups run at once.
+        """
+        pure = True
+
+        def __init__(self, concurrency=1):
+            super().__init__('LOOKUP', 1)
+            self.concurrency = concurrency
+            self.keys = []
+            self.running = 0
+
+        def _check_arguments(self, arguments):
+            return isinstance(arguments[0], str)
+
+        async def _result(self, arguments):
+            self.keys.append(arguments[0])
+            self.running += 1
+            try:
+                await asyncio.wait_for(self.wait_for_others(), TestAsyncInterpreter.TIMEOUT)
+            finally:
+                self.running -= 1
+            return arguments[0].lower()
+
+        async def wait_for_others(self):
+            while self.running < self.concurrency:
+                await asyncio.sleep(0)
+
+
+    class LegacyLookupFunction(Function):
+        """
+        Function LEGACY_LOOKUP(<key>) reads its arguments from self._arguments.
+        """
+        def __init__(self):
+            super().__init__('LEGACY_LOOKUP', 1)
+
+        def _check_arguments(self):
+            return isinstance(self._arguments[0], str)
+
+        async def _result(self):
+            await asyncio.sleep(0)
+            return self._arguments[0].lower()
+
+
+    TIMEOUT = 5
+
+    def make_evaluator(self, lookup, backend=Backend.INTERPRETER, lazy=False):
+        evaluator = Evaluator(backend=backend, lazy=lazy)
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        evaluator.add_function(lookup)
+        evaluator.add_function(TestAsyncInterpreter.LegacyLookupFunction())
+        return evaluator
+
+
+    def test_positive_asynchronous_flag(self):
+        assert TestAsyncInterpreter.LookupFunction.asynchronous
+        assert TestAsyncInterpreter.LegacyLookupFunction.asynchronous
+        assert not Function.asynchronous
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_positive_evaluation_result(self, backend, lazy):
+        evaluator = self.make_evaluator(TestAsyncInterpreter.LookupFunction(), backend, lazy)
+        expression = 'IF(LOOKUP(${A}) == key, LOOKUP(B) + C, D) + LEGACY_LOOKUP(E)'
+
+        assert evaluator.compile(expression).is_async
+        assert asyncio.run(evaluator.evaluate_async(expression, {'A': 'KEY'})) == 'bCe'
+
+
+    def test_positive_arguments_awaited_concurrently(self):
+        lookup = TestAsyncInterpreter.LookupFunction(concurrency=3)
+        evaluator = self.make_evaluator(lookup)
+
+        result = asyncio.run(evaluator.evaluate_async('LOOKUP(A) + LOOKUP(B) + LOOKUP(C)'))
+
+        # every lookup waits until all three run at once
+        assert result == 'abc'
+        assert sorted(lookup.keys) == ['A', 'B', 'C']
+
+
+    def test_positive_lazy_evaluation_awaits_only_selected_branch(self):
+        lookup = TestAsyncInterpreter.LookupFunction()
+        evaluator = self.make_evaluator(lookup, lazy=True)
+
+        result = asyncio.run(evaluator.evaluate_async('IF(LOOKUP(A) == a, LOOKUP(B), LOOKUP(C))'))
+
+        assert result == 'b'
+        assert lookup.keys == ['A', 'B']
+
+
+    def test_positive_repeated_call_awaited_once(self):
+        lookup = TestAsyncInterpreter.LookupFunction()
+        evaluator = self.make_evaluator(lookup)
+
+        result = asyncio.run(evaluator.evaluate_async('LOOKUP(A) + LOOKUP(B) + LOOKUP(A)'))
+
+        assert result == 'aba'
+        assert sorted(lookup.keys) == ['A', 'B']
+
+
+    def test_positive_synchronous_expression(self):
+        evaluator = self.make_evaluator(TestAsyncInterpreter.LookupFunction())
+
+        assert not evaluator.compile('A + ${B}').is_async
+        assert asyncio.run(evaluator.evaluate_async('A + ${B}', {'B': 'B'})) == 'AB'
+
+
+    def test_negative_synchronous_evaluation(self):
+        evaluator = self.make_evaluator(TestAsyncInterpreter.LookupFunction())
+
+        with pytest.raises(ExpressionError):
+            evaluator.evaluate('LOOKUP(A) + B')
+
+
+    def test_positive_evaluation_clock_frozen_within_evaluation(self):
+        start = datetime.datetime(2020, 5, 17, 10, 30, 42)
+        evaluator = Evaluator(clock=EvaluationClock(iter([start, start + datetime.timedelta(seconds=1)]).__next__))
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        evaluator.add_function(TestAsyncInterpreter.LookupFunction())
+        expression = 'LOOKUP(A) + FORMAT_DATE(NOW(), "%S") + LOOKUP(B) + FORMAT_DATE(NOW(), "%S")'
+
+        assert asyncio.run(evaluator.evaluate_async(expression)) == 'a42b42'
+        assert asyncio.run(evaluator.evaluate_async(expression)) == 'a43b43'
+
+
+    def test_negative_invalid_arguments(self):
+        evaluator = self.make_evaluator(TestAsyncInterpreter.LookupFunction())
+
+        with pytest.raises(ExpressionError):
+            asyncio.run(evaluator.evaluate_async('LOOKUP(A == B)'))
+
+
+    def test_negative_undefined_variable(self):
+        evaluator = self.make_evaluator(TestAsyncInterpreter.LookupFunction())
+
+        with pytest.raises(ExpressionError):
+            asyncio.run(evaluator.evaluate_async('LOOKUP(${A})'))
+
+
+    def test_negative_invalid_expression(self):
+        evaluator = self.make_evaluator(TestAsyncInterpreter.LookupFunction())
+
+        with pytest.raises(ExpressionError):
+            asyncio.run(evaluator.evaluate_async('LOOKUP(A) B'))
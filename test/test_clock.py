@@ -0,0 +1,135 @@
+from s2e2 import clock
+from s2e2.clock import BatchClock, EvaluationClock, QuantizedClock, RealClock
+
+import datetime
+import pytest
+
+
+class TestClock:
+
+    class SteppingSource:
+        """
+        Source of datetimes which returns a datetime one second later on every call.
+        """
+        def __init__(self, start):
+            self.value = start
+            self.calls = 0
+
+        def __call__(self):
+            self.calls += 1
+            value = self.value
+            self.value += datetime.timedelta(seconds=1)
+            return value
+
+
+    START = datetime.datetime(2020, 5, 17, 10, 30, 42, 123456)
+
+    def setup_method(self):
+        self.source = TestClock.SteppingSource(TestClock.START)
+
+
+    def teardown_method(self):
+        self.source = None
+
+
+    def test_positive_default_source_is_utc_now(self):
+        before = datetime.datetime.utcnow()
+        value = EvaluationClock().read()
+        after = datetime.datetime.utcnow()
+
+        assert before <= value <= after
+
+
+    def test_positive_now_outside_of_scope(self):
+        before = datetime.datetime.utcnow()
+        value = clock.now()
+        after = datetime.datetime.utcnow()
+
+        assert before <= value <= after
+
+
+    def test_positive_real_clock_is_read_on_every_call(self):
+        with clock.scope(RealClock(self.source)):
+            first = clock.now()
+            second = clock.now()
+
+        assert second - first == datetime.timedelta(seconds=1)
+
+
+    def test_positive_frozen_clock_is_read_once_per_scope(self):
+        with clock.scope(EvaluationClock(self.source)):
+            first = clock.now()
+            second = clock.now()
+
+        assert first == second == TestClock.START
+        assert self.source.calls == 1
+
+
+    def test_positive_nested_scope_of_the_same_clock_keeps_outer_reading(self):
+        batch_clock = BatchClock(self.source)
+
+        with clock.scope(batch_clock):
+            with clock.scope(batch_clock):
+                inner = clock.now()
+            outer = clock.now()
+
+        assert inner == outer == TestClock.START
+
+
+    def test_positive_nested_scope_of_another_clock_is_read_anew(self):
+        with clock.scope(BatchClock(self.source)):
+            with clock.scope(QuantizedClock(60, self.source)):
+                inner = clock.now()
+            outer = clock.now()
+
+        assert inner == datetime.datetime(2020, 5, 17, 10, 30)
+        assert outer == TestClock.START
+
+
+    def test_positive_nested_scope_without_clock_reads_current_time(self):
+        with clock.scope(BatchClock(self.source)):
+            before = datetime.datetime.utcnow()
+            with clock.scope(None):
+                inner = clock.now()
+            after = datetime.datetime.utcnow()
+
+        assert before <= inner <= after
+
+
+    def test_positive_scope_is_reset(self):
+        with clock.scope(EvaluationClock(self.source)):
+            pass
+
+        assert clock.READER.get() is None
+
+
+    def test_positive_no_clock_no_scope(self):
+        with clock.scope(None):
+            assert clock.READER.get() is None
+
+
+    def test_positive_per_batch_flags(self):
+        assert not RealClock().per_batch
+        assert not EvaluationClock().per_batch
+        assert BatchClock().per_batch
+        assert QuantizedClock(1).per_batch
+
+
+    def test_positive_quantized_clock_value(self):
+        assert QuantizedClock(60, self.source).read() == datetime.datetime(2020, 5, 17, 10, 30)
+
+
+    def test_positive_quantized_clock_fractional_tick(self):
+        assert QuantizedClock(0.5, self.source).read() == datetime.datetime(2020, 5, 17, 10, 30, 42)
+
+
+    def test_positive_quantized_clock_aware_datetime(self):
+        timezone = datetime.timezone(datetime.timedelta(hours=3))
+        source = TestClock.SteppingSource(datetime.datetime(2020, 5, 17, 10, 30, 42, tzinfo=timezone))
+
+        assert QuantizedClock(3600, source).read() == datetime.datetime(2020, 5, 17, 10, tzinfo=timezone)
+
+
+    def test_negative_quantized_clock_not_positive_tick(self):
+        with pytest.raises(ValueError):
+            QuantizedClock(0)
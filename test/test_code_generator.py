@@ -0,0 +1,66 @@
+from s2e2.code_generator import CodeGenerator
+from s2e2.error import ExpressionError
+from s2e2.instructions import PUSH, CALL
+
+from s2e2.functions.function_if import FunctionIf
+from s2e2.operators.operator_equal import OperatorEqual
+from s2e2.operators.operator_plus import OperatorPlus
+
+import pytest
+
+
+class TestCodeGenerator:
+
+    def setup_method(self):
+        self.plus = OperatorPlus()
+        self.equal = OperatorEqual()
+        self.function_if = FunctionIf()
+
+
+    def teardown_method(self):
+        self.plus = None
+        self.equal = None
+        self.function_if = None
+
+
+    def test_positive_single_value_result(self):
+        function = CodeGenerator.generate([(PUSH, 'A')])
+        assert function() == 'A'
+
+
+    def test_positive_operator_result(self):
+        function = CodeGenerator.generate([(PUSH, 'A'), (PUSH, 'B'), (CALL, self.plus)])
+        assert function() == 'AB'
+
+
+    def test_positive_nested_calls_result(self):
+        program = [(PUSH, 'A'), (PUSH, 'B'), (CALL, self.equal),
+                   (PUSH, '1'), (PUSH, '2'), (PUSH, '3'), (CALL, self.plus),
+                   (CALL, self.function_if)]
+        function = CodeGenerator.generate(program)
+        assert function() == '23'
+
+
+    def test_positive_straight_line_source(self):
+        source = CodeGenerator.generate_source([(PUSH, 'A'), (PUSH, 'B'), (CALL, self.plus)])
+        assert source == 'def evaluate(bindings=None):\n' \
+                         '    a2 = [c0, c1]\n' \
+                         '    if not k2(a2):\n' \
+                         '        raise ExpressionError(m2)\n' \
+                         '    v2 = r2(a2)\n' \
+                         '    return v2\n'
+
+
+    def test_positive_few_arguments_not_generated(self):
+        assert CodeGenerator.generate([(PUSH, 'A'), (CALL, self.plus)]) is None
+
+
+    def test_positive_few_operators_not_generated(self):
+        assert CodeGenerator.generate([(PUSH, 'A'), (PUSH, 'B')]) is None
+
+
+    def test_negative_invalid_arguments(self):
+        function = CodeGenerator.generate([(PUSH, 'A'), (PUSH, 'B'), (PUSH, 'C'), (CALL, self.function_if)])
+        with pytest.raises(ExpressionError) as ex:
+            function()
+        assert 'Invalid arguments for function IF' in str(ex.value)
@@ -0,0 +1,107 @@
+from s2e2.clock import BatchClock, EvaluationClock
+from s2e2.compiled_expression import CompiledExpression, PUSH, LOAD, CALL
+from s2e2.error import ExpressionError
+
+from s2e2.functions.function_now import FunctionNow
+from s2e2.operators.operator_plus import OperatorPlus
+
+import pytest
+
+
+class TestCompiledExpression:
+
+    def setup_method(self):
+        self.operator = OperatorPlus()
+
+
+    def teardown_method(self):
+        self.operator = None
+
+
+    def test_positive_single_value_evaluation_result(self):
+        compiled = CompiledExpression('A', [(PUSH, 'A')])
+        assert compiled.evaluate() == 'A'
+
+
+    def test_positive_operator_evaluation_result(self):
+        compiled = CompiledExpression('A + B', [(PUSH, 'A'), (PUSH, 'B'), (CALL, self.operator)])
+        assert compiled.evaluate() == 'AB'
+
+
+    def test_positive_null_evaluation_result(self):
+        compiled = CompiledExpression('NULL', [(PUSH, None)])
+        assert compiled.evaluate() is None
+
+
+    def test_positive_repeated_evaluation_result(self):
+        compiled = CompiledExpression('A + B', [(PUSH, 'A'), (PUSH, 'B'), (CALL, self.operator)])
+        assert compiled.evaluate() == compiled.evaluate()
+
+
+    def test_positive_program_is_tuple(self):
+        compiled = CompiledExpression('A', [(PUSH, 'A')])
+        assert compiled.program == ((PUSH, 'A'),)
+
+
+    def test_positive_expression_value(self):
+        compiled = CompiledExpression('A', [(PUSH, 'A')])
+        assert compiled.expression == 'A'
+
+
+    def test_positive_variables_value(self):
+        compiled = CompiledExpression('${A} + ${B}', [(LOAD, 'A'), (LOAD, 'B'), (CALL, self.operator)])
+        assert compiled.variables == frozenset(['A', 'B'])
+
+
+    def test_positive_bindings_evaluation_result(self):
+        compiled = CompiledExpression('${A} + B', [(LOAD, 'A'), (PUSH, 'B'), (CALL, self.operator)])
+        assert compiled.evaluate({'A': 'x'}) == 'xB'
+        assert compiled({'A': 'y'}) == 'yB'
+
+
+    def test_positive_binding_value_is_not_parsed(self):
+        compiled = CompiledExpression('${A}', [(LOAD, 'A')])
+        assert compiled({'A': '"a" + ${B}'}) == '"a" + ${B}'
+
+
+    def test_positive_is_pure_value(self):
+        compiled = CompiledExpression('${A} + B', [(LOAD, 'A'), (PUSH, 'B'), (CALL, self.operator)])
+        assert compiled.is_pure
+
+
+    def test_positive_impure_function_is_pure_value(self):
+        compiled = CompiledExpression('NOW()', [(CALL, FunctionNow())])
+        assert not compiled.is_pure
+
+
+    def test_positive_batch_clock_is_pure_in_batch_value(self):
+        compiled = CompiledExpression('NOW() + ${A}', [(CALL, FunctionNow()), (LOAD, 'A'), (CALL, self.operator)],
+                                      clock=BatchClock())
+        assert not compiled.is_pure
+        assert compiled.is_pure_in_batch
+
+
+    def test_positive_evaluation_clock_is_pure_in_batch_value(self):
+        compiled = CompiledExpression('NOW()', [(CALL, FunctionNow())], clock=EvaluationClock())
+        assert not compiled.is_pure_in_batch
+
+
+    def test_negative_few_arguments(self):
+        compiled = CompiledExpression('A +', [(PUSH, 'A'), (CALL, self.operator)])
+        with pytest.raises(ExpressionError) as ex:
+            compiled.evaluate()
+        assert 'Not enough arguments' in str(ex.value)
+
+
+    def test_negative_few_operators(self):
+        compiled = CompiledExpression('A B', [(PUSH, 'A'), (PUSH, 'B')])
+        with pytest.raises(ExpressionError) as ex:
+            compiled.evaluate()
+        assert 'Invalid expression' in str(ex.value)
+
+
+    def test_negative_undefined_variable(self):
+        compiled = CompiledExpression('${A} + ${B}', [(LOAD, 'A'), (LOAD, 'B'), (CALL, self.operator)])
+        with pytest.raises(ExpressionError) as ex:
+            compiled.evaluate({'A': 'x'})
+        assert 'Undefined variable B' in str(ex.value)
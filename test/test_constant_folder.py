@@ -0,0 +1,98 @@
+from s2e2.constant_folder import ConstantFolder
+from s2e2.instructions import PUSH, LOAD, CALL
+
+from s2e2.functions.function import Function
+from s2e2.functions.function_if import FunctionIf
+from s2e2.functions.function_now import FunctionNow
+from s2e2.functions.function_replace import FunctionReplace, FunctionReplaceCompiled
+from s2e2.operators.operator_equal import OperatorEqual
+from s2e2.operators.operator_plus import OperatorPlus
+
+
+class TestConstantFolder:
+
+    class ImpureFunction(Function):
+        def __init__(self):
+            super().__init__('IMPURE', 1)
+
+        def _check_arguments(self):
+            return True
+
+        def _result(self):
+            return 'ImpureResult'
+
+
+    def setup_method(self):
+        self.plus = OperatorPlus()
+        self.equal = OperatorEqual()
+        self.function_if = FunctionIf()
+        self.now = FunctionNow()
+        self.impure = TestConstantFolder.ImpureFunction()
+
+
+    def teardown_method(self):
+        self.plus = None
+        self.equal = None
+        self.function_if = None
+        self.now = None
+        self.impure = None
+
+
+    def test_positive_constant_operator_folded(self):
+        program = [(PUSH, 'A'), (PUSH, 'B'), (CALL, self.plus)]
+        assert ConstantFolder.fold(program) == ([(PUSH, 'AB')], 2)
+
+
+    def test_positive_nested_constant_calls_folded(self):
+        program = [(PUSH, 'A'), (PUSH, 'A'), (CALL, self.equal),
+                   (PUSH, 'X'), (PUSH, 'Y'), (CALL, self.function_if)]
+        assert ConstantFolder.fold(program) == ([(PUSH, 'X')], 5)
+
+
+    def test_positive_non_string_result_folded(self):
+        program = [(PUSH, 'A'), (PUSH, 'B'), (CALL, self.equal)]
+        assert ConstantFolder.fold(program) == ([(PUSH, False)], 2)
+
+
+    def test_positive_impure_function_not_folded(self):
+        program = [(PUSH, 'A'), (CALL, self.impure)]
+        assert ConstantFolder.fold(program) == (program, 0)
+
+
+    def test_positive_now_not_folded(self):
+        program = [(CALL, self.now)]
+        assert ConstantFolder.fold(program) == (program, 0)
+
+
+    def test_positive_constant_part_folded(self):
+        program = [(CALL, self.now), (PUSH, 'A'), (PUSH, 'B'), (CALL, self.plus), (CALL, self.equal)]
+        expected_program = [(CALL, self.now), (PUSH, 'AB'), (CALL, self.equal)]
+        assert ConstantFolder.fold(program) == (expected_program, 2)
+
+
+    def test_positive_failing_call_not_folded(self):
+        program = [(PUSH, 'A'), (PUSH, 'B'), (PUSH, 'C'), (CALL, self.function_if)]
+        assert ConstantFolder.fold(program) == (program, 0)
+
+
+    def test_positive_invalid_program_not_folded(self):
+        program = [(PUSH, 'A'), (CALL, self.plus)]
+        assert ConstantFolder.fold(program) == (program, 0)
+
+
+    def test_positive_partly_constant_call_specialized(self):
+        replace = FunctionReplace()
+        program = [(LOAD, 'A'), (PUSH, 'B'), (PUSH, 'C'), (CALL, replace)]
+
+        folded_program, eliminated = ConstantFolder.fold(program)
+
+        assert eliminated == 0
+        assert folded_program[:3] == program[:3]
+        assert isinstance(folded_program[3][1], FunctionReplaceCompiled)
+        assert folded_program[3][1].pattern.pattern == 'B'
+
+
+    def test_positive_not_constant_call_not_specialized(self):
+        replace = FunctionReplace()
+        program = [(PUSH, 'A'), (LOAD, 'B'), (PUSH, 'C'), (CALL, replace)]
+        assert ConstantFolder.fold(program) == (program, 0)
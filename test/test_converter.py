@@ -32,6 +32,22 @@ class TestConverter:
         assert actual_tokens == expected_tokens
 
 
+    def test_positive_variable_result_value(self):
+        self.converter.add_operator('+', 1)
+
+        input_tokens = [Token(TokenType.VARIABLE, 'A'),
+                        Token(TokenType.OPERATOR, '+'),
+                        Token(TokenType.ATOM, 'B')]
+
+        actual_tokens = self.converter.convert(input_tokens)
+
+        expected_tokens = [Token(TokenType.VARIABLE, 'A'),
+                           Token(TokenType.ATOM, 'B'),
+                           Token(TokenType.OPERATOR, '+')]
+
+        assert actual_tokens == expected_tokens
+
+
     def test_positive_two_binary_operators_same_priority_result_value(self):
         self.converter.add_operator('+', 1)
         self.converter.add_operator('-', 1)
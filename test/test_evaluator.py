@@ -1,3 +1,6 @@
+from s2e2.backend import Backend
+from s2e2.clock import BatchClock, EvaluationClock, QuantizedClock
+from s2e2.compiled_expression import CompiledExpression
 from s2e2.converter import Converter
 from s2e2.error import ExpressionError
 from s2e2.evaluator import Evaluator
@@ -6,9 +9,14 @@ from s2e2.token import Token
 from s2e2.tokenizer import Tokenizer
 
 from s2e2.functions.function import Function
+from s2e2.functions.function_add_days import FunctionAddDays
 from s2e2.operators.operator import Operator
+from s2e2.operators.operator_plus import OperatorPlus
 
+import datetime
+import itertools
 import mock
+import pickle
 import pytest
 
 
@@ -36,6 +44,83 @@ class TestEvaluator:
             return 'OperatorResult'
 
 
+    class ConcatOperator(Operator):
+        """
+        Operator ? with three arguments concatenates them.
+        """
+        def __init__(self):
+            super().__init__('?', 500, 3)
+
+        def _check_arguments(self, arguments):
+            return True
+
+        def _result(self, arguments):
+            return ''.join(arguments)
+
+
+    class ConstantFunction(Function):
+        """
+        Function VALUE() returns the given value.
+        """
+        def __init__(self, value):
+            super().__init__('VALUE', 0)
+            self.value = value
+
+        def _check_arguments(self, arguments):
+            return True
+
+        def _result(self, arguments):
+            return self.value
+
+
+    class SwapFunction(Function):
+        """
+        Function SWAP(<value>) replaces function VALUE in the evaluator and returns the value.
+        """
+        def __init__(self, evaluator, replacement):
+            super().__init__('SWAP', 1)
+            self.evaluator = evaluator
+            self.replacement = replacement
+
+        def _check_arguments(self, arguments):
+            return True
+
+        def _result(self, arguments):
+            self.evaluator.replace_function(self.replacement)
+            return arguments[0]
+
+
+    class TightPlusOperator(OperatorPlus):
+        """
+        Operator + with the highest priority.
+        """
+        def __init__(self):
+            super().__init__()
+            self.priority = 900
+
+
+    class SteppingSource:
+        """
+        Source of datetimes which returns a datetime one second later on every call.
+        """
+        def __init__(self, start):
+            self.value = start
+
+        def __call__(self):
+            value = self.value
+            self.value += datetime.timedelta(seconds=1)
+            return value
+
+
+    START = datetime.datetime(2020, 5, 17, 10, 30, 42)
+
+    def make_clock_evaluator(self, clock):
+        evaluator = Evaluator(clock=clock)
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        return evaluator
+
+
     def setup(self):
         self.evaluator = Evaluator()
 
@@ -158,6 +243,18 @@ class TestEvaluator:
         assert result == 'AB'
 
 
+    def test_positive_three_arguments_operator_evaluation_result(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+        self.evaluator.add_operator(TestEvaluator.ConcatOperator())
+
+        assert self.evaluator.evaluate('a ? b c') == 'abc'
+        assert Evaluator.from_spec(self.evaluator.get_spec()).evaluate('a ? b c') == 'abc'
+
+        with pytest.raises(ExpressionError):
+            self.evaluator.parse('a ? b c')
+
+
     def test_positive_two_operators_evaluation_result(self):
         self.evaluator.add_standard_functions()
         self.evaluator.add_standard_operators()
@@ -221,6 +318,554 @@ class TestEvaluator:
         assert result is None
 
 
+    def test_positive_compile_evaluation_result(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        compiled = self.evaluator.compile('IF(A > B, 1, REPLACE(ABC, A, E))')
+
+        assert compiled.evaluate() == 'EBC'
+
+
+    def test_positive_compile_only_atoms_evaluation_result(self):
+        compiled = self.evaluator.compile('A B C')
+        assert compiled.evaluate() == 'A B C'
+
+
+    def test_positive_compiled_evaluate_verify_tokenizer(self):
+        tokenizer_mock = mock.Mock(spec=Tokenizer)
+        self.evaluator = Evaluator.mocked(Converter(), tokenizer_mock)
+
+        dummy_operator = TestEvaluator.DummyOperator()
+        infix_tokens = [Token(TokenType.ATOM, 'A'),
+                        Token(TokenType.OPERATOR, dummy_operator.name),
+                        Token(TokenType.ATOM, 'B')]
+
+        tokenizer_mock.tokenize.return_value = infix_tokens
+
+        self.evaluator.add_operator(dummy_operator)
+        compiled = self.evaluator.compile('A ' + dummy_operator.name + ' B')
+        compiled.evaluate()
+        compiled.evaluate()
+
+        tokenizer_mock.tokenize.assert_called_once()
+
+
+    def test_positive_cache_hit_verify_tokenizer(self):
+        tokenizer_mock = mock.Mock(spec=Tokenizer)
+        self.evaluator = Evaluator.mocked(Converter(), tokenizer_mock)
+
+        dummy_operator = TestEvaluator.DummyOperator()
+        expression = 'A ' + dummy_operator.name + ' B'
+        infix_tokens = [Token(TokenType.ATOM, 'A'),
+                        Token(TokenType.OPERATOR, dummy_operator.name),
+                        Token(TokenType.ATOM, 'B')]
+
+        tokenizer_mock.tokenize.return_value = infix_tokens
+
+        self.evaluator.add_operator(dummy_operator)
+        self.evaluator.evaluate(expression)
+        self.evaluator.evaluate(expression)
+
+        tokenizer_mock.tokenize.assert_called_once_with(expression)
+
+
+    def test_positive_cache_statistics(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        self.evaluator.evaluate('A + B')
+        self.evaluator.evaluate('A + B')
+        self.evaluator.evaluate('A + C')
+
+        statistics = self.evaluator.get_cache_statistics()
+
+        assert statistics.hits == 1
+        assert statistics.misses == 2
+        assert statistics.entries == 2
+
+
+    def test_positive_cache_eviction(self):
+        self.evaluator = Evaluator(cache_size=1)
+        self.evaluator.add_standard_operators()
+
+        self.evaluator.evaluate('A + B')
+        self.evaluator.evaluate('A + C')
+
+        assert self.evaluator.get_cache_statistics().evictions == 1
+
+
+    def test_positive_cache_invalidated_by_add_function(self):
+        self.evaluator.add_standard_operators()
+        assert self.evaluator.evaluate('Function + A') == 'FunctionA'
+
+        self.evaluator.add_function(TestEvaluator.DummyFunction())
+
+        with pytest.raises(ExpressionError):
+            self.evaluator.evaluate('Function + A')
+
+
+    def test_positive_cache_invalidated_by_add_operator(self):
+        assert self.evaluator.evaluate('A Operator B') == 'A Operator B'
+
+        self.evaluator.add_operator(TestEvaluator.DummyOperator())
+
+        assert self.evaluator.evaluate('A Operator B') == 'OperatorResult'
+
+
+    @pytest.mark.parametrize('expression', [
+        'A B C',
+        'NULL',
+        'A + B + C',
+        'IF(A < B, 1, 2) + IF(A > B, 3, 4)',
+        'IF(A > B, 1, REPLACE(ABC, A, E))',
+        'IF(A == NULL, Wrong, Correct)',
+        '!(A == B) && (C != D || E >= F)',
+        'FORMAT_DATE(ADD_DAYS(FORMAT_DATE(NOW(), "%Y"), 1), "%Y")',
+        'A +',
+        'A + B C',
+        'IF(A, B, C)',
+    ])
+    def test_positive_code_generator_same_as_interpreter(self, expression):
+        interpreter = Evaluator(backend=Backend.INTERPRETER)
+        code_generator = Evaluator(backend=Backend.CODE_GENERATOR)
+
+        results = []
+        for evaluator in (interpreter, code_generator):
+            evaluator.add_standard_functions()
+            evaluator.add_standard_operators()
+            try:
+                results.append(evaluator.evaluate(expression))
+            except ExpressionError as ex:
+                results.append(str(ex))
+
+        assert results[0] == results[1]
+
+
+    def test_positive_constant_folding_statistics(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        compiled = self.evaluator.compile('IF(A == A, "prefix" + "-" + "suffix", B)')
+
+        assert compiled.statistics.folded_nodes == 9
+        assert len(compiled.program) == 1
+        assert compiled.evaluate() == 'prefix-suffix'
+
+
+    def test_positive_now_is_not_folded(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        compiled = self.evaluator.compile('FORMAT_DATE(ADD_DAYS(NOW(), 1), "%Y-%m-%d")')
+
+        assert compiled.statistics.folded_nodes == 0
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    def test_positive_lazy_mode_evaluation_result(self, backend):
+        self.evaluator = Evaluator(backend=backend, lazy=True)
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        result = self.evaluator.evaluate('IF(FORMAT_DATE(NOW(), "%Y") > 2000, Yes, FORMAT_DATE(A, B))')
+
+        assert result == 'Yes'
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_positive_bindings_evaluation_result(self, backend, lazy):
+        self.evaluator = Evaluator(backend=backend, lazy=lazy)
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        compiled = self.evaluator.compile('IF(${A} == ${B}, ${A} + "-" + ${A}, ${B})')
+
+        assert compiled({'A': 'x', 'B': 'x'}) == 'x-x'
+        assert compiled({'A': 'x', 'B': 'y'}) == 'y'
+        assert compiled({'A': 'x', 'B': None}) is None
+        assert self.evaluator.evaluate('${A} + B', bindings={'A': 'x'}) == 'xB'
+
+
+    def test_positive_bindings_are_not_folded(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        compiled = self.evaluator.compile('${A} + ("B" + "C")')
+
+        assert compiled.statistics.folded_nodes == 2
+        assert compiled({'A': 'A'}) == 'ABC'
+
+
+    def test_positive_evaluate_many_evaluation_result(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        results = self.evaluator.evaluate_many(['A + B', 'IF(A == B, 1, 2)', 'A + B', 'IF(A == A, NULL, B)', 'A B'])
+
+        assert results == ['AB', '2', 'AB', None, 'A B']
+
+
+    def test_positive_evaluate_many_pure_expression_evaluated_once(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        with mock.patch.object(CompiledExpression, 'evaluate', autospec=True,
+                               side_effect=CompiledExpression.evaluate) as evaluate_spy:
+            results = self.evaluator.evaluate_many(['${A} + B'] * 3, bindings={'A': 'x'})
+
+        assert results == ['xB'] * 3
+        assert evaluate_spy.call_count == 1
+
+
+    def test_positive_evaluate_many_impure_expression_evaluated_every_time(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        with mock.patch.object(CompiledExpression, 'evaluate', autospec=True,
+                               side_effect=CompiledExpression.evaluate) as evaluate_spy:
+            self.evaluator.evaluate_many(['FORMAT_DATE(NOW(), "%Y")'] * 3)
+
+        assert evaluate_spy.call_count == 3
+
+
+    def test_positive_stream_map_evaluation_result(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        records = [{'A': 'x', 'B': 'y'}, {'A': 'z', 'B': None}, {'A': 'x', 'B': 'y'}]
+        results = self.evaluator.stream_map('${A} + ${B}', records, chunk_size=2)
+
+        assert list(results) == ['xy', 'z', 'xy']
+
+
+    def test_positive_stream_map_reads_records_by_chunks(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        records = ({'A': str(index)} for index in itertools.count())
+        results = self.evaluator.stream_map('${A} + "!"', records, chunk_size=10)
+
+        assert list(itertools.islice(results, 15)) == [str(index) + '!' for index in range(15)]
+        assert next(records) == {'A': '20'}
+
+
+    def test_positive_stream_map_pure_expression_evaluated_once_per_chunk(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        with mock.patch.object(CompiledExpression, 'evaluate', autospec=True,
+                               side_effect=CompiledExpression.evaluate) as evaluate_spy:
+            results = list(self.evaluator.stream_map('${A} + B', [{'A': 'x'}] * 5, chunk_size=3))
+
+        assert results == ['xB'] * 5
+        assert evaluate_spy.call_count == 2
+
+
+    def test_positive_stream_map_equal_values_of_different_types(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        results = self.evaluator.stream_map('${x}', [{'x': 1}, {'x': True}, {'x': 1.0}, {'x': 1}])
+
+        assert list(results) == ['1', 'True', '1.0', '1']
+
+
+    def test_positive_stream_filter_evaluation_result(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        records = [{'level': 'ERROR', 'line': 1}, {'level': 'INFO', 'line': 2}, {'level': 'WARN', 'line': 3}]
+        selected = self.evaluator.stream_filter('${level} == ERROR || ${level} == WARN', records)
+
+        assert [record['line'] for record in selected] == [1, 3]
+
+
+    def test_positive_evaluation_clock_frozen_within_evaluation(self):
+        evaluator = self.make_clock_evaluator(EvaluationClock(TestEvaluator.SteppingSource(TestEvaluator.START)))
+
+        assert evaluator.evaluate('FORMAT_DATE(NOW(), "%S") + FORMAT_DATE(NOW(), "%S")') == '4242'
+        assert evaluator.evaluate('FORMAT_DATE(NOW(), "%S") + FORMAT_DATE(NOW(), "%S")') == '4343'
+
+
+    def test_positive_batch_clock_frozen_within_batch(self):
+        evaluator = self.make_clock_evaluator(BatchClock(TestEvaluator.SteppingSource(TestEvaluator.START)))
+
+        with evaluator.batch():
+            first = evaluator.evaluate('FORMAT_DATE(NOW(), "%S")')
+            second = evaluator.evaluate('FORMAT_DATE(NOW(), "%S") + X')
+
+        assert (first, second) == ('42', '42X')
+        assert evaluator.evaluate('FORMAT_DATE(NOW(), "%S")') == '43'
+
+
+    def test_positive_clock_does_not_leak_into_another_evaluator(self):
+        evaluator = self.make_clock_evaluator(BatchClock(lambda: datetime.datetime(2000, 1, 1)))
+        another_evaluator = self.make_clock_evaluator(None)
+        quantized_evaluator = self.make_clock_evaluator(QuantizedClock(60, lambda: TestEvaluator.START))
+
+        with evaluator.batch():
+            assert another_evaluator.evaluate('FORMAT_DATE(NOW(), "%Y")') == str(datetime.datetime.utcnow().year)
+            assert quantized_evaluator.evaluate('FORMAT_DATE(NOW(), "%Y %M:%S")') == '2020 30:00'
+            assert evaluator.evaluate('FORMAT_DATE(NOW(), "%Y")') == '2000'
+
+
+    def test_positive_evaluation_clock_batch_is_not_frozen(self):
+        evaluator = self.make_clock_evaluator(EvaluationClock(TestEvaluator.SteppingSource(TestEvaluator.START)))
+
+        with evaluator.batch():
+            first = evaluator.evaluate('FORMAT_DATE(NOW(), "%S")')
+            second = evaluator.evaluate('FORMAT_DATE(NOW(), "%S")')
+
+        assert (first, second) == ('42', '43')
+
+
+    def test_positive_evaluate_many_batch_clock_expression_evaluated_once(self):
+        evaluator = self.make_clock_evaluator(BatchClock(TestEvaluator.SteppingSource(TestEvaluator.START)))
+
+        with mock.patch.object(CompiledExpression, 'evaluate', autospec=True,
+                               side_effect=CompiledExpression.evaluate) as evaluate_spy:
+            results = evaluator.evaluate_many(['FORMAT_DATE(NOW(), "%S")', 'FORMAT_DATE(NOW(), "%S") + X',
+                                               'FORMAT_DATE(NOW(), "%S")'])
+
+        assert results == ['42', '42X', '42']
+        assert evaluate_spy.call_count == 2
+
+
+    def test_positive_evaluate_many_evaluation_clock_expression_evaluated_every_time(self):
+        evaluator = self.make_clock_evaluator(EvaluationClock(TestEvaluator.SteppingSource(TestEvaluator.START)))
+
+        results = evaluator.evaluate_many(['FORMAT_DATE(NOW(), "%S")'] * 3)
+
+        assert results == ['42', '43', '44']
+
+
+    def test_positive_stream_map_batch_clock_frozen_within_chunk(self):
+        evaluator = self.make_clock_evaluator(BatchClock(TestEvaluator.SteppingSource(TestEvaluator.START)))
+
+        records = [{'A': str(index)} for index in range(5)]
+        results = evaluator.stream_map('${A} + FORMAT_DATE(NOW(), "%S")', records, chunk_size=3)
+
+        assert list(results) == ['042', '142', '242', '343', '443']
+
+
+    def test_positive_quantized_clock_expression_evaluated_once_per_tick(self):
+        source = mock.Mock(return_value=TestEvaluator.START)
+        evaluator = self.make_clock_evaluator(QuantizedClock(60, source))
+        expression = 'FORMAT_DATE(ADD_DAYS(NOW(), 1), "%Y-%m-%d %H:%M")'
+
+        with mock.patch.object(FunctionAddDays, '_result', autospec=True,
+                               side_effect=FunctionAddDays._result) as result_spy:
+            results = [evaluator.evaluate(expression) for _ in range(3)]
+            source.return_value = TestEvaluator.START + datetime.timedelta(seconds=10)
+            results.append(evaluator.evaluate(expression))
+            source.return_value = TestEvaluator.START + datetime.timedelta(minutes=1)
+            results.append(evaluator.evaluate(expression))
+
+        assert results == ['2020-05-18 10:30'] * 4 + ['2020-05-18 10:31']
+        assert result_spy.call_count == 2
+
+
+    def test_positive_quantized_clock_expression_with_variables_evaluated_every_time(self):
+        evaluator = self.make_clock_evaluator(QuantizedClock(60, mock.Mock(return_value=TestEvaluator.START)))
+
+        assert evaluator.evaluate('${A} + FORMAT_DATE(NOW(), "%M")', {'A': 'x'}) == 'x30'
+        assert evaluator.evaluate('${A} + FORMAT_DATE(NOW(), "%M")', {'A': 'y'}) == 'y30'
+
+
+    def test_positive_spec_with_clock(self):
+        clock = QuantizedClock(60)
+        evaluator = self.make_clock_evaluator(clock)
+
+        assert evaluator.get_spec().clock is clock
+        assert isinstance(pickle.loads(pickle.dumps(evaluator)).get_spec().clock, QuantizedClock)
+
+
+    def test_positive_spec_evaluator_result(self):
+        evaluator = Evaluator(cache_size=7, backend=Backend.CODE_GENERATOR, lazy=True)
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+
+        spec = evaluator.get_spec()
+        copy = Evaluator.from_spec(spec)
+
+        assert copy.get_spec() == spec
+        assert copy.evaluate('IF(${A} == B, C, D) + E', {'A': 'B'}) == 'CE'
+
+
+    def test_positive_pickled_evaluator_result(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+        self.evaluator.evaluate('A + B')
+
+        copy = pickle.loads(pickle.dumps(self.evaluator))
+
+        assert [function.name for function in copy.get_functions()] == \
+               [function.name for function in self.evaluator.get_functions()]
+        assert [(operator.name, operator.priority) for operator in copy.get_operators()] == \
+               [(operator.name, operator.priority) for operator in self.evaluator.get_operators()]
+        assert copy.get_cache_statistics().entries == 0
+        assert copy.evaluate('REPLACE(${A}, B, C) + D', {'A': 'ABC'}) == 'ACCD'
+
+
+    def test_positive_frozen_evaluator_result(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        frozen = self.evaluator.freeze()
+
+        assert frozen.is_frozen()
+        assert not self.evaluator.is_frozen()
+        assert frozen.freeze() is frozen
+        assert frozen.get_spec() == self.evaluator.get_spec()
+        assert frozen.evaluate('IF(${A} == B, C, D) + E', {'A': 'B'}) == 'CE'
+
+
+    def test_positive_frozen_evaluator_is_hashable_by_configuration(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        first = self.evaluator.freeze()
+        second = self.evaluator.freeze()
+
+        assert first == second
+        assert hash(first) == hash(second)
+        assert len({first, second}) == 1
+        assert self.evaluator != first
+
+
+    def test_positive_pickled_frozen_evaluator_is_frozen(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        copy = pickle.loads(pickle.dumps(self.evaluator.freeze()))
+
+        assert copy.is_frozen()
+        assert copy.evaluate('REPLACE(${A}, B, C) + D', {'A': 'ABC'}) == 'ACCD'
+
+
+    def test_negative_add_function_to_frozen_evaluator(self):
+        frozen = self.evaluator.freeze()
+
+        with pytest.raises(TypeError) as ex:
+            frozen.add_function(TestEvaluator.DummyFunction())
+        assert 'Attempt to add function to frozen Evaluator' in str(ex.value)
+
+
+    def test_negative_add_operator_to_frozen_evaluator(self):
+        frozen = self.evaluator.freeze()
+
+        with pytest.raises(TypeError) as ex:
+            frozen.add_standard_operators()
+        assert 'Attempt to add operator to frozen Evaluator' in str(ex.value)
+        assert frozen.get_operators() == ()
+
+
+    def test_positive_constant_regex_precompiled(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+        replace = next(function for function in self.evaluator.get_functions() if function.name == 'REPLACE')
+
+        compiled = self.evaluator.compile('REPLACE(${A}, "B+", C) + REPLACE(${A}, "B+", C)')
+        assert compiled.statistics.merged_subtrees == 1
+        for value in ('ABBA', 'BAB', 'AAA'):
+            compiled.evaluate({'A': value})
+
+        assert compiled.evaluate({'A': 'ABBA'}) == 'ACAACA'
+        assert replace.get_pattern_statistics().misses == 1
+
+
+    def test_positive_replace_function_result(self):
+        self.evaluator.add_standard_operators()
+        self.evaluator.add_function(TestEvaluator.ConstantFunction('A'))
+        version = self.evaluator.get_registry_version()
+
+        compiled = self.evaluator.compile('VALUE() + B')
+        self.evaluator.replace_function(TestEvaluator.ConstantFunction('C'))
+
+        assert self.evaluator.get_registry_version() == version + 1
+        assert compiled.evaluate() == 'AB'
+        assert self.evaluator.evaluate('VALUE() + B') == 'CB'
+
+
+    def test_positive_replace_function_during_evaluation(self):
+        self.evaluator.add_standard_operators()
+        self.evaluator.add_function(TestEvaluator.ConstantFunction('A'))
+        self.evaluator.add_function(TestEvaluator.SwapFunction(self.evaluator, TestEvaluator.ConstantFunction('C')))
+
+        # the evaluation started with the old version keeps using it
+        assert self.evaluator.evaluate('SWAP(B) + VALUE()') == 'BA'
+        assert self.evaluator.evaluate('VALUE()') == 'C'
+
+
+    def test_positive_replace_operator_priority(self):
+        self.evaluator.add_standard_operators()
+        assert self.evaluator.evaluate('A + B == AB') == 'A'
+
+        self.evaluator.replace_operator(TestEvaluator.TightPlusOperator())
+
+        assert self.evaluator.evaluate('A + B == AB') == 'True'
+
+
+    def test_positive_remove_function(self):
+        self.evaluator.add_function(TestEvaluator.ConstantFunction('A'))
+        self.evaluator.remove_function('VALUE')
+
+        assert self.evaluator.get_functions() == ()
+        assert self.evaluator.evaluate('VALUE') == 'VALUE'
+
+
+    def test_positive_remove_operator(self):
+        self.evaluator.add_standard_operators()
+        self.evaluator.remove_operator('+')
+
+        assert '+' not in [operator.name for operator in self.evaluator.get_operators()]
+        assert self.evaluator.evaluate('A+B') == 'A+B'
+
+
+    def test_positive_registry_change_keeps_cache(self):
+        self.evaluator.add_standard_operators()
+        self.evaluator.add_function(TestEvaluator.ConstantFunction('A'))
+        self.evaluator.compile('A + B')
+
+        self.evaluator.replace_function(TestEvaluator.ConstantFunction('C'))
+        self.evaluator.compile('A + B')
+
+        statistics = self.evaluator.get_cache_statistics()
+        assert statistics.entries == 2
+        assert statistics.hits == 0
+
+
+    def test_negative_replace_unknown_function(self):
+        with pytest.raises(ExpressionError) as ex:
+            self.evaluator.replace_function(TestEvaluator.DummyFunction())
+        assert 'Function Function is not added' in str(ex.value)
+
+
+    def test_negative_replace_unknown_operator(self):
+        with pytest.raises(ExpressionError) as ex:
+            self.evaluator.replace_operator(TestEvaluator.DummyOperator())
+        assert 'Operator Operator is not added' in str(ex.value)
+
+
+    def test_negative_remove_unknown_function(self):
+        self.evaluator.add_standard_operators()
+
+        with pytest.raises(ExpressionError) as ex:
+            self.evaluator.remove_function('+')
+        assert 'Function + is not added' in str(ex.value)
+
+
+    def test_negative_remove_operator_of_frozen_evaluator(self):
+        self.evaluator.add_standard_operators()
+        frozen = self.evaluator.freeze()
+
+        with pytest.raises(TypeError) as ex:
+            frozen.remove_operator('+')
+        assert 'Attempt to remove operator from frozen Evaluator' in str(ex.value)
+
+
     def test_negative_add_empty_function(self):
         with pytest.raises(TypeError) as ex:
             self.evaluator.add_function(None)
@@ -233,6 +878,12 @@ class TestEvaluator:
         assert 'Attempt to add empty operator' in str(ex.value)
 
 
+    def test_negative_compile_empty_expression(self):
+        with pytest.raises(TypeError) as ex:
+            self.evaluator.compile('')
+        assert 'Attempt to compile empty expression' in str(ex.value)
+
+
     def test_negative_two_functions_with_the_same_name(self):
         self.evaluator.add_function(TestEvaluator.DummyFunction())
 
@@ -322,3 +973,39 @@ class TestEvaluator:
         with pytest.raises(ExpressionError) as ex:
             self.evaluator.evaluate('A + B C')
         assert 'Invalid expression' in str(ex.value)
+
+
+    def test_negative_undefined_variable(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        with pytest.raises(ExpressionError) as ex:
+            self.evaluator.evaluate('${A} + B')
+        assert 'Undefined variable A' in str(ex.value)
+
+
+    def test_negative_evaluate_many_empty_expression(self):
+        with pytest.raises(TypeError) as ex:
+            self.evaluator.evaluate_many(['A', ''])
+        assert 'Attempt to evaluate empty expression' in str(ex.value)
+
+
+    def test_negative_stream_map_invalid_expression(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        with pytest.raises(ExpressionError) as ex:
+            self.evaluator.stream_map('${A} + (B', [])
+        assert 'Unpaired bracket' in str(ex.value)
+
+
+    def test_negative_stream_filter_undefined_variable(self):
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        selected = self.evaluator.stream_filter('${A} == B', [{'A': 'B'}, {'C': 'B'}], chunk_size=1)
+
+        assert next(selected) == {'A': 'B'}
+        with pytest.raises(ExpressionError) as ex:
+            next(selected)
+        assert 'Undefined variable A' in str(ex.value)
@@ -0,0 +1,115 @@
+from s2e2.backend import Backend
+from s2e2.compiled_expression import CompiledExpression
+from s2e2.error import ExpressionError
+from s2e2.instructions import PUSH, CALL, MEMO, LAZY
+from s2e2.lazy_transformer import LazyTransformer
+
+from s2e2.functions.function import Function
+from s2e2.functions.function_if import FunctionIf
+from s2e2.operators.operator_and import OperatorAnd
+from s2e2.operators.operator_equal import OperatorEqual
+from s2e2.operators.operator_or import OperatorOr
+
+import pytest
+
+
+class TestLazyTransformer:
+
+    class CountingFunction(Function):
+        def __init__(self):
+            super().__init__('COUNT', 1)
+            self.calls = 0
+
+        def _check_arguments(self):
+            return True
+
+        def _result(self):
+            self.calls += 1
+            return self._arguments[0]
+
+
+    def setup_method(self):
+        self.count = TestLazyTransformer.CountingFunction()
+        self.function_if = FunctionIf()
+        self.conjunction = OperatorAnd()
+        self.disjunction = OperatorOr()
+        self.equal = OperatorEqual()
+
+
+    def teardown_method(self):
+        self.count = None
+        self.function_if = None
+        self.conjunction = None
+        self.disjunction = None
+        self.equal = None
+
+
+    def test_positive_eager_program_not_changed(self):
+        program = [(PUSH, 'A'), (CALL, self.count), (PUSH, 'B'), (CALL, self.equal)]
+        assert LazyTransformer.transform(program) == program
+
+
+    def test_positive_lazy_call_transformed(self):
+        program = [(PUSH, True), (PUSH, 'A'), (CALL, self.count), (PUSH, 'B'), (CALL, self.function_if)]
+        expected_program = [(LAZY, (self.function_if, (((PUSH, True),),
+                                                       ((PUSH, 'A'), (CALL, self.count)),
+                                                       ((PUSH, 'B'),))))]
+        assert LazyTransformer.transform(program) == expected_program
+
+
+    def test_positive_memo_subprogram_transformed_once(self):
+        memo = (0, ((PUSH, True), (PUSH, True), (CALL, self.conjunction)))
+        program = [(MEMO, memo), (MEMO, memo), (CALL, self.disjunction)]
+
+        result = LazyTransformer.transform(program)
+
+        assert result[0][0] == LAZY
+        first_memo, second_memo = result[0][1][1]
+        assert first_memo[0][1] is second_memo[0][1]
+        assert first_memo[0][1][1][0][0] == LAZY
+
+
+    def test_positive_invalid_program_not_changed(self):
+        program = [(PUSH, 'A'), (CALL, self.equal)]
+        assert LazyTransformer.transform(program) == program
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    def test_positive_only_needed_branch_evaluated(self, backend):
+        program = [(PUSH, False), (PUSH, 'A'), (CALL, self.count), (PUSH, 'B'), (CALL, self.count),
+                   (CALL, self.function_if)]
+        compiled = CompiledExpression('', LazyTransformer.transform(program), backend)
+
+        assert compiled.evaluate() == 'B'
+        assert self.count.calls == 1
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    def test_positive_short_circuit(self, backend):
+        program = [(PUSH, True), (PUSH, 'A'), (CALL, self.count), (PUSH, 'B'), (CALL, self.equal),
+                   (CALL, self.disjunction)]
+        compiled = CompiledExpression('', LazyTransformer.transform(program), backend)
+
+        assert compiled.evaluate() == 'True'
+        assert self.count.calls == 0
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    def test_positive_memo_in_skipped_branch(self, backend):
+        memo = (0, ((PUSH, 'A'), (CALL, self.count)))
+        program = [(PUSH, False), (MEMO, memo), (PUSH, 'B'), (CALL, self.function_if),
+                   (MEMO, memo), (CALL, self.equal)]
+        compiled = CompiledExpression('', LazyTransformer.transform(program), backend)
+
+        assert compiled.evaluate() is None
+        assert self.count.calls == 1
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    def test_negative_invalid_condition(self, backend):
+        program = [(PUSH, 'A'), (PUSH, 'B'), (PUSH, 'C'), (CALL, self.function_if)]
+        compiled = CompiledExpression('', LazyTransformer.transform(program), backend)
+
+        with pytest.raises(ExpressionError) as ex:
+            compiled.evaluate()
+        assert 'Invalid arguments for function IF' in str(ex.value)
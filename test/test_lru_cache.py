@@ -0,0 +1,91 @@
+from s2e2.lru_cache import LruCache
+
+import pytest
+
+
+class TestLruCache:
+
+    def test_positive_put_get_result_value(self):
+        cache = LruCache(2)
+        cache.put('A', 1)
+        assert cache.get('A') == 1
+
+
+    def test_positive_missing_key_result_value(self):
+        cache = LruCache(2)
+        assert cache.get('A') is None
+
+
+    def test_positive_entries_limit_eviction(self):
+        cache = LruCache(2)
+        cache.put('A', 1)
+        cache.put('B', 2)
+        cache.put('C', 3)
+        assert cache.get('A') is None
+        assert len(cache) == 2
+
+
+    def test_positive_least_recently_used_eviction(self):
+        cache = LruCache(2)
+        cache.put('A', 1)
+        cache.put('B', 2)
+        cache.get('A')
+        cache.put('C', 3)
+        assert cache.get('A') == 1
+        assert cache.get('B') is None
+
+
+    def test_positive_bytes_limit_eviction(self):
+        cache = LruCache(10, 25, lambda key, value: value)
+        cache.put('A', 10)
+        cache.put('B', 10)
+        cache.put('C', 10)
+        assert cache.get('A') is None
+        assert cache.get_statistics().bytes == 20
+
+
+    def test_positive_too_big_entry_not_cached(self):
+        cache = LruCache(10, 5, lambda key, value: value)
+        cache.put('A', 10)
+        assert len(cache) == 0
+
+
+    def test_positive_disabled_cache(self):
+        cache = LruCache(0)
+        cache.put('A', 1)
+        assert cache.get('A') is None
+
+
+    def test_positive_replace_entry_bytes(self):
+        cache = LruCache(10, 100, lambda key, value: value)
+        cache.put('A', 10)
+        cache.put('A', 20)
+        assert cache.get_statistics().bytes == 20
+
+
+    def test_positive_statistics(self):
+        cache = LruCache(1)
+        cache.put('A', 1)
+        cache.get('A')
+        cache.get('B')
+        cache.put('B', 2)
+
+        statistics = cache.get_statistics()
+
+        assert statistics.hits == 1
+        assert statistics.misses == 1
+        assert statistics.evictions == 1
+        assert statistics.entries == 1
+
+
+    def test_positive_clear(self):
+        cache = LruCache(2)
+        cache.put('A', 1)
+        cache.clear()
+        assert cache.get('A') is None
+
+
+    def test_negative_negative_limit(self):
+        with pytest.raises(ValueError) as ex:
+            LruCache(-1)
+        assert 'cannot be negative' in str(ex.value)
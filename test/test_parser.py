@@ -0,0 +1,204 @@
+from s2e2.converter import Converter
+from s2e2.error import ExpressionError
+from s2e2.evaluator import Evaluator
+from s2e2.node import Node
+from s2e2.parser import Parser
+from s2e2.token_type import TokenType
+from s2e2.token import Token
+from s2e2.tokenizer import Tokenizer
+
+import pytest
+
+
+class TestParser:
+
+    OPERATORS = (('||', 100, 2), ('&&', 200, 2), ('==', 300, 2), ('<', 400, 2), ('!', 600, 1))
+
+    def setup_method(self):
+        self.parser = Parser()
+        self.converter = Converter()
+        self.tokenizer = Tokenizer()
+        for name, priority, number_of_arguments in TestParser.OPERATORS:
+            self.parser.add_operator(name, priority, number_of_arguments)
+            self.converter.add_operator(name, priority)
+            self.tokenizer.add_operator(name)
+        self.tokenizer.add_function('IF')
+        self.tokenizer.add_function('F')
+
+
+    def teardown_method(self):
+        self.parser = None
+        self.converter = None
+        self.tokenizer = None
+
+
+    def parse(self, expression):
+        return self.parser.parse(self.tokenizer.tokenize(expression))
+
+
+    @staticmethod
+    def leaf(value, span, type=TokenType.ATOM):
+        return Node(type, value, (), span)
+
+
+    def test_positive_one_binary_operator_result_value(self):
+        root = self.parse('A && B')
+
+        assert root == Node(TokenType.OPERATOR, '&&', (self.leaf('A', (0, 1)), self.leaf('B', (5, 6))), (0, 6))
+        assert root.arity == 2
+
+
+    def test_positive_operators_priority_result_value(self):
+        root = self.parse('A || B && C')
+
+        assert root.value == '||'
+        assert root.children[0] == self.leaf('A', (0, 1))
+        assert root.children[1].value == '&&'
+        assert root.children[1].span == (5, 11)
+
+
+    def test_positive_left_associativity_result_value(self):
+        root = self.parse('A && B && C')
+
+        assert root.value == '&&'
+        assert root.children[0].value == '&&'
+        assert root.children[0].span == (0, 6)
+        assert root.children[1] == self.leaf('C', (10, 11))
+
+
+    def test_positive_unary_operator_result_value(self):
+        root = self.parse('!A && B')
+
+        assert root.value == '&&'
+        assert root.children[0] == Node(TokenType.OPERATOR, '!', (self.leaf('A', (1, 2)),), (0, 2))
+
+
+    def test_positive_brackets_result_value(self):
+        root = self.parse('(A || B) && C')
+
+        assert root.value == '&&'
+        assert root.children[0].value == '||'
+        assert root.children[0].span == (1, 7)
+
+
+    def test_positive_function_result_value(self):
+        root = self.parse('IF(${X} == A, B, F())')
+
+        assert root.type == TokenType.FUNCTION
+        assert root.value == 'IF'
+        assert root.arity == 3
+        assert root.span == (0, 21)
+        assert root.children[0].children[0] == self.leaf('X', (3, 7), TokenType.VARIABLE)
+        assert root.children[2] == Node(TokenType.FUNCTION, 'F', (), (17, 20))
+
+
+    def test_positive_postfix_same_as_converter(self):
+        expressions = ['A',
+                       'A && B || C == D',
+                       '!A || !(B && C)',
+                       'A < B == C < D',
+                       'IF(A == B, F(C, D), IF(E, F(), G)) && H',
+                       '((A))']
+
+        for expression in expressions:
+            infix_expression = self.tokenizer.tokenize(expression)
+            assert self.parser.parse(infix_expression).postfix() == self.converter.convert(infix_expression)
+
+
+    def test_positive_stacked_prefix_operators_postfix_differs_from_converter(self):
+        infix_expression = self.tokenizer.tokenize('!!A')
+
+        assert [token.value for token in self.parser.parse(infix_expression).postfix()] == ['A', '!', '!']
+        assert [token.value for token in self.converter.convert(infix_expression)] == ['!', 'A', '!']
+
+
+    def test_positive_stacked_prefix_operators_evaluator_parse(self):
+        evaluator = Evaluator()
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+
+        root = evaluator.parse('!!A')
+
+        assert root.value == '!'
+        assert root.children[0].value == '!'
+        with pytest.raises(ExpressionError):
+            evaluator.evaluate('!!A')
+
+
+    def test_positive_postfix_keeps_spans(self):
+        postfix = self.parse('A && B').postfix()
+
+        assert [token.span for token in postfix] == [(0, 1), (5, 6), (0, 6)]
+
+
+    def test_positive_tokens_without_spans(self):
+        root = self.parser.parse([Token(TokenType.ATOM, 'A'),
+                                  Token(TokenType.OPERATOR, '&&'),
+                                  Token(TokenType.ATOM, 'B')])
+
+        assert root.span is None
+        assert root.children[0].span is None
+
+
+    def test_positive_deep_nesting_postfix(self):
+        expression = '!' * 2 + 'A' + ' && A' * 5000
+        root = self.parse(expression)
+
+        assert len(root.postfix()) == 10003
+
+
+    def test_negative_empty_input(self):
+        with pytest.raises(TypeError):
+            self.parser.parse([])
+
+
+    def test_negative_empty_operator_name(self):
+        with pytest.raises(TypeError):
+            self.parser.add_operator(None, 1, 2)
+
+
+    def test_negative_duplicated_operator(self):
+        with pytest.raises(ExpressionError):
+            self.parser.add_operator('&&', 1, 2)
+
+
+    def test_negative_wrong_number_of_arguments(self):
+        self.parser.add_operator('?', 1, 3)
+        self.tokenizer.add_operator('?')
+
+        with pytest.raises(ExpressionError) as ex:
+            self.parse('A ? B C')
+        assert '3 arguments' in str(ex.value)
+
+
+    def test_negative_unknown_operator(self):
+        with pytest.raises(ExpressionError):
+            self.parser.parse([Token(TokenType.ATOM, 'A'),
+                               Token(TokenType.OPERATOR, '+'),
+                               Token(TokenType.ATOM, 'B')])
+
+
+    def test_negative_invalid_expressions(self):
+        expressions = ['A &&', '&& A', 'A !', 'A B', '(A && B', 'A && B)', 'IF(A, B', 'IF(A,)', 'F A', 'A, B']
+
+        for expression in expressions:
+            with pytest.raises(ExpressionError):
+                self.parse(expression)
+
+
+    def test_negative_too_deep_nesting(self):
+        with pytest.raises(ExpressionError):
+            self.parse('(' * 5000 + 'A' + ')' * 5000)
+
+
+    def test_positive_evaluator_parse(self):
+        evaluator = Evaluator()
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+
+        root = evaluator.parse('IF(A == B, C, D + E)')
+
+        assert root.value == 'IF'
+        assert root.arity == 3
+        assert root.children[2].value == '+'
+        assert evaluator.parse('A B') == Node(TokenType.ATOM, 'A B', (), (0, 3))
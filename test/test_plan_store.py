@@ -0,0 +1,205 @@
+from s2e2.evaluator import Evaluator
+from s2e2.plan_store import PlanStore
+from s2e2.token_type import TokenType
+from s2e2.token import Token
+from s2e2.tokenizer import Tokenizer
+from s2e2.converter import Converter
+
+import mock
+import pytest
+
+
+class TestPlanStore:
+
+    FINGERPRINT = 'fingerprint'
+
+    PLAN = [Token(TokenType.ATOM, 'A'),
+            Token(TokenType.ATOM, 'B'),
+            Token(TokenType.OPERATOR, '+')]
+
+
+    def setup_method(self):
+        self.evaluator = Evaluator()
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+
+    def teardown_method(self):
+        self.evaluator = None
+
+
+    def test_positive_missing_file_get_result(self, tmp_path):
+        store = PlanStore(str(tmp_path / 'plans.json'))
+        assert store.get(TestPlanStore.FINGERPRINT, 'A + B') == (False, None)
+
+
+    def test_positive_put_get_result(self, tmp_path):
+        store = PlanStore(str(tmp_path / 'plans.json'))
+        store.put(TestPlanStore.FINGERPRINT, 'A + B', TestPlanStore.PLAN)
+        assert store.get(TestPlanStore.FINGERPRINT, 'A + B') == (True, TestPlanStore.PLAN)
+
+
+    def test_positive_literal_plan_result(self, tmp_path):
+        store = PlanStore(str(tmp_path / 'plans.json'))
+        store.put(TestPlanStore.FINGERPRINT, 'A B', None)
+        assert store.get(TestPlanStore.FINGERPRINT, 'A B') == (True, None)
+
+
+    def test_positive_save_load_result(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+
+        store = PlanStore(path)
+        store.put(TestPlanStore.FINGERPRINT, 'A + B', TestPlanStore.PLAN)
+        store.save()
+
+        another_store = PlanStore(path)
+        assert another_store.get(TestPlanStore.FINGERPRINT, 'A + B') == (True, TestPlanStore.PLAN)
+
+
+    def test_positive_save_preserves_other_plans(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+
+        first_store = PlanStore(path)
+        second_store = PlanStore(path)
+        first_store.put(TestPlanStore.FINGERPRINT, 'A + B', TestPlanStore.PLAN)
+        second_store.put(TestPlanStore.FINGERPRINT, 'C D', None)
+        first_store.save()
+        second_store.save()
+
+        store = PlanStore(path)
+        assert store.get(TestPlanStore.FINGERPRINT, 'A + B')[0]
+        assert store.get(TestPlanStore.FINGERPRINT, 'C D')[0]
+
+
+    def test_positive_another_fingerprint_result(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+
+        store = PlanStore(path)
+        store.put(TestPlanStore.FINGERPRINT, 'A + B', TestPlanStore.PLAN)
+        store.save()
+
+        another_store = PlanStore(path)
+        assert another_store.get('another', 'A + B') == (False, None)
+
+
+    def test_positive_fingerprint_change_keeps_new_plans(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+
+        store = PlanStore(path)
+        store.put(TestPlanStore.FINGERPRINT, 'A + B', TestPlanStore.PLAN)
+        store.put('another', 'C D', None)
+        store.save()
+
+        another_store = PlanStore(path)
+        assert another_store.get(TestPlanStore.FINGERPRINT, 'A + B') == (True, TestPlanStore.PLAN)
+        assert another_store.get('another', 'C D') == (True, None)
+
+
+    def test_positive_least_recently_saved_fingerprints_dropped(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+
+        store = PlanStore(path)
+        for index in range(PlanStore.MAX_FINGERPRINTS + 1):
+            store.put(str(index), 'A + B', TestPlanStore.PLAN)
+            store.save()
+
+        another_store = PlanStore(path)
+        assert another_store.get('0', 'A + B') == (False, None)
+        assert another_store.get(str(PlanStore.MAX_FINGERPRINTS), 'A + B') == (True, TestPlanStore.PLAN)
+
+
+    def test_positive_broken_file_result(self, tmp_path):
+        path = tmp_path / 'plans.json'
+        path.write_text('{broken')
+
+        store = PlanStore(str(path))
+        assert store.get(TestPlanStore.FINGERPRINT, 'A + B') == (False, None)
+
+
+    def test_positive_evaluator_fills_store(self, tmp_path):
+        store = PlanStore(str(tmp_path / 'plans.json'))
+        self.evaluator.set_plan_store(store)
+
+        self.evaluator.evaluate('A + B')
+        self.evaluator.evaluate('A B')
+
+        assert len(store) == 2
+
+
+    def test_positive_evaluator_uses_store_verify_tokenizer(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+        expression = 'IF(A == B, C, D + E)'
+
+        store = PlanStore(path)
+        self.evaluator.set_plan_store(store)
+        expected_result = self.evaluator.evaluate(expression)
+        store.save()
+
+        tokenizer_mock = mock.Mock(spec=Tokenizer)
+        evaluator = Evaluator.mocked(Converter(), tokenizer_mock)
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        evaluator.set_plan_store(PlanStore(path))
+
+        assert evaluator.evaluate(expression) == expected_result
+        tokenizer_mock.tokenize.assert_not_called()
+
+
+    def test_positive_evaluator_literal_from_store_result(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+
+        store = PlanStore(path)
+        self.evaluator.set_plan_store(store)
+        self.evaluator.evaluate('NULL')
+        store.save()
+
+        evaluator = Evaluator()
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        evaluator.set_plan_store(PlanStore(path))
+
+        assert evaluator.evaluate('NULL') == 'NULL'
+
+
+    def test_positive_evaluator_registry_change_invalidates_store(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+
+        store = PlanStore(path)
+        self.evaluator.set_plan_store(store)
+        self.evaluator.evaluate('A + B')
+        self.evaluator.evaluate('A + C')
+        store.save()
+
+        evaluator = Evaluator()
+        evaluator.add_standard_operators()
+        store = PlanStore(path)
+        evaluator.set_plan_store(store)
+        evaluator.evaluate('A + B')
+
+        assert len(store) == 1
+
+
+    def test_positive_evaluator_registry_change_before_save_keeps_plans(self, tmp_path):
+        path = str(tmp_path / 'plans.json')
+
+        store = PlanStore(path)
+        self.evaluator.set_plan_store(store)
+        self.evaluator.evaluate('A + B')
+        self.evaluator.remove_operator('+')
+        self.evaluator.evaluate('A < B')
+        store.save()
+
+        evaluator = Evaluator()
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        store = PlanStore(path)
+        evaluator.set_plan_store(store)
+
+        with mock.patch.object(Converter, 'convert', side_effect=AssertionError('plan is not stored')):
+            assert evaluator.evaluate('A + B') == 'AB'
+
+
+    def test_negative_empty_path(self):
+        with pytest.raises(TypeError) as ex:
+            PlanStore('')
+        assert 'without a path' in str(ex.value)
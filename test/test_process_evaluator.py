@@ -0,0 +1,128 @@
+from s2e2 import process_evaluator
+from s2e2.compiled_expression import CompiledExpression
+from s2e2.error import ExpressionError
+from s2e2.evaluator import Evaluator
+from s2e2.process_evaluator import ProcessEvaluator
+
+from s2e2.functions.function import Function
+
+import os
+import pytest
+import mock
+
+
+class TestProcessEvaluator:
+
+    class PidFunction(Function):
+        """
+        Function PID(<value>) returns the value and identifier of the process evaluating it.
+        """
+        def __init__(self):
+            super().__init__('PID', 1)
+
+        def _check_arguments(self, arguments):
+            return isinstance(arguments[0], str)
+
+        def _result(self, arguments):
+            return '{}:{}'.format(arguments[0], os.getpid())
+
+
+    @classmethod
+    def setup_class(cls):
+        evaluator = Evaluator()
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        evaluator.add_function(TestProcessEvaluator.PidFunction())
+        cls.process_evaluator = ProcessEvaluator(evaluator, workers=2, chunk_size=3)
+
+
+    @classmethod
+    def teardown_class(cls):
+        cls.process_evaluator.close()
+
+
+    def test_negative_no_evaluator(self):
+        with pytest.raises(TypeError):
+            ProcessEvaluator(None)
+
+
+    def test_negative_zero_chunk_size(self):
+        with pytest.raises(ValueError):
+            ProcessEvaluator(Evaluator(), chunk_size=0)
+
+
+    def test_positive_evaluate_many_results(self):
+        expressions = ['A{} + B'.format(index) for index in range(20)]
+        results = self.process_evaluator.evaluate_many(expressions)
+
+        assert results == ['A{}B'.format(index) for index in range(20)]
+
+
+    def test_positive_evaluated_by_other_processes(self):
+        results = self.process_evaluator.evaluate_many(['PID(A{})'.format(index) for index in range(20)])
+
+        assert results == ['A{}:{}'.format(index, result.split(':')[1]) for index, result in enumerate(results)]
+        assert str(os.getpid()) not in set(result.split(':')[1] for result in results)
+
+
+    def test_positive_evaluate_many_bindings_results(self):
+        results = self.process_evaluator.evaluate_many(['${A} + B', 'B + ${A}'], {'A': 'X'})
+
+        assert results == ['XB', 'BX']
+
+
+    def test_positive_evaluate_many_return_exceptions(self):
+        results = self.process_evaluator.evaluate_many(['A + B', 'A +', '', '${A}'], return_exceptions=True)
+
+        assert results[0] == 'AB'
+        assert isinstance(results[1], ExpressionError)
+        assert isinstance(results[2], TypeError)
+        assert isinstance(results[3], ExpressionError)
+
+
+    def test_positive_worker_return_exceptions_evaluates_distinct_expressions_once(self):
+        evaluator = Evaluator()
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+
+        with mock.patch.object(process_evaluator, '_worker_evaluator', evaluator.freeze()), \
+                mock.patch.object(CompiledExpression, 'evaluate', autospec=True,
+                                  side_effect=CompiledExpression.evaluate) as evaluate_spy:
+            results = process_evaluator._evaluate_expressions(['A + B', 'A +', '${A}', 'A + B', 'A +', '${A}'],
+                                                              None, True)
+
+        assert results[0] == results[3] == 'AB'
+        assert isinstance(results[1], ExpressionError) and results[4] is results[1]
+        assert isinstance(results[2], ExpressionError) and results[5] is results[2]
+        assert evaluate_spy.call_count == 3
+
+
+    def test_negative_evaluate_many_invalid_expression(self):
+        with pytest.raises(ExpressionError):
+            self.process_evaluator.evaluate_many(['A + B', 'A +'])
+
+
+    def test_positive_stream_map_results(self):
+        records = ({'A': str(index)} for index in range(50))
+        results = list(self.process_evaluator.stream_map('IF(${A} < 3, low, high)', records))
+
+        assert results == ['low' if str(index) < '3' else 'high' for index in range(50)]
+
+
+    def test_positive_stream_filter_results(self):
+        records = [{'level': level, 'line': line} for line, level in enumerate(['ERROR', 'INFO', 'WARN'] * 5)]
+        selected = self.process_evaluator.stream_filter('${level} == ERROR || ${level} == WARN', records)
+
+        assert [record['line'] for record in selected] == [line for line in range(15) if line % 3 != 1]
+
+
+    def test_negative_stream_map_invalid_expression(self):
+        with pytest.raises(ExpressionError):
+            self.process_evaluator.stream_map('(${A} + B', [])
+
+
+    def test_negative_stream_map_undefined_variable(self):
+        results = self.process_evaluator.stream_map('${A} + ${B}', [{'A': 'X', 'B': 'Y'}, {'A': 'X'}])
+
+        with pytest.raises(ExpressionError):
+            list(results)
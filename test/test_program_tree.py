@@ -0,0 +1,54 @@
+from s2e2.instructions import PUSH, CALL
+from s2e2.program_tree import ProgramTree
+
+from s2e2.functions.function_if import FunctionIf
+from s2e2.operators.operator_not import OperatorNot
+from s2e2.operators.operator_plus import OperatorPlus
+
+
+class TestProgramTree:
+
+    def setup_method(self):
+        self.plus = OperatorPlus()
+        self.negation = OperatorNot()
+        self.function_if = FunctionIf()
+
+
+    def teardown_method(self):
+        self.plus = None
+        self.negation = None
+        self.function_if = None
+
+
+    def test_positive_single_value_tree(self):
+        tree = ProgramTree.build([(PUSH, 'A')])
+        assert tree.root == 0
+        assert tree.children == [()]
+        assert tree.starts == [0]
+
+
+    def test_positive_nested_calls_tree(self):
+        program = [(PUSH, 'A'), (CALL, self.negation),
+                   (PUSH, 'B'), (PUSH, 'C'), (CALL, self.plus),
+                   (PUSH, 'D'), (CALL, self.function_if)]
+        tree = ProgramTree.build(program)
+
+        assert tree.root == 6
+        assert tree.children[6] == (1, 4, 5)
+        assert tree.children[4] == (2, 3)
+        assert tree.children[1] == (0,)
+        assert tree.starts == [0, 0, 2, 3, 2, 5, 0]
+
+
+    def test_positive_subprogram(self):
+        program = [(PUSH, 'A'), (PUSH, 'B'), (PUSH, 'C'), (CALL, self.plus), (CALL, self.plus)]
+        tree = ProgramTree.build(program)
+        assert tree.subprogram(3) == program[1:4]
+
+
+    def test_negative_few_arguments(self):
+        assert ProgramTree.build([(PUSH, 'A'), (CALL, self.plus)]) is None
+
+
+    def test_negative_few_operators(self):
+        assert ProgramTree.build([(PUSH, 'A'), (PUSH, 'B')]) is None
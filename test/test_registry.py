@@ -0,0 +1,49 @@
+from s2e2.error import ExpressionError
+from s2e2.registry import Registry
+from s2e2.token_type import TokenType
+from s2e2.token import Token
+
+from s2e2.functions.function_if import FunctionIf
+from s2e2.operators.operator_and import OperatorAnd
+from s2e2.operators.operator_plus import OperatorPlus
+
+import pytest
+
+
+class TestRegistry:
+
+    def test_positive_build_components(self):
+        registry = Registry.build(3, {'IF': FunctionIf()}, {'+': OperatorPlus()})
+
+        assert registry.version == 3
+        assert registry.tokenizer.tokenize('IF(A+B)') == [Token(TokenType.FUNCTION, 'IF'),
+                                                          Token(TokenType.LEFT_BRACKET, '('),
+                                                          Token(TokenType.ATOM, 'A'),
+                                                          Token(TokenType.OPERATOR, '+'),
+                                                          Token(TokenType.ATOM, 'B'),
+                                                          Token(TokenType.RIGHT_BRACKET, ')')]
+        assert registry.parser.parse(registry.tokenizer.tokenize('A+B')).value == '+'
+
+
+    def test_positive_mappings_are_copied_and_read_only(self):
+        functions = {'IF': FunctionIf()}
+        registry = Registry.build(0, functions, {})
+        functions.clear()
+
+        assert list(registry.functions) == ['IF']
+        with pytest.raises(TypeError):
+            registry.functions['REPLACE'] = None
+
+
+    def test_positive_fingerprint_does_not_depend_on_version(self):
+        first = Registry.build(0, {'IF': FunctionIf()}, {'&&': OperatorAnd()})
+        second = Registry.build(5, {'IF': FunctionIf()}, {'&&': OperatorAnd()})
+        third = Registry.build(5, {'IF': FunctionIf()}, {'+': OperatorPlus()})
+
+        assert first.fingerprint == second.fingerprint
+        assert first.fingerprint != third.fingerprint
+
+
+    def test_negative_name_collision(self):
+        with pytest.raises(ExpressionError):
+            Registry.build(0, {'&&': FunctionIf()}, {'&&': OperatorAnd()})
@@ -3,11 +3,54 @@ from s2e2.splitter import Splitter
 from s2e2.token_type import TokenType
 from s2e2.token import Token
 
+import random
+import string
 import pytest
 
 
 class TestSplitter:
 
+    # Symbols of randomly generated expressions.
+    ALPHABET = 'AB+=$,()"\\ \t\n\xa0'
+
+    @staticmethod
+    def split_by_symbols(expression, type_by_value):
+        """
+        Reference splitting symbol by symbol, the way the splitter used to work.
+        """
+        tokens = []
+        current = ''
+        inside_quotes = False
+
+        def flush():
+            nonlocal current
+            if not inside_quotes:
+                current = current.strip()
+            if current or inside_quotes:
+                tokens.append(Token(TokenType.ATOM if inside_quotes else type_by_value(current), current))
+                current = ''
+
+        for symbol in expression:
+            if symbol in ',()' and not inside_quotes:
+                flush()
+                tokens.append(Token({',': TokenType.COMMA,
+                                     '(': TokenType.LEFT_BRACKET,
+                                     ')': TokenType.RIGHT_BRACKET}[symbol], symbol))
+            elif symbol == '"':
+                if inside_quotes and current.endswith('\\'):
+                    current = current[:-1] + symbol
+                else:
+                    flush()
+                    inside_quotes = not inside_quotes
+            elif inside_quotes or symbol not in string.whitespace:
+                current += symbol
+            else:
+                flush()
+
+        flush()
+        return tokens
+
+
     def setup(self):
         self.splitter = Splitter(lambda x: TokenType.ATOM)
 
@@ -67,3 +110,47 @@ class TestSplitter:
         with pytest.raises(TypeError) as ex:
             splitter = Splitter(None)
         assert 'is None' in str(ex.value)
+
+
+    def test_positive_escaped_quotes(self):
+        expression = '"A \\" B \\\\" C" D'
+        expected_tokens = [Token(TokenType.ATOM, 'A " B \\" C'),
+                           Token(TokenType.ATOM, 'D')]
+
+        actual_tokens = self.splitter.split_into_tokens(expression)
+
+        assert actual_tokens == expected_tokens
+
+
+    def test_positive_unterminated_quoted_atom(self):
+        expression = 'A "B, C'
+        expected_tokens = [Token(TokenType.ATOM, 'A'),
+                           Token(TokenType.ATOM, 'B, C')]
+
+        actual_tokens = self.splitter.split_into_tokens(expression)
+
+        assert actual_tokens == expected_tokens
+
+
+    def test_positive_long_quoted_atom(self):
+        payload = 'x\\"' * 100000
+        expression = 'A + "{}"'.format(payload)
+
+        actual_tokens = self.splitter.split_into_tokens(expression)
+
+        assert [token.value for token in actual_tokens] == ['A', '+', payload.replace('\\"', '"')]
+
+
+    def test_positive_random_expressions_split_by_symbols(self):
+        generator = random.Random(0)
+        type_by_value = lambda value: TokenType.OPERATOR if value == '+' else TokenType.ATOM
+        splitter = Splitter(type_by_value)
+
+        for _ in range(5000):
+            expression = ''.join(generator.choice(TestSplitter.ALPHABET) for _ in range(generator.randrange(30)))
+            expected_tokens = TestSplitter.split_by_symbols(expression, type_by_value)
+
+            actual_tokens = splitter.split_into_tokens(expression)
+
+            assert [(token.type, token.value) for token in actual_tokens] == \
+                   [(token.type, token.value) for token in expected_tokens], expression
@@ -0,0 +1,105 @@
+from s2e2.backend import Backend
+from s2e2.compiled_expression import CompiledExpression
+from s2e2.instructions import PUSH, CALL, MEMO
+from s2e2.subexpression_eliminator import SubexpressionEliminator
+
+from s2e2.functions.function import Function
+from s2e2.functions.function_now import FunctionNow
+from s2e2.operators.operator_equal import OperatorEqual
+from s2e2.operators.operator_plus import OperatorPlus
+
+import pytest
+
+
+class TestSubexpressionEliminator:
+
+    class CountingFunction(Function):
+        pure = True
+
+        def __init__(self):
+            super().__init__('COUNT', 1)
+            self.calls = 0
+
+        def _check_arguments(self):
+            return True
+
+        def _result(self):
+            self.calls += 1
+            return self._arguments[0] + '!'
+
+
+    def setup_method(self):
+        self.count = TestSubexpressionEliminator.CountingFunction()
+        self.plus = OperatorPlus()
+        self.equal = OperatorEqual()
+        self.now = FunctionNow()
+
+
+    def teardown_method(self):
+        self.count = None
+        self.plus = None
+        self.equal = None
+        self.now = None
+
+
+    def test_positive_repeated_subtree_merged(self):
+        program = [(PUSH, 'A'), (CALL, self.count), (PUSH, 'A'), (CALL, self.count), (CALL, self.plus)]
+        memo = (0, ((PUSH, 'A'), (CALL, self.count)))
+
+        assert SubexpressionEliminator.eliminate(program) == ([(MEMO, memo), (MEMO, memo), (CALL, self.plus)], 1)
+
+
+    def test_positive_different_subtrees_not_merged(self):
+        program = [(PUSH, 'A'), (CALL, self.count), (PUSH, 'B'), (CALL, self.count), (CALL, self.plus)]
+        assert SubexpressionEliminator.eliminate(program) == (program, 0)
+
+
+    def test_positive_repeated_constant_not_merged(self):
+        program = [(PUSH, 'A'), (PUSH, 'A'), (CALL, self.plus)]
+        assert SubexpressionEliminator.eliminate(program) == (program, 0)
+
+
+    def test_positive_impure_subtree_not_merged(self):
+        program = [(CALL, self.now), (CALL, self.now), (CALL, self.equal)]
+        assert SubexpressionEliminator.eliminate(program) == (program, 0)
+
+
+    def test_positive_outermost_subtree_merged(self):
+        subtree = [(PUSH, 'A'), (CALL, self.count), (CALL, self.count)]
+        program = subtree + subtree + [(CALL, self.plus)]
+
+        result, merged = SubexpressionEliminator.eliminate(program)
+
+        assert merged == 1
+        assert result[0] == result[1]
+        assert result[0][1][1] == tuple(subtree)
+
+
+    def test_positive_nested_repeated_subtree_merged(self):
+        inner = [(PUSH, 'A'), (CALL, self.count)]
+        outer = inner + [(CALL, self.count)]
+        program = outer + outer + [(CALL, self.plus)] + inner + [(CALL, self.plus)]
+
+        result, merged = SubexpressionEliminator.eliminate(program)
+
+        assert merged == 2
+        assert CompiledExpression('', result).evaluate() == 'A!!A!!A!'
+
+
+    def test_positive_invalid_program_not_changed(self):
+        program = [(PUSH, 'A'), (CALL, self.plus)]
+        assert SubexpressionEliminator.eliminate(program) == (program, 0)
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    def test_positive_merged_subtree_evaluated_once(self, backend):
+        subtree = [(PUSH, 'A'), (CALL, self.count)]
+        program, _ = SubexpressionEliminator.eliminate(subtree + subtree + [(CALL, self.plus)] +
+                                                       subtree + [(CALL, self.plus)])
+        compiled = CompiledExpression('', program, backend)
+
+        assert compiled.evaluate() == 'A!A!A!'
+        assert self.count.calls == 1
+
+        assert compiled.evaluate() == 'A!A!A!'
+        assert self.count.calls == 2
@@ -0,0 +1,166 @@
+from s2e2.backend import Backend
+from s2e2.evaluator import Evaluator
+
+from s2e2.functions.function import Function
+
+import concurrent.futures
+import sys
+import threading
+import pytest
+
+
+class TestThreadSafety:
+
+    class NestedFunction(Function):
+        """
+        Function NESTED(<expression>, <suffix>) evaluates the expression by the same evaluator.
+        """
+        def __init__(self, evaluator):
+            super().__init__('NESTED', 2)
+            self.evaluator = evaluator
+
+        def _check_arguments(self, arguments):
+            return isinstance(arguments[0], str) and isinstance(arguments[1], str)
+
+        def _result(self, arguments):
+            value = self.evaluator.evaluate(arguments[0])
+            return value + arguments[1]
+
+
+    class LegacyFunction(Function):
+        """
+        Function LEGACY(<value>, <suffix>) reads its arguments from self._arguments.
+        """
+        def __init__(self, evaluator):
+            super().__init__('LEGACY', 2)
+            self.evaluator = evaluator
+
+        def _check_arguments(self):
+            return isinstance(self._arguments[0], str) and isinstance(self._arguments[1], str)
+
+        def _result(self):
+            value = self.evaluator.evaluate('LEGACY(' + self._arguments[0][1:] + ', "-")') \
+                    if len(self._arguments[0]) > 1 else ''
+            return value + self._arguments[0] + self._arguments[1]
+
+
+    class VersionFunction(Function):
+        """
+        Function VERSION() returns the version it was created with.
+        """
+        def __init__(self, version):
+            super().__init__('VERSION', 0)
+            self.version = str(version)
+
+        def _check_arguments(self, arguments):
+            return True
+
+        def _result(self, arguments):
+            return self.version
+
+
+    THREADS = 8
+
+    ITERATIONS = 100
+
+    def setup_method(self):
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+
+    def teardown_method(self):
+        sys.setswitchinterval(self.switch_interval)
+
+
+    @staticmethod
+    def legacy_value(value, suffix):
+        prefix = TestThreadSafety.legacy_value(value[1:], '-') if len(value) > 1 else ''
+        return prefix + value + suffix
+
+
+    def make_evaluator(self, backend, lazy):
+        evaluator = Evaluator(backend=backend, lazy=lazy, cache_size=16)
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        evaluator.add_function(TestThreadSafety.NestedFunction(evaluator))
+        evaluator.add_function(TestThreadSafety.LegacyFunction(evaluator))
+        return evaluator
+
+
+    def test_positive_nested_evaluation_result(self):
+        evaluator = self.make_evaluator(Backend.INTERPRETER, False)
+        assert evaluator.evaluate('NESTED("A + NESTED(B, C)", D)') == 'ABCD'
+
+
+    def test_positive_legacy_nested_evaluation_result(self):
+        evaluator = self.make_evaluator(Backend.INTERPRETER, False)
+        assert evaluator.evaluate('LEGACY(abc, "!")') == 'c-bc-abc!'
+
+
+    @pytest.mark.parametrize('backend', [Backend.INTERPRETER, Backend.CODE_GENERATOR])
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_positive_shared_evaluator_results(self, backend, lazy):
+        evaluator = self.make_evaluator(backend, lazy)
+        barrier = threading.Barrier(TestThreadSafety.THREADS)
+
+        def run(thread):
+            barrier.wait()
+            mismatches = []
+
+            for iteration in range(TestThreadSafety.ITERATIONS):
+                value = '{}_{}'.format(thread, iteration)
+                condition = value if iteration % 2 else 'other'
+                # a distinct expression every few iterations keeps the cache evicting entries
+                expression = 'IF(${{A}} == {0}, NESTED("{1} + {2}", ${{A}}), LEGACY(${{A}}, "{1}"))'.format(
+                    condition, iteration % 20, value)
+                if iteration % 2:
+                    expected = str(iteration % 20) + value + value
+                else:
+                    expected = TestThreadSafety.legacy_value(value, str(iteration % 20))
+
+                result = evaluator.evaluate(expression, bindings={'A': value})
+                if result != expected:
+                    mismatches.append((expression, result, expected))
+
+            return mismatches
+
+        with concurrent.futures.ThreadPoolExecutor(TestThreadSafety.THREADS) as executor:
+            results = list(executor.map(run, range(TestThreadSafety.THREADS)))
+
+        assert all(not mismatches for mismatches in results)
+
+
+    def test_positive_registry_changes_while_evaluating(self):
+        evaluator = self.make_evaluator(Backend.INTERPRETER, False)
+        versions = [TestThreadSafety.VersionFunction(version) for version in range(2)]
+        evaluator.add_function(versions[0])
+        stop = threading.Event()
+
+        def swap():
+            iteration = 0
+            while not stop.is_set():
+                iteration += 1
+                evaluator.replace_function(versions[iteration % 2])
+
+        def run(thread):
+            errors = []
+            for iteration in range(TestThreadSafety.ITERATIONS):
+                try:
+                    result = evaluator.evaluate('VERSION() + {}'.format(iteration % 20))
+                except Exception as error:
+                    errors.append(error)
+                    continue
+                if result not in ('0{}'.format(iteration % 20), '1{}'.format(iteration % 20)):
+                    errors.append(result)
+            return errors
+
+        swapper = threading.Thread(target=swap)
+        swapper.start()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(TestThreadSafety.THREADS) as executor:
+                results = list(executor.map(run, range(TestThreadSafety.THREADS)))
+        finally:
+            stop.set()
+            swapper.join()
+
+        assert all(not errors for errors in results)
@@ -0,0 +1,222 @@
+from s2e2.clock import BatchClock
+from s2e2.error import ExpressionError
+from s2e2.evaluator import Evaluator
+from s2e2.threaded_evaluator import ThreadedEvaluator
+
+from s2e2.functions.function import Function
+
+import datetime
+import mock
+import threading
+import pytest
+
+
+class TestThreadedEvaluator:
+
+    class WaitFunction(Function):
+        """
+        Function WAIT(<value>) waits until all parties reach the barrier and returns the value.
+        """
+        def __init__(self, barrier):
+            super().__init__('WAIT', 1)
+            self.barrier = barrier
+            self.calls = 0
+            self.lock = threading.Lock()
+
+        def _check_arguments(self, arguments):
+            return isinstance(arguments[0], str)
+
+        def _result(self, arguments):
+            with self.lock:
+                self.calls += 1
+            self.barrier.wait()
+            return arguments[0]
+
+
+    class BlockFunction(Function):
+        """
+        Function BLOCK(<value>) waits until the event is set and returns the value.
+        """
+        def __init__(self, event):
+            super().__init__('BLOCK', 1)
+            self.event = event
+
+        def _check_arguments(self, arguments):
+            return isinstance(arguments[0], str)
+
+        def _result(self, arguments):
+            self.event.wait(TestThreadedEvaluator.TIMEOUT)
+            return arguments[0]
+
+
+    class CountFunction(Function):
+        """
+        Function COUNT(<value>) is pure and counts its calls.
+        """
+        pure = True
+
+        def __init__(self):
+            super().__init__('COUNT', 1)
+            self.calls = 0
+            self.lock = threading.Lock()
+
+        def _check_arguments(self, arguments):
+            return isinstance(arguments[0], str)
+
+        def _result(self, arguments):
+            with self.lock:
+                self.calls += 1
+            return arguments[0]
+
+
+    WORKERS = 4
+
+    TIMEOUT = 10
+
+    def make_evaluator(self, *functions):
+        evaluator = Evaluator()
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        for function in functions:
+            evaluator.add_function(function)
+        return evaluator
+
+
+    def test_negative_no_evaluator(self):
+        with pytest.raises(TypeError):
+            ThreadedEvaluator(None)
+
+
+    def test_negative_no_workers(self):
+        with pytest.raises(ValueError):
+            ThreadedEvaluator(self.make_evaluator(), workers=0)
+
+
+    def test_positive_concurrent_evaluation_results(self):
+        barrier = threading.Barrier(TestThreadedEvaluator.WORKERS, timeout=TestThreadedEvaluator.TIMEOUT)
+        evaluator = self.make_evaluator(TestThreadedEvaluator.WaitFunction(barrier))
+        expressions = ['WAIT(A{}) + B'.format(index) for index in range(TestThreadedEvaluator.WORKERS * 3)]
+
+        with ThreadedEvaluator(evaluator, workers=TestThreadedEvaluator.WORKERS) as threaded_evaluator:
+            results = threaded_evaluator.evaluate_many(expressions)
+
+        # the barrier is passed only if all workers evaluate at once
+        assert results == ['A{}B'.format(index) for index in range(TestThreadedEvaluator.WORKERS * 3)]
+
+
+    def test_positive_submit_result(self):
+        with ThreadedEvaluator(self.make_evaluator()) as threaded_evaluator:
+            future = threaded_evaluator.submit('${A} + B', {'A': 'X'})
+            assert future.result() == 'XB'
+
+
+    def test_positive_bindings_results(self):
+        with ThreadedEvaluator(self.make_evaluator(), workers=2) as threaded_evaluator:
+            results = threaded_evaluator.evaluate_many(['${A} + B', 'B + ${A}'], {'A': 'X'})
+
+        assert results == ['XB', 'BX']
+
+
+    def test_positive_pure_duplicates_evaluated_once(self):
+        function = TestThreadedEvaluator.CountFunction()
+        evaluator = self.make_evaluator(function)
+
+        with ThreadedEvaluator(evaluator, workers=2) as threaded_evaluator:
+            results = threaded_evaluator.evaluate_many(['COUNT(A)', 'COUNT(B)', 'COUNT(A)', 'COUNT(A)'])
+
+        assert results == ['A', 'B', 'A', 'A']
+        assert function.calls == 2
+
+
+    def test_positive_impure_duplicates_evaluated_every_time(self):
+        barrier = threading.Barrier(1)
+        function = TestThreadedEvaluator.WaitFunction(barrier)
+        evaluator = self.make_evaluator(function)
+
+        with ThreadedEvaluator(evaluator, workers=2) as threaded_evaluator:
+            results = threaded_evaluator.evaluate_many(['WAIT(A)'] * 3)
+
+        assert results == ['A'] * 3
+        assert function.calls == 3
+
+
+    def test_positive_batch_clock_frozen_within_batch(self):
+        evaluator = Evaluator(clock=BatchClock(mock.Mock(side_effect=[datetime.datetime(2020, 5, 17, 10, 30, 42),
+                                                                      datetime.datetime(2020, 5, 17, 10, 30, 43)])))
+        evaluator.add_standard_functions()
+        evaluator.add_standard_operators()
+        expressions = ['FORMAT_DATE(NOW(), "%S") + {}'.format(index) for index in range(8)]
+
+        with ThreadedEvaluator(evaluator, workers=TestThreadedEvaluator.WORKERS) as threaded_evaluator:
+            first = threaded_evaluator.evaluate_many(expressions)
+            second = threaded_evaluator.evaluate_many(expressions)
+
+        assert first == ['42{}'.format(index) for index in range(8)]
+        assert second == ['43{}'.format(index) for index in range(8)]
+
+
+    def test_positive_return_exceptions(self):
+        expressions = ['A + B', 'A +', '', '${A} + B', 'B + C']
+
+        with ThreadedEvaluator(self.make_evaluator(), workers=2) as threaded_evaluator:
+            results = threaded_evaluator.evaluate_many(expressions, return_exceptions=True)
+
+        assert results[0] == 'AB'
+        assert isinstance(results[1], ExpressionError)
+        assert isinstance(results[2], TypeError)
+        assert isinstance(results[3], ExpressionError)
+        assert results[4] == 'BC'
+
+
+    def test_negative_invalid_expression(self):
+        with ThreadedEvaluator(self.make_evaluator(), workers=2) as threaded_evaluator:
+            with pytest.raises(ExpressionError):
+                threaded_evaluator.evaluate_many(['A + B', 'A +', 'B + C'])
+
+
+    def test_negative_undefined_variable(self):
+        with ThreadedEvaluator(self.make_evaluator(), workers=2) as threaded_evaluator:
+            with pytest.raises(ExpressionError):
+                threaded_evaluator.evaluate_many(['A + B', '${A} + B'])
+
+
+    def test_positive_bounded_queue_results(self):
+        expressions = ['A{} + B'.format(index) for index in range(50)]
+
+        with ThreadedEvaluator(self.make_evaluator(), workers=2, max_queue_size=0) as threaded_evaluator:
+            results = threaded_evaluator.evaluate_many(expressions)
+
+        assert results == ['A{}B'.format(index) for index in range(50)]
+
+
+    def test_positive_statistics(self):
+        with ThreadedEvaluator(self.make_evaluator(), workers=2) as threaded_evaluator:
+            threaded_evaluator.evaluate_many(['A + B', '', 'A +', '${A}'], return_exceptions=True)
+            statistics = threaded_evaluator.get_statistics()
+
+        assert statistics.workers == 2
+        assert statistics.queue_depth == 0
+        assert statistics.busy_workers == 0
+        # empty expression fails on compilation and is not submitted
+        assert statistics.completed == 3
+        assert statistics.failed == 2
+        assert 0.0 <= statistics.utilization <= 1.0
+
+
+    def test_positive_statistics_while_running(self):
+        event = threading.Event()
+        evaluator = self.make_evaluator(TestThreadedEvaluator.BlockFunction(event))
+
+        with ThreadedEvaluator(evaluator, workers=2) as threaded_evaluator:
+            futures = [threaded_evaluator.submit('BLOCK(A)') for _ in range(3)]
+
+            # two workers are blocked, the third evaluation is queued
+            while threaded_evaluator.get_statistics().busy_workers < 2:
+                pass
+            statistics = threaded_evaluator.get_statistics()
+            event.set()
+
+            assert [future.result() for future in futures] == ['A'] * 3
+
+        assert statistics.busy_workers == 2
+        assert statistics.queue_depth == 1
@@ -79,6 +79,54 @@ class TestTokenizer:
         assert actual_tokens == expected_tokens
 
 
+    def test_positive_longest_operator_without_spaces_result_value(self):
+        self.tokenizer.add_operator('!')
+        self.tokenizer.add_operator('=')
+        self.tokenizer.add_operator('!=')
+        self.tokenizer.add_operator('==')
+
+        actual_tokens = self.tokenizer.tokenize('A!=!B===C')
+        expected_tokens = [Token(TokenType.ATOM, 'A'),
+                           Token(TokenType.OPERATOR, '!='),
+                           Token(TokenType.OPERATOR, '!'),
+                           Token(TokenType.ATOM, 'B'),
+                           Token(TokenType.OPERATOR, '=='),
+                           Token(TokenType.OPERATOR, '='),
+                           Token(TokenType.ATOM, 'C')]
+
+        assert actual_tokens == expected_tokens
+
+
+    def test_positive_leftmost_longest_operator_result_value(self):
+        for operator in ('!', '!=', '==', '<', '<=', '>', '>=', '&&', '||', '+'):
+            self.tokenizer.add_operator(operator)
+
+        actual_tokens = self.tokenizer.tokenize('A!==B')
+        expected_tokens = [Token(TokenType.ATOM, 'A'),
+                           Token(TokenType.OPERATOR, '!='),
+                           Token(TokenType.ATOM, '=B')]
+
+        assert actual_tokens == expected_tokens
+
+
+    def test_positive_many_operators_result_value(self):
+        for index in range(40):
+            self.tokenizer.add_operator('~{}~'.format(index))
+        self.tokenizer.add_function('FUNC')
+
+        actual_tokens = self.tokenizer.tokenize('A~7~B~39~FUNC()~3~')
+        expected_tokens = [Token(TokenType.ATOM, 'A'),
+                           Token(TokenType.OPERATOR, '~7~'),
+                           Token(TokenType.ATOM, 'B'),
+                           Token(TokenType.OPERATOR, '~39~'),
+                           Token(TokenType.FUNCTION, 'FUNC'),
+                           Token(TokenType.LEFT_BRACKET, '('),
+                           Token(TokenType.RIGHT_BRACKET, ')'),
+                           Token(TokenType.OPERATOR, '~3~')]
+
+        assert actual_tokens == expected_tokens
+
+
     def test_positive_one_function_without_arguments_result_value(self):
         self.tokenizer.add_function('FUN')
 
@@ -195,6 +243,36 @@ class TestTokenizer:
         assert actual_tokens == expected_tokens
 
 
+    def test_positive_variable_result_value(self):
+        self.tokenizer.add_operator('+')
+
+        actual_tokens = self.tokenizer.tokenize('${name}+"${quoted}"')
+        expected_tokens = [Token(TokenType.VARIABLE, 'name'),
+                           Token(TokenType.OPERATOR, '+'),
+                           Token(TokenType.ATOM, '${quoted}')]
+
+        assert actual_tokens == expected_tokens
+
+
+    def test_positive_variable_without_name_result_value(self):
+        actual_tokens = self.tokenizer.tokenize('${}')
+        expected_tokens = [Token(TokenType.ATOM, '${}')]
+
+        assert actual_tokens == expected_tokens
+
+
+    def test_positive_token_spans(self):
+        self.tokenizer.add_operator('+')
+        self.tokenizer.add_function('F')
+
+        actual_tokens = self.tokenizer.tokenize(' F(A+${B}, "C D")')
+        actual_spans = [(token.value, token.span) for token in actual_tokens]
+        expected_spans = [('F', (1, 2)), ('(', (2, 3)), ('A', (3, 4)), ('+', (4, 5)), ('B', (5, 9)),
+                          (',', (9, 10)), ('C D', (11, 16)), (')', (16, 17))]
+
+        assert actual_spans == expected_spans
+
+
     def test_negative_two_operators_with_the_same_name(self):
         self.tokenizer.add_operator('+')
 
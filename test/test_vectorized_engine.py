@@ -0,0 +1,118 @@
+from s2e2.clock import EvaluationClock
+from s2e2.error import ExpressionError
+from s2e2.evaluator import Evaluator
+from s2e2.vectorized_engine import VectorizedEngine
+
+from s2e2.functions.function import Function
+
+import datetime
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+
+class TestVectorizedEngine:
+
+    class DummyFunction(Function):
+        def __init__(self):
+            super().__init__('DUMMY', 1)
+
+        def _check_arguments(self):
+            return isinstance(self._arguments[0], str)
+
+        def _result(self):
+            return self._arguments[0].upper()
+
+
+    def setup_method(self):
+        self.evaluator = Evaluator()
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+
+    def teardown_method(self):
+        self.evaluator = None
+
+
+    @pytest.mark.parametrize('lazy', [False, True])
+    @pytest.mark.parametrize('expression', [
+        '${A} + ${B}',
+        '${C} + ${A}',
+        '${A} == ${B} || ${C} == NULL',
+        '!(${A} < ${B}) && ${A} != ""',
+        'IF(${A} == x, ${B}, ${A} + "!")',
+        'IF(${C} == NULL, ${D}, ${A})',
+        'ADD_DAYS(${D}, ${E})',
+        'FORMAT_DATE(ADD_DAYS(${D}, 1), "%Y-%m-%d")',
+        'REPLACE(${A}, x, X) + (${B} + ${B})',
+        'A + B',
+        '${C} >= ${F}',
+        '${C} <= ${F}',
+        '${C} >= ${F} && ${B} <= ${A}',
+    ])
+    def test_positive_same_as_compiled_expression(self, expression, lazy):
+        self.evaluator = Evaluator(lazy=lazy)
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+
+        columns = {
+            'A': numpy.array(['x', 'y', '', 'z']),
+            'B': numpy.array(['x', 'q', 'w', '']),
+            'C': numpy.array(['x', None, 'w', 'z'], dtype=object),
+            'D': numpy.array(['2020-01-01T10:00', '2021-05-06', '2022-02-28', '2019-12-31'], dtype='datetime64[s]'),
+            'E': numpy.array([1, '2', 3, -1], dtype=object),
+            'F': numpy.array(['a', None, 'z', ''], dtype=object),
+        }
+        rows = [{name: VectorizedEngine.to_objects(column)[index] for name, column in columns.items()}
+                for index in range(4)]
+
+        compiled = self.evaluator.compile(expression)
+        results = VectorizedEngine.evaluate(compiled, columns)
+
+        assert list(results) == [compiled.evaluate(row) for row in rows]
+
+
+    def test_positive_custom_function_called_per_row(self):
+        self.evaluator.add_function(TestVectorizedEngine.DummyFunction())
+        compiled = self.evaluator.compile('DUMMY(${A}) + ${A}')
+
+        results = VectorizedEngine.evaluate(compiled, {'A': numpy.array(['a', 'b'])})
+
+        assert list(results) == ['Aa', 'Bb']
+
+
+    def test_positive_no_variables_result(self):
+        compiled = self.evaluator.compile('A + B')
+        assert list(VectorizedEngine.evaluate(compiled, {})) == ['AB']
+
+
+    def test_positive_clock_of_evaluator(self):
+        self.evaluator = Evaluator(clock=EvaluationClock(lambda: datetime.datetime(2000, 1, 1)))
+        self.evaluator.add_standard_functions()
+        self.evaluator.add_standard_operators()
+        compiled = self.evaluator.compile('${A} + FORMAT_DATE(NOW(), "%Y")')
+
+        results = VectorizedEngine.evaluate(compiled, {'A': numpy.array(['a', 'b'])})
+
+        assert list(results) == ['a2000', 'b2000']
+
+
+    def test_negative_undefined_variable(self):
+        compiled = self.evaluator.compile('${A} + ${B}')
+        with pytest.raises(ExpressionError) as ex:
+            VectorizedEngine.evaluate(compiled, {'A': numpy.array(['a'])})
+        assert 'Undefined variable B' in str(ex.value)
+
+
+    def test_negative_invalid_arguments(self):
+        compiled = self.evaluator.compile('${A} < ${B}')
+        with pytest.raises(ExpressionError) as ex:
+            VectorizedEngine.evaluate(compiled, {'A': numpy.array(['a', None]), 'B': numpy.array(['b', 'c'])})
+        assert 'Invalid arguments for operator <' in str(ex.value)
+
+
+    def test_negative_different_lengths(self):
+        compiled = self.evaluator.compile('${A} + ${B}')
+        with pytest.raises(ValueError) as ex:
+            VectorizedEngine.evaluate(compiled, {'A': numpy.array(['a']), 'B': numpy.array(['b', 'c'])})
+        assert 'different lengths' in str(ex.value)